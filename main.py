@@ -1,43 +1,49 @@
+import time
+STARTUP_T0 = time.perf_counter() # 시작 시간 측정 기준 (import 시간 포함)
 import customtkinter as ctk
 import tkinter as tk
+import importlib
+import importlib.util
+import itertools
 import json
+import math
 import os
+import queue
 import random
 import calendar
 import sys
 import threading
-import pygame
-from datetime import datetime, timedelta
-from tkinter import messagebox, Canvas
-
-# 그래프 라이브러리 (설치 확인)
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-
-# 트레이 아이콘 라이브러리
-try:
-    import pystray
-    from pystray import MenuItem as item
-    from PIL import Image, ImageDraw
-    TRAY_AVAILABLE = True
-except ImportError:
-    TRAY_AVAILABLE = False
-
-# 알림 기능 라이브러리
-try:
-    from plyer import notification
-    PLYER_AVAILABLE = True
-except ImportError:
-    PLYER_AVAILABLE = False
+from collections import OrderedDict, deque
+from datetime import date, datetime, timedelta
+from tkinter import filedialog, messagebox, Canvas
+from planner_core import (DATA_DIR, DAY_FIELDS, DAY_FILE_RE, AutosaveWriter, CheckItem, DayRecord, DayStore, PomodoroEngine, Prefetcher,
+                          RecordError, energy_label, load_day, neighbour_dates, range_stats, search_days, span_dates)
+from planner_export import FORMATS, export_range
+from planner_io import TkExecutor
+from planner_tray import TrayService
+from planner_watch import DirWatcher, InstanceLock
+from planner_profiler import profiler, timed
+
+# 무거운 선택 라이브러리는 설치 여부만 확인하고, 실제 import는 기능을 처음 쓸 때 (lazy_import)
+def module_available(name): return importlib.util.find_spec(name) is not None
+
+MATPLOTLIB_AVAILABLE = module_available("matplotlib")                            # 그래프 (주간 리포트)
+TRAY_AVAILABLE = module_available("pystray") and module_available("PIL")        # 트레이 아이콘
+NUMPY_AVAILABLE = module_available("numpy")                                      # 전체 기록 분석, 폭죽 애니메이션 (없으면 간단한 버전)
+PLYER_AVAILABLE = module_available("plyer")                                      # 알림
+
+_lazy_modules = {}
+
+def lazy_import(name):
+    """모듈을 처음 요청될 때 import 해서 보관. 설치되지 않았으면 None"""
+    if name not in _lazy_modules:
+        try: _lazy_modules[name] = importlib.import_module(name)
+        except ImportError: _lazy_modules[name] = None
+    return _lazy_modules[name]
 
 # --- 초기 설정 ---
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
-pygame.mixer.init()
 
 # 폰트 설정
 FONT_TITLE = ("Segoe UI", 24, "bold")
@@ -47,9 +53,24 @@ FONT_SMALL = ("Segoe UI", 12)
 FONT_CAL_HEADER = ("Segoe UI", 14, "bold")
 FONT_CAL_DAY = ("Segoe UI", 12)
 
-DATA_DIR = "data"
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+AUTOSAVE_DELAY_MS = 1500 # 마지막 수정 후 이 시간 동안 변화가 없으면 자동 저장
+AUTOSAVE_POLL_MS = 300   # 백그라운드 저장 완료 확인 주기
+
+CONFETTI_PARTICLES = 240 # 프레임이 밀리면 ConfettiOverlay가 자동으로 줄임
+
+IDEA_HALF_LIFE_DAYS = 180 # 랜덤 아이디어: 이만큼 지난 아이디어는 절반 확률로 (최근 것 위주, None이면 균등)
+IDEA_EXCLUDE_RECENT = 5   # 랜덤 아이디어: 최근에 보여준 아이디어 몇 개는 다시 뽑지 않음
+
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles") # 계측 결과(JSON) 저장 위치
+
+INSTANCE_LOCK_PATH = os.path.join(DATA_DIR, ".planner.lock") # 같은 data 폴더로 앱을 두 번 실행하지 않게
+# data 폴더 감시: 리눅스는 inotify, 그 밖에는 폴링. PLANNER_WATCH=poll 이면 항상 폴링, off 면 감시하지 않음
+WATCH_MODE = os.environ.get("PLANNER_WATCH", "auto")
+
+# 빠른 시작: 첫 화면(달력 + 오늘의 목표)만 먼저 그리고 나머지 카드는 idle 콜백에서 생성. PLANNER_FAST_START=0 이면 한 번에 생성
+FAST_START = os.environ.get("PLANNER_FAST_START", "1") != "0"
+# 새 날짜를 열 때 이전 기록에서 끝내지 못한 목표도 이어받기. PLANNER_CARRY_GOALS=1 이면 사용
+CARRY_OVER_GOALS = os.environ.get("PLANNER_CARRY_GOALS", "0") == "1"
 
 # ======================================================
 #  0. 유틸리티 함수
@@ -63,9 +84,10 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 def create_tray_icon_image():
+    Image, ImageDraw = lazy_import("PIL.Image"), lazy_import("PIL.ImageDraw")
     icon_path = resource_path("icon.ico") 
     if os.path.exists(icon_path):
-        return Image.open(icon_path)
+        with Image.open(icon_path) as image: return image.copy() # 픽셀을 읽고 파일은 바로 닫음
     else:
         width = 64; height = 64
         image = Image.new('RGB', (width, height), "#3B8ED0")
@@ -73,137 +95,220 @@ def create_tray_icon_image():
         dc.rectangle((width // 4, height // 4, 3 * width // 4, 3 * height // 4), fill="white")
         return image
 
+class AudioService:
+    """효과음 재생. 믹서는 첫 사용 시 초기화하고 음원은 한 번만 디코딩해 메모리에 보관. 오디오 장치가 없으면 조용히 무시"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.available = True # pygame이 없거나 장치 초기화에 실패하면 False
+        self.mixer = None     # 초기화된 pygame.mixer 모듈
+        self.channel = None   # 효과음 전용 채널
+        self.sounds = {}      # 파일명 -> 디코딩된 pygame Sound (로드 실패 시 None)
+
+    def _init_mixer(self):
+        if self.mixer is None and self.available:
+            try:
+                import pygame
+                pygame.mixer.init()
+                pygame.mixer.set_reserved(1)
+                self.channel = pygame.mixer.Channel(0)
+                self.mixer = pygame.mixer
+            except Exception:
+                self.available = False
+        return self.mixer is not None
+
+    def load(self, file_name):
+        with self.lock:
+            if file_name not in self.sounds:
+                sound = None
+                if self._init_mixer():
+                    try: sound = self.mixer.Sound(resource_path(file_name))
+                    except Exception: pass
+                self.sounds[file_name] = sound
+            return self.sounds[file_name]
+
+    def preload(self, *file_names):
+        """믹서 초기화와 디코딩을 백그라운드 스레드에서 미리 처리"""
+        threading.Thread(target=lambda: [self.load(f) for f in file_names], daemon=True).start()
+
+    def _load_and_play(self, file_name):
+        sound = self.load(file_name)
+        if sound is not None: self.channel.play(sound)
+
+    def play(self, file_name):
+        """Tk 스레드를 막지 않음: 캐시에 있으면 바로 재생, 없으면 백그라운드에서 로드 후 재생"""
+        if not self.available: return
+        sound = self.sounds.get(file_name)
+        if sound is not None: self.channel.play(sound)
+        elif file_name not in self.sounds: threading.Thread(target=self._load_and_play, args=(file_name,), daemon=True).start()
+
+audio = AudioService()
+
 def play_sound(file_name):
-    file_path = resource_path(file_name)
-    if os.path.exists(file_path):
-        try:
-            pygame.mixer.music.load(file_path)
-            pygame.mixer.music.play()
-        except Exception as e:
-            print(f"Sound Error: {e}")
-    else:
-        print(f"File not found: {file_path}")
+    audio.play(file_name)
 
 # ======================================================
 #  1. 커스텀 위젯 및 효과
 # ======================================================
 
+# 리포트 기간: 라벨 → 기간 이름 (planner_core.REPORT_SPANS의 키, 일수와 막대 단위는 그쪽에서 정함)
+REPORT_RANGES = {"주간": "week", "월간": "month", "분기": "quarter", "연간": "year"}
+REPORT_TITLES = {"주간": "📊 이번 주 리포트", "월간": "📊 최근 한 달 리포트", "분기": "📊 최근 분기 리포트", "연간": "📊 최근 1년 리포트"}
+
 class WeeklyReportWindow(ctk.CTkToplevel):
-    """[NEW] 시각화된 주간 리포트 윈도우"""
+    """[NEW] 시각화된 주간 리포트 윈도우 (주/월/분기/연 단위, 집계 캐시 사용)"""
     def __init__(self, master):
         super().__init__(master)
         self.title("Weekly Insights")
         self.geometry("800x600")
         self.attributes('-topmost', True)
-        
-        # 데이터 수집
-        self.days, self.rates, self.total_done, self.total_goals, self.energies = self.collect_data()
+        self.chart_key = None                # 지금 보여줘야 할 그래프의 캐시 키
+        self.chart_pending = False           # 백그라운드에서 그리는 중
+        self.chart_results = queue.Queue()   # 렌더링 스레드 -> Tk 스레드 (키, 이미지)
+        self.io_key = ("report", str(self))  # 집계 조회 작업 키 (기간을 빠르게 바꾸면 이전 조회는 버림)
         
         # 메인 컨테이너
         main_frame = ctk.CTkFrame(self, fg_color="transparent")
         main_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        # 1. 헤더
-        ctk.CTkLabel(main_frame, text="📊 이번 주 리포트", font=("Segoe UI", 28, "bold")).pack(pady=(0, 20))
-        
-        # 2. 요약 카드 (3개 나란히)
-        stats_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        stats_frame.pack(fill="x", pady=(0, 20))
-        stats_frame.grid_columnconfigure((0,1,2), weight=1)
+        # 1. 헤더 + 기간 선택
+        self.title_lbl = ctk.CTkLabel(main_frame, text=REPORT_TITLES["주간"], font=("Segoe UI", 28, "bold"))
+        self.title_lbl.pack(pady=(0, 10))
+        self.range_var = ctk.StringVar(value="주간")
+        ctk.CTkSegmentedButton(main_frame, values=list(REPORT_RANGES), variable=self.range_var, command=self.show_range).pack(pady=(0, 15))
         
-        self.create_stat_card(stats_frame, 0, "평균 달성률", f"{int(sum(self.rates)/7)}%" if self.rates else "0%", "#3B8ED0")
-        self.create_stat_card(stats_frame, 1, "완료한 목표", f"{self.total_done}개", "#2CC985")
-        
-        avg_energy = "-"
-        if self.energies:
-            # 에너지 문자열을 점수로 변환 (High=3, Medium=2, Low=1)
-            e_map = {"HIGH 🔥": 3, "MEDIUM ⚡": 2, "LOW 💤": 1, "Medium": 2}
-            score_sum = sum([e_map.get(e, 2) for e in self.energies])
-            avg_score = score_sum / len(self.energies)
-            if avg_score > 2.3: avg_energy = "HIGH 🔥"
-            elif avg_score > 1.6: avg_energy = "MEDIUM ⚡"
-            else: avg_energy = "LOW 💤"
-            
-        self.create_stat_card(stats_frame, 2, "평균 에너지", avg_energy, "#E67E22")
+        # 2. 요약 카드 (4개 나란히)
+        self.stats_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        self.stats_frame.pack(fill="x", pady=(0, 20))
+        self.stats_frame.grid_columnconfigure((0,1,2,3,4), weight=1)
 
         # 3. 그래프 영역
         if MATPLOTLIB_AVAILABLE:
-            graph_frame = ctk.CTkFrame(main_frame, fg_color=("white", "gray20"))
-            graph_frame.pack(fill="both", expand=True, pady=(0, 10))
-            self.draw_graph(graph_frame)
+            self.graph_frame = ctk.CTkFrame(main_frame, fg_color=("white", "gray20"))
+            self.graph_frame.pack(fill="both", expand=True, pady=(0, 10))
+            self.chart_label = ctk.CTkLabel(self.graph_frame, text="", text_color="gray")
+            self.chart_label.pack(fill="both", expand=True)
         else:
             ctk.CTkLabel(main_frame, text="그래프를 보려면 matplotlib을 설치하세요.\n(pip install matplotlib)", text_color="gray").pack(expand=True)
 
         # 4. 코멘트
+        self.comment_lbl = ctk.CTkLabel(main_frame, text="", font=("Segoe UI", 16), text_color="gray")
+        self.comment_lbl.pack()
+        self.show_range("주간")
+
+    def show_range(self, label):
+        self.master.io.submit(self.collect_data, REPORT_RANGES[label], key=self.io_key, on_done=lambda report: self.show_report(label, report))
+
+    def loading(self): return self.chart_pending or self.master.io.busy(self.io_key)
+
+    @timed("report_build")
+    def show_report(self, label, report):
+        if not self.winfo_exists(): return
+        self.days, self.rates = report["labels"], report["rates"]
+        self.total_done, self.total_goals = report["total_done"], report["total_goals"]
+        self.title_lbl.configure(text=REPORT_TITLES[label])
+
+        for child in self.stats_frame.winfo_children(): child.destroy()
+        self.create_stat_card(self.stats_frame, 0, "평균 달성률", f"{int(report['avg_rate'])}%", "#3B8ED0")
+        self.create_stat_card(self.stats_frame, 1, "완료한 목표", f"{self.total_done}개", "#2CC985")
+        self.create_stat_card(self.stats_frame, 2, "루틴 달성률", f"{int(report['routine_rate'])}%", "#9B59B6")
+        self.create_stat_card(self.stats_frame, 3, "평균 에너지", energy_label(report["avg_energy"]), "#E67E22")
+        focus_h, focus_m = divmod(int(report["focus_minutes"]), 60)
+        self.create_stat_card(self.stats_frame, 4, "집중 시간", f"{focus_h}시간 {focus_m}분" if focus_h else f"{focus_m}분", "#E74C3C")
+
+        if MATPLOTLIB_AVAILABLE: self.draw_graph()
+
         comment = "기록이 부족해요. 조금씩 채워나가봐요!"
         if self.total_goals > 0:
             rate = self.total_done / self.total_goals
-            if rate > 0.8: comment = "🔥 와우! 정말 불태운 한 주였네요! 완벽해요!"
+            if rate > 0.8: comment = "🔥 와우! 정말 불태운 기간이었네요! 완벽해요!"
             elif rate > 0.5: comment = "👍 꾸준히 잘하고 있어요. 이대로만 가요!"
-            else: comment = "🌱 괜찮아요. 다음 주에 조금 더 집중해보면 돼요."
-            
-        ctk.CTkLabel(main_frame, text=comment, font=("Segoe UI", 16), text_color="gray").pack()
+            else: comment = "🌱 괜찮아요. 다음에는 조금 더 집중해보면 돼요."
+        self.comment_lbl.configure(text=comment)
 
-    def create_stat_card(self, parent, col, title, value, color):
+    @staticmethod
+    def create_stat_card(parent, col, title, value, color):
         frame = ctk.CTkFrame(parent, fg_color=color, corner_radius=15)
         frame.grid(row=0, column=col, padx=10, sticky="ew")
         ctk.CTkLabel(frame, text=title, font=("Segoe UI", 18, "bold"), text_color="white").pack(pady=(15, 5))
         ctk.CTkLabel(frame, text=value, font=("Segoe UI", 24, "bold"), text_color="white").pack(pady=(0, 15))
 
-    def collect_data(self):
-        today = datetime.now().date()
-        days = []
-        rates = [] # 퍼센트 (0~100)
-        energies = []
-        total_done = 0
-        total_goals = 0
-        
-        for i in range(6, -1, -1):
-            day = today - timedelta(days=i)
-            day_str = day.strftime("%Y-%m-%d")
-            # 그래프 X축 라벨 (월/일)
-            days.append(day.strftime("%m/%d"))
-            
-            path = os.path.join(DATA_DIR, f"{day_str}.json")
-            if os.path.exists(path):
-                try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    goals = data.get("goals", [])
-                    # 목표 + 루틴 + 이브닝 체크박스 다 합쳐서 계산 (간단하게 목표만 계산할 수도 있음)
-                    done_count = sum(1 for g in goals if g.get("done", False))
-                    goal_count = len(goals)
-                    
-                    if goal_count > 0:
-                        rates.append((done_count / goal_count) * 100)
-                    else:
-                        rates.append(0)
-                        
-                    total_done += done_count
-                    total_goals += goal_count
-                    if data.get("energy"):
-                        energies.append(data.get("energy"))
-                except:
-                    rates.append(0)
-            else:
-                rates.append(0)
-                
-        return days, rates, total_done, total_goals, energies
-
-    def draw_graph(self, parent):
-        # matplotlib 그래프 생성
-        fig, ax = plt.subplots(figsize=(5, 3), dpi=100)
+    def collect_data(self, span_name):
+        start, end, bucket = span_dates(span_name)
+        return range_stats(self.master.store, start, end, bucket)
+
+    def draw_graph(self):
+        """그래프 표시: 같은 데이터/테마로 그린 이미지가 캐시에 있으면 그대로 쓰고, 없으면 백그라운드에서 그림"""
+        dark = ctk.get_appearance_mode() == "Dark"
+        key = (tuple(self.days), tuple(round(r, 2) for r in self.rates), dark)
+        self.chart_key = key
+        image = report_charts.get(key)
+        if image is not None: self.show_chart(image); return
+        self.chart_label.configure(text="그래프 그리는 중…", image=None)
+        if not self.chart_pending: self.after(30, self.poll_chart)
+        self.chart_pending = True
+        threading.Thread(target=self.render_chart, args=(key,), daemon=True).start()
+
+    def render_chart(self, key):
+        labels, rates, dark = key
+        try: self.chart_results.put((key, report_charts.render(labels, rates, dark)))
+        except Exception as e: self.chart_results.put((key, e))
+
+    def poll_chart(self):
+        if not self.winfo_exists(): return
+        while True:
+            try: key, result = self.chart_results.get_nowait()
+            except queue.Empty: break
+            if key != self.chart_key: continue # 그리는 동안 기간을 바꿨으면 버림 (캐시에는 남음)
+            self.chart_pending = False
+            if isinstance(result, Exception): self.chart_label.configure(text=f"그래프 오류: {result}", image=None)
+            else: self.show_chart(result)
+        if self.chart_pending: self.after(30, self.poll_chart)
+
+    def show_chart(self, image):
+        self.chart_pending = False
+        self.chart_label.configure(text="", image=ctk.CTkImage(light_image=image, dark_image=image, size=image.size))
+
+
+class ReportChartCache:
+    """리포트 막대 그래프 이미지 캐시 (LRU). 키: (라벨, 달성률, 다크 모드)"""
+    SIZE = 8
+    FIGSIZE = (7.2, 3.2)
+
+    def __init__(self):
+        self.images = OrderedDict()
+        self.lock = threading.Lock()
+        self.renders = 0 # 실제로 그린 횟수 (planner_diagnostics.py --bench-report 출력용)
+
+    def get(self, key):
+        with self.lock:
+            if key in self.images: self.images.move_to_end(key); return self.images[key]
+        return None
+
+    def clear(self):
+        with self.lock: self.images.clear()
+
+    @timed("report_render")
+    def render(self, labels, rates, dark):
+        """pyplot 없이 Figure + Agg로 그려 PIL 이미지로 반환 (Figure는 전역에 등록되지 않아 함수가 끝나면 해제됨)"""
+        Figure = lazy_import("matplotlib.figure").Figure
+        FigureCanvasAgg = lazy_import("matplotlib.backends.backend_agg").FigureCanvasAgg
+        Image = lazy_import("PIL.Image")
+        with self.lock: self.renders += 1
+
+        fig = Figure(figsize=self.FIGSIZE, dpi=100)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         
         # 다크모드 대응 색상
-        bg_color = "#2b2b2b" if ctk.get_appearance_mode() == "Dark" else "white"
-        text_color = "white" if ctk.get_appearance_mode() == "Dark" else "black"
+        bg_color = "#2b2b2b" if dark else "white"
+        text_color = "white" if dark else "black"
         bar_color = "#3B8ED0"
         
         fig.patch.set_facecolor(bg_color)
         ax.set_facecolor(bg_color)
         
         # 막대 그래프 그리기
-        bars = ax.bar(self.days, self.rates, color=bar_color, width=0.5)
+        bars = ax.bar(labels, rates, color=bar_color, width=0.5)
         
         # 스타일링
         ax.set_ylim(0, 100)
@@ -214,19 +319,143 @@ class WeeklyReportWindow(ctk.CTkToplevel):
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
         ax.spines['left'].set_color(text_color)
+        if len(labels) > 12: # 라벨이 많으면 기울이고 일부만 표시
+            ax.set_xticks(range(0, len(labels), max(1, len(labels) // 10)))
+            ax.tick_params(axis='x', labelrotation=45, labelsize=8)
 
         # 막대 위에 숫자 표시
         for bar in bars:
             height = bar.get_height()
-            if height > 0:
+            if height > 0 and len(bars) <= 14:
                 ax.text(bar.get_x() + bar.get_width()/2., height,
                         f'{int(height)}%',
                         ha='center', va='bottom', color=text_color, fontsize=8)
 
-        canvas = FigureCanvasTkAgg(fig, master=parent)
+        fig.tight_layout()
         canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        image = Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba(), "raw", "RGBA", 0, 1).copy()
+        with self.lock:
+            self.images[(tuple(labels), tuple(rates), dark)] = image
+            if len(self.images) > self.SIZE: self.images.popitem(last=False)
+        return image
 
+report_charts = ReportChartCache()
+
+
+class AnalyticsWindow(ctk.CTkToplevel):
+    """전체 기록 분석: 연속 달성, 7/30일 이동 평균, 요일별 달성률, 에너지와 달성률의 관계 (planner_analytics, NumPy)"""
+    def __init__(self, master, result):
+        super().__init__(master)
+        self.title("Analytics")
+        self.geometry("760x720")
+        self.attributes('-topmost', True)
+
+        main_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        ctk.CTkLabel(main_frame, text="📈 전체 기록 분석", font=("Segoe UI", 28, "bold")).pack(pady=(0, 5))
+        ctk.CTkLabel(main_frame, text=f"{result['start']} ~ {result['end']}  ·  기록 {result['recorded_days']}일  ·  계산 {result['elapsed_ms']:.1f} ms",
+                     text_color="gray").pack(pady=(0, 15))
+
+        cards = ctk.CTkFrame(main_frame, fg_color="transparent")
+        cards.pack(fill="x", pady=(0, 20))
+        cards.grid_columnconfigure((0, 1, 2, 3), weight=1)
+        streaks = result["streaks"]
+        WeeklyReportWindow.create_stat_card(cards, 0, "현재 연속", f"{streaks['current']}일", "#E74C3C")
+        WeeklyReportWindow.create_stat_card(cards, 1, "최장 연속", f"{streaks['longest']}일", "#E67E22")
+        WeeklyReportWindow.create_stat_card(cards, 2, "최근 7일", f"{result['rolling7'][-1] * 100:.0f}%", "#3B8ED0")
+        WeeklyReportWindow.create_stat_card(cards, 3, "최근 30일", f"{result['rolling30'][-1] * 100:.0f}%", "#2CC985")
+
+        self.section(main_frame, "📅 요일별 달성률")
+        for label, rate in zip(lazy_import("planner_analytics").WEEKDAY_LABELS, result["weekday"]): self.bar_row(main_frame, label, rate, "#3B8ED0")
+
+        energy = result["energy"]
+        self.section(main_frame, "⚡ 에너지와 달성률")
+        if energy["r"] is None: comment = "에너지 기록이 더 쌓이면 관계를 보여드릴게요."
+        elif abs(energy["r"]) < 0.1: comment = f"r = {energy['r']:.2f} · 에너지와 달성률은 거의 관계가 없어요."
+        elif energy["r"] > 0: comment = f"r = {energy['r']:.2f} · 에너지가 높은 날 더 많이 해냈어요."
+        else: comment = f"r = {energy['r']:.2f} · 에너지가 낮은 날에도 오히려 더 많이 해냈어요."
+        ctk.CTkLabel(main_frame, text=comment, text_color="gray").pack(anchor="w", padx=10, pady=(0, 5))
+        for label, rate in zip(["LOW 💤", "MEDIUM ⚡", "HIGH 🔥"], energy["by_energy"]): self.bar_row(main_frame, label, rate, "#E67E22")
+
+    def section(self, parent, title):
+        ctk.CTkLabel(parent, text=title, font=FONT_HEADER, anchor="w").pack(fill="x", padx=10, pady=(15, 5))
+
+    def bar_row(self, parent, label, rate, color):
+        """라벨 + 막대 + 퍼센트 한 줄 (rate가 nan이면 기록 없음)"""
+        row = ctk.CTkFrame(parent, fg_color="transparent")
+        row.pack(fill="x", padx=10, pady=2)
+        ctk.CTkLabel(row, text=label, width=90, anchor="w").pack(side="left")
+        bar = ctk.CTkProgressBar(row, progress_color=color, height=14)
+        bar.set(0 if math.isnan(rate) else rate)
+        bar.pack(side="left", fill="x", expand=True, padx=10)
+        ctk.CTkLabel(row, text="-" if math.isnan(rate) else f"{rate * 100:.0f}%", width=50, anchor="e").pack(side="left")
+
+
+# 내보내기 형식 (화면 이름 -> planner_export 형식), 기간 (None: 전체)
+EXPORT_FORMATS = {"CSV (항목별 한 줄)": "csv", "Markdown 일지": "md", "캘린더 (.ics, Time Blocks)": "ics", "백업 (JSON Lines)": "jsonl"}
+EXPORT_RANGES = {**REPORT_RANGES, "전체": None}
+
+class ExportWindow(ctk.CTkToplevel):
+    """기간과 형식을 골라 파일로 내보내기. 파일 쓰기는 TkExecutor에서 하루씩, 진행률은 after로 확인해 표시"""
+    POLL_MS = 100
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Export")
+        self.geometry("460x320")
+        self.attributes('-topmost', True)
+        self.progress = (0, 0) # (끝낸 날 수, 전체 날 수) - 작업 스레드가 쓰고 Tk 스레드가 읽음
+        self.running = False
+
+        ctk.CTkLabel(self, text="📤 기록 내보내기", font=FONT_HEADER).pack(pady=(20, 10))
+        self.range_var = ctk.StringVar(value="월간")
+        ctk.CTkSegmentedButton(self, values=list(EXPORT_RANGES), variable=self.range_var).pack(pady=5)
+        self.format_var = ctk.StringVar(value=next(iter(EXPORT_FORMATS)))
+        ctk.CTkOptionMenu(self, values=list(EXPORT_FORMATS), variable=self.format_var, width=260).pack(pady=10)
+        self.bar = ctk.CTkProgressBar(self)
+        self.bar.set(0); self.bar.pack(fill="x", padx=40, pady=(10, 5))
+        self.status_lbl = ctk.CTkLabel(self, text="", text_color="gray")
+        self.status_lbl.pack()
+        self.export_btn = ctk.CTkButton(self, text="파일로 저장…", command=self.start)
+        self.export_btn.pack(pady=15)
+
+    def start(self):
+        fmt, span = EXPORT_FORMATS[self.format_var.get()], EXPORT_RANGES[self.range_var.get()]
+        ext = FORMATS[fmt][1]
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=ext, initialfile=f"planner-{span or 'all'}{ext}",
+                                            filetypes=[(self.format_var.get(), f"*{ext}")])
+        if not path: return
+        bounds = () if span is None else tuple(d.strftime("%Y-%m-%d") for d in span_dates(span)[:2])
+        self.running, self.progress = True, (0, 0)
+        self.export_btn.configure(state="disabled")
+        self.master.autosave()
+        self.master.io.submit(self.write, path, fmt, bounds, on_done=lambda count: self.finished(path, count), on_error=self.failed)
+        self.after(self.POLL_MS, self.poll)
+
+    def write(self, path, fmt, bounds):
+        """(작업 스레드) 저장 대기 중인 수정까지 반영한 뒤 하루씩 파일에 씀"""
+        self.master.autosave_writer.flush(timeout=2)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            return export_range(self.master.store, f, fmt, *bounds, progress=lambda done, total: setattr(self, "progress", (done, total)))
+
+    def poll(self):
+        if not self.running or not self.winfo_exists(): return
+        done, total = self.progress
+        self.bar.set(done / total if total else 0)
+        self.status_lbl.configure(text=f"{done} / {total}일")
+        self.after(self.POLL_MS, self.poll)
+
+    def finished(self, path, count):
+        self.running = False
+        if not self.winfo_exists(): return
+        self.bar.set(1)
+        self.status_lbl.configure(text=f"{count}일 내보냄 → {os.path.basename(path)}")
+        self.export_btn.configure(state="normal")
+
+    def failed(self, error):
+        self.running = False
+        if self.winfo_exists(): self.export_btn.configure(state="normal")
+        messagebox.showerror("내보내기 오류", str(error))
 
 class RoulettePopup(ctk.CTkFrame):
     def __init__(self, master, goals, callback=None):
@@ -265,6 +494,12 @@ class RoulettePopup(ctk.CTkFrame):
         self.destroy()
 
 class ConfettiOverlay:
+    """폭죽 애니메이션. 캔버스 아이템은 한 번만 만들고 coords로 이동, 입자 상태는 NumPy 배열로 한 번에 갱신.
+    numpy가 없으면 입자 수를 줄여 순수 파이썬 목록으로 같은 움직임을 그림"""
+    FRAME_MS = 20
+    GRAVITY = 0.5
+    PLAIN_MAX_PARTICLES = 80 # numpy 없이 그릴 때 입자 수 상한 (한 프레임에 파이썬 루프로 갱신)
+
     def __init__(self, master):
         self.master = master
         x = master.winfo_x(); y = master.winfo_y(); w = master.winfo_width(); h = master.winfo_height()
@@ -275,36 +510,81 @@ class ConfettiOverlay:
         self.top.config(bg=self.transparent_color); self.top.attributes('-transparentcolor', self.transparent_color)
         self.canvas = tk.Canvas(self.top, bg=self.transparent_color, highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
-        self.particles = []; self.colors = ["#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#00FFFF", "#FF00FF", "#FFA500"]
+        self.colors = ["#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#00FFFF", "#FF00FF", "#FFA500"]
         self.width = w; self.height = h
         
-    def start(self):
-        for _ in range(120):
-            self.particles.append({
-                "x": random.randint(0, self.width), "y": random.randint(self.height // 2, self.height + 100),
-                "speed_x": random.uniform(-4, 4), "speed_y": random.uniform(-18, -8),
-                "gravity": 0.5, "color": random.choice(self.colors), "size": random.randint(5, 9)
-            })
+    def start(self, count=120):
         play_sound("fanfare.mp3")
+        if not NUMPY_AVAILABLE: self.start_plain(min(count, self.PLAIN_MAX_PARTICLES)); return
+        np = lazy_import("numpy")
+        rng = np.random.default_rng()
+        self.x = rng.uniform(0, self.width, count); self.y = rng.uniform(self.height // 2, self.height + 100, count)
+        self.speed_x = rng.uniform(-4, 4, count); self.speed_y = rng.uniform(-18, -8, count)
+        self.size = rng.integers(5, 10, count).astype(float)
+        self.alive = np.ones(count, dtype=bool)
+        self.items = np.array([self.canvas.create_oval(0, 0, 0, 0, fill=random.choice(self.colors), outline="") for _ in range(count)])
+        self.last_frame = time.perf_counter()
         self.animate()
 
+    @timed("confetti_frame")
     def animate(self):
-        self.canvas.delete("all")
-        active_particles = False
+        np = lazy_import("numpy")
+        frame_start = time.perf_counter()
+        late = (frame_start - self.last_frame) * 1000 > self.FRAME_MS * 1.5
+        self.last_frame = frame_start
+
+        self.x += self.speed_x; self.y += self.speed_y; self.speed_y += self.GRAVITY
+        # 아래로 떨어져 나갔거나 좌우로 벗어난 입자는 제거 (아래에서 올라오는 중인 입자는 유지)
+        visible = ~(((self.y >= self.height + 20) & (self.speed_y > 0)) | (self.x < -self.size) | (self.x > self.width))
+        if late: # 프레임이 늦으면 남은 입자의 1/4을 줄여 부하를 낮춤
+            visible[np.flatnonzero(visible & self.alive)[::4]] = False
+        dead = self.alive & ~visible
+        if dead.any(): self.canvas.delete(*self.items[dead].tolist())
+        self.alive &= visible
+
+        if not self.alive.any(): self.top.destroy(); return
+        coords = np.column_stack((self.x, self.y, self.x + self.size, self.y + self.size))[self.alive].tolist()
+        for item, c in zip(self.items[self.alive].tolist(), coords): self.canvas.coords(item, *c)
+
+        elapsed_ms = (time.perf_counter() - frame_start) * 1000
+        self.master.after(max(1, int(self.FRAME_MS - elapsed_ms)), self.animate)
+
+    def start_plain(self, count):
+        # 입자: [x, y, 속도 x, 속도 y, 크기, 캔버스 아이템]
+        self.particles = []
+        for _ in range(count):
+            size = random.randint(5, 9)
+            item = self.canvas.create_oval(0, 0, 0, 0, fill=random.choice(self.colors), outline="")
+            self.particles.append([random.uniform(0, self.width), random.uniform(self.height // 2, self.height + 100),
+                                   random.uniform(-4, 4), random.uniform(-18, -8), size, item])
+        self.animate_plain()
+
+    @timed("confetti_frame")
+    def animate_plain(self):
+        frame_start = time.perf_counter()
+        alive = []
         for p in self.particles:
-            p["x"] += p["speed_x"]; p["y"] += p["speed_y"]; p["speed_y"] += p["gravity"]
-            if p["y"] < self.height + 20:
-                active_particles = True
-                self.canvas.create_oval(p["x"], p["y"], p["x"]+p["size"], p["y"]+p["size"], fill=p["color"], outline="")
-        if active_particles: self.master.after(20, self.animate)
-        else: self.top.destroy()
+            p[0] += p[2]; p[1] += p[3]; p[3] += self.GRAVITY
+            if (p[1] >= self.height + 20 and p[3] > 0) or p[0] < -p[4] or p[0] > self.width: self.canvas.delete(p[5]); continue
+            self.canvas.coords(p[5], p[0], p[1], p[0] + p[4], p[1] + p[4])
+            alive.append(p)
+        self.particles = alive
+        if not alive: self.top.destroy(); return
+        elapsed_ms = (time.perf_counter() - frame_start) * 1000
+        self.master.after(max(1, int(self.FRAME_MS - elapsed_ms)), self.animate_plain)
 
 class PomodoroTimer(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
+    """뽀모도로 타이머. 남은 시간은 PomodoroEngine(단조 시계)이 계산하고, 화면은 표시값이 바뀔 때만 갱신.
+    goal_provider: 지금 집중 중인 목표 텍스트를 돌려주는 함수, on_session: 세션이 끝나면(완료/중단) 기록 dict를 받는 함수.
+    add_listener(fn): 표시가 바뀔 때마다 fn(상태 문자열)을 호출 (미니 창 등이 별도 타이머 없이 따라 표시, 세션이 없으면 빈 문자열)"""
+    def __init__(self, master, goal_provider=None, on_session=None, **kwargs):
         super().__init__(master, fg_color=("gray90", "gray20"), corner_radius=10, **kwargs)
-        self.default_time = 1500 
-        self.time_left = self.default_time
-        self.running = False
+        self.engine = PomodoroEngine()
+        self.goal_provider = goal_provider
+        self.on_session = on_session
+        self.shown_text = "25" # 지금 입력칸에 보이는 값 (같으면 다시 쓰지 않음)
+        self.tick_job = None
+        self.listeners = []
         
         lbl = ctk.CTkLabel(self, text="🍅 POMODORO", font=("Segoe UI", 12, "bold"), text_color="gray")
         lbl.pack(pady=(10, 0))
@@ -324,55 +604,157 @@ class PomodoroTimer(ctk.CTkFrame):
         self.start_btn.pack(side="left", padx=5)
         ctk.CTkButton(btn_frame, text="Reset", width=60, height=24, fg_color="gray", hover_color="gray30", command=self.reset_timer).pack(side="left", padx=5)
 
+    @property
+    def running(self): return self.engine.running
+
+    def add_listener(self, fn): self.listeners.append(fn); fn(self.status_text())
+
+    def status_text(self):
+        if self.engine.session is None: return ""
+        return f"🍅 {self.shown_text}" + ("" if self.engine.running else " ⏸")
+
+    def notify(self):
+        text = self.status_text()
+        for fn in self.listeners: fn(text)
+
     def toggle_timer(self):
-        if self.running:
-            self.running = False
+        if self.engine.running:
+            self.engine.pause(); self.cancel_tick()
             self.start_btn.configure(text="Start", fg_color="#2ECC71")
             self.time_entry.configure(state="normal")
+            self.notify()
+            return
+        text = self.time_entry.get().strip()
+        if self.engine.session is not None and text == self.shown_text:
+            self.engine.resume() # 일시정지 후 시간을 고치지 않았으면 이어서 진행
         else:
             try:
-                current_text = self.time_entry.get().split(":")[0]
-                minutes = int(current_text)
-                self.time_left = minutes * 60
-                self.running = True
-                self.start_btn.configure(text="Pause", fg_color="#E67E22")
-                self.time_entry.configure(state="disabled")
-                self.countdown()
+                minutes = int(text.split(":")[0])
+                if minutes <= 0: raise ValueError
             except ValueError:
-                messagebox.showerror("오류", "올바른 시간을 입력해주세요")
+                messagebox.showerror("오류", "올바른 시간을 입력해주세요"); return
+            self.end_session("abandoned") # 일시정지 중 시간을 바꿔 새로 시작하면 이전 세션은 중단으로 기록
+            self.engine.start(minutes, self.goal_provider() if self.goal_provider else "")
+        self.start_btn.configure(text="Pause", fg_color="#E67E22")
+        self.time_entry.configure(state="disabled")
+        self.cancel_tick(); self.tick() # 예약된 tick이 남아 있으면 after 사슬이 둘로 늘어남
+        self.notify()
+
+    def show(self, text):
+        if text == self.shown_text: return
+        self.shown_text = text
+        state = self.time_entry.cget("state")
+        self.time_entry.configure(state="normal")
+        self.time_entry.delete(0, "end")
+        self.time_entry.insert(0, text)
+        self.time_entry.configure(state=state)
+        if self.engine.session is not None: self.notify()
+
+    def cancel_tick(self):
+        if self.tick_job: self.after_cancel(self.tick_job); self.tick_job = None
+
+    def tick(self):
+        """다음 초 경계에 맞춰 깨어나 표시만 갱신. 늦게 불려도 남은 시간은 마감 시각에서 다시 계산"""
+        self.tick_job = None
+        if not self.engine.running: return
+        left = self.engine.time_left()
+        if left <= 0: self.finish(); return
+        mins, secs = divmod(math.ceil(left), 60)
+        self.show(f"{mins:02d}:{secs:02d}")
+        self.tick_job = self.after(int((left % 1) * 1000) + 10, self.tick)
+
+    def finish(self):
+        self.show("00:00")
+        self.end_session("completed")
+        self.start_btn.configure(text="Start", fg_color="#2ECC71")
+        self.time_entry.configure(state="normal")
+        self.show_notification()
+        messagebox.showinfo("Pomodoro", "🍅 집중 시간 끝!")
 
-    def countdown(self):
-        if self.running and self.time_left > 0:
-            self.time_left -= 1
-            mins, secs = divmod(self.time_left, 60)
-            self.time_entry.configure(state="normal")
-            self.time_entry.delete(0, "end")
-            self.time_entry.insert(0, f"{mins:02d}:{secs:02d}")
-            self.time_entry.configure(state="disabled")
-            self.after(1000, self.countdown)
-        elif self.time_left == 0 and self.running:
-            self.running = False
-            self.start_btn.configure(text="Start", fg_color="#2ECC71")
-            self.time_entry.configure(state="normal")
-            self.show_notification()
-            messagebox.showinfo("Pomodoro", "🍅 집중 시간 끝!")
+    def end_session(self, status):
+        session = self.engine.end(status)
+        if session is None: return
+        if self.on_session: self.on_session(session)
+        self.notify()
 
     def show_notification(self):
         if PLYER_AVAILABLE:
-            try: notification.notify(title='ADHD Dashboard', message='집중 시간 종료!', app_name='ADHD Planner', timeout=10)
+            try: lazy_import("plyer").notification.notify(title='ADHD Dashboard', message='집중 시간 종료!', app_name='ADHD Planner', timeout=10)
             except: pass
 
     def reset_timer(self):
-        self.running = False
+        self.cancel_tick()
+        self.end_session("abandoned")
         self.time_entry.configure(state="normal")
-        self.time_entry.delete(0, "end")
-        self.time_entry.insert(0, "25")
+        self.show("25")
         self.start_btn.configure(text="Start", fg_color="#2ECC71")
 
+class MiniWindow(ctk.CTkToplevel):
+    """플로팅 미니 모드. 한 번만 만들고 이후에는 숨기기/보이기만 전환.
+    드래그는 마지막 위치만 기억해 두었다가 한 프레임에 한 번만 geometry 호출"""
+    FRAME_MS = 16
+
+    def __init__(self, master, on_expand):
+        super().__init__(master)
+        self.geometry("300x180")
+        self.overrideredirect(True); self.attributes('-topmost', True)
+        self.goal_text = None     # 지금 보이는 목표 (같으면 다시 그리지 않음)
+        self.drag_offset = (0, 0) # 창 왼쪽 위 기준 마우스 위치
+        self.drag_target = None   # 다음 프레임에 옮길 위치
+        self.drag_job = None
+
+        drag_frame = ctk.CTkFrame(self, corner_radius=10, fg_color=("gray85", "gray25"))
+        drag_frame.pack(fill="both", expand=True)
+        control_frame = ctk.CTkFrame(self, corner_radius=0, fg_color=("gray90", "gray20"), height=60)
+        control_frame.pack(fill="x", side="bottom")
+
+        header = ctk.CTkLabel(drag_frame, text="🔥 Current Focus", font=("Segoe UI", 12, "bold"), text_color="gray")
+        self.goal_lbl = ctk.CTkLabel(drag_frame, text="", font=("Segoe UI", 16, "bold"), wraplength=280)
+        self.timer_lbl = ctk.CTkLabel(drag_frame, text="", font=("Segoe UI", 14, "bold"), text_color="#E74C3C")
+        for w in (header, self.goal_lbl, self.timer_lbl): w.pack(pady=(10, 0))
+        for w in (drag_frame, header, self.goal_lbl, self.timer_lbl):
+            w.bind("<Button-1>", self.start_move); w.bind("<B1-Motion>", self.do_move)
+
+        slider = ctk.CTkSlider(control_frame, from_=0.1, to=1.0, number_of_steps=10, width=150, command=lambda v: self.attributes('-alpha', v))
+        slider.set(1.0); slider.pack(pady=(10, 5))
+        ctk.CTkButton(control_frame, text="Expand", command=on_expand, width=80, height=24).pack(pady=(0, 10))
+
+    def set_goal(self, text):
+        text = text or "모든 목표 달성! 🎉"
+        if text != self.goal_text: self.goal_text = text; self.goal_lbl.configure(text=text)
+
+    def set_timer(self, text):
+        if text != self.timer_lbl.cget("text"): self.timer_lbl.configure(text=text)
+
+    def start_move(self, event): self.drag_offset = (event.x_root - self.winfo_x(), event.y_root - self.winfo_y())
+
+    def do_move(self, event):
+        self.drag_target = (event.x_root - self.drag_offset[0], event.y_root - self.drag_offset[1])
+        if self.drag_job is None: self.drag_job = self.after(self.FRAME_MS, self.apply_move)
+
+    def apply_move(self):
+        self.drag_job = None
+        self.geometry(f"+{self.drag_target[0]}+{self.drag_target[1]}")
+
+SEARCH_FIELD_LABELS = {"ideas": "💡 아이디어", "brain_dump": "🧠 Brain Dump", "small_wins": "🏆 Small Wins", "goals": "🎯 목표", "time_blocks": "🕒 Time Blocks"}
+
+# 달력 히트맵: 달성률 단계별 배경색 (라이트, 다크), 에너지 점수별 테두리색
+HEAT_COLORS = [("#E3F7EC", "#1E3D2F"), ("#B5EBCD", "#1F5C40"), ("#74D9A5", "#238453"), ("#2CC985", "#2CC985")]
+ENERGY_BORDER_COLORS = {3: "#E67E22", 2: "#F1C40F", 1: "#95A5A6"}
+
+def completion_rate(metric):
+    """집계 (목표 완료, 목표 수, 루틴 완료, 루틴 수, 이브닝 완료, 이브닝 수, 에너지) -> 전체 달성률 (0~1)"""
+    goals_done, goals_total, r_done, r_total, e_done, e_total, _ = metric
+    total = goals_total + r_total + e_total
+    return (goals_done + r_done + e_done) / total if total else 0
+
 class CTkCalendar(ctk.CTkFrame):
-    def __init__(self, master, command=None, **kwargs):
+    def __init__(self, master, command=None, metrics_provider=None, io=None, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
         self.command = command 
+        self.metrics_provider = metrics_provider # (시작일, 종료일) -> 집계 행 목록
+        self.io = io                             # 있으면 지표를 TkExecutor로 읽고 도착하면 다시 그림
+        self.month_metrics = {}                  # (연, 월) -> {날짜: 지표}
         self.selected_date = datetime.now().date()
         self.current_month_date = datetime.now().date()
         self.setup_header()
@@ -402,6 +784,7 @@ class CTkCalendar(ctk.CTkFrame):
         self.grid_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.grid_frame.pack(fill="both", expand=True)
         self.day_buttons = []
+        self.button_states = {} # 버튼별 마지막 설정값 (바뀐 속성만 configure 하기 위함)
         for row in range(6):
             row_buttons = []
             row_frame = ctk.CTkFrame(self.grid_frame, fg_color="transparent")
@@ -413,30 +796,79 @@ class CTkCalendar(ctk.CTkFrame):
                 row_buttons.append(btn)
             self.day_buttons.append(row_buttons)
 
-    def update_calendar(self):
+    @timed("calendar_render")
+    def update_calendar(self, reload=False):
+        """reload=True: 기록이 바뀌었으니 지표를 다시 읽음 (읽는 동안에는 이전 지표로 그림)"""
         year, month = self.current_month_date.year, self.current_month_date.month
-        self.lbl_month.configure(text=f"{year}. {month:02d}")
+        month_text = f"{year}. {month:02d}"
+        if self.lbl_month.cget("text") != month_text: self.lbl_month.configure(text=month_text)
         month_range = calendar.monthrange(year, month)
         first_weekday, num_days = (month_range[0] + 1) % 7, month_range[1]
+
+        # 보이는 달 전체 지표를 한 번에 조회
+        if reload: self.month_metrics, stale = {}, self.month_metrics
+        else: stale = {}
+        if self.metrics_provider and (year, month) not in self.month_metrics:
+            self.load_metrics(year, month, f"{year}-{month:02d}-01", f"{year}-{month:02d}-{num_days:02d}")
+        metrics = self.month_metrics.get((year, month), stale.get((year, month), {}))
+        today = datetime.now().date()
+
         day_counter = 1
         for row in range(6):
             for col in range(7):
                 btn = self.day_buttons[row][col]
                 if (row == 0 and col < first_weekday) or day_counter > num_days:
-                    btn.configure(text="", state="disabled", fg_color="transparent", border_width=0)
+                    self.configure_day_button(row, col, text="", state="disabled", fg_color="transparent", border_width=0)
                     btn.date_val = None
                 else:
                     curr_date = datetime(year, month, day_counter).date()
-                    btn.configure(text=str(day_counter), state="normal")
-                    if curr_date == self.selected_date:
-                        btn.configure(fg_color=["#3B8ED0", "#1F6AA5"], text_color="white", border_width=0)
-                    elif curr_date == datetime.now().date():
-                        btn.configure(fg_color="transparent", border_width=1, border_color="gray", text_color=("black", "white"))
-                    else:
-                        btn.configure(fg_color="transparent", border_width=0, text_color=("black", "white"))
+                    state = self.day_style(curr_date, today, metrics.get(curr_date.strftime("%Y-%m-%d")))
+                    self.configure_day_button(row, col, text=str(day_counter), state="normal", **state)
                     btn.date_val = curr_date
                     day_counter += 1
 
+    def load_metrics(self, year, month, start, end):
+        if self.io is None: self.on_metrics(year, month, self.metrics_provider(start, end)); return
+        self.io.submit(self.metrics_provider, start, end, key="calendar_metrics", on_done=lambda rows: self.on_metrics(year, month, rows, redraw=True))
+
+    def on_metrics(self, year, month, rows, redraw=False):
+        self.month_metrics[(year, month)] = {row[0]: row[1:] for row in rows}
+        if redraw and (year, month) == (self.current_month_date.year, self.current_month_date.month): self.update_calendar()
+
+    def update_days(self, changed):
+        """밖에서 바뀐 날짜의 칸만 다시 칠함. changed: {날짜: 집계 또는 None(기록 없음)}"""
+        for date_str, metric in changed.items():
+            metrics = self.month_metrics.get((int(date_str[:4]), int(date_str[5:7])))
+            if metrics is None: continue # 아직 읽지 않은 달은 열 때 읽음
+            if metric is None: metrics.pop(date_str, None)
+            else: metrics[date_str] = metric
+        year, month = self.current_month_date.year, self.current_month_date.month
+        first_weekday, today = (calendar.monthrange(year, month)[0] + 1) % 7, datetime.now().date()
+        metrics = self.month_metrics.get((year, month), {})
+        for date_str in changed:
+            curr_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            if (curr_date.year, curr_date.month) != (year, month): continue
+            cell = first_weekday + curr_date.day - 1 # 1일이 놓인 칸부터 차례로
+            self.configure_day_button(cell // 7, cell % 7, **self.day_style(curr_date, today, metrics.get(date_str)))
+
+    def day_style(self, curr_date, today, metric):
+        if curr_date == self.selected_date:
+            return {"fg_color": ("#3B8ED0", "#1F6AA5"), "text_color": "white", "border_width": 0}
+        style = {"fg_color": "transparent", "text_color": ("black", "white"), "border_width": 0}
+        if metric:
+            style["fg_color"] = HEAT_COLORS[min(3, int(completion_rate(metric) * 4))]
+            if metric[6] in ENERGY_BORDER_COLORS: style.update(border_width=2, border_color=ENERGY_BORDER_COLORS[metric[6]])
+        if curr_date == today: style.update(border_width=2, border_color="gray")
+        return style
+
+    def configure_day_button(self, row, col, **kwargs):
+        """이전 상태와 다른 속성만 모아 한 번에 configure (CTkButton은 configure 마다 다시 그림)"""
+        prev = self.button_states.setdefault((row, col), {})
+        changed = {k: v for k, v in kwargs.items() if prev.get(k) != v}
+        if changed:
+            self.day_buttons[row][col].configure(**changed)
+            prev.update(changed)
+
     def change_month(self, step):
         month = self.current_month_date.month + step
         year = self.current_month_date.year
@@ -454,52 +886,215 @@ class CTkCalendar(ctk.CTkFrame):
 
     def get_date(self): return self.selected_date.strftime("%Y-%m-%d")
 
+    def select_date(self, date_obj):
+        """외부(검색 결과 등)에서 날짜 선택: 해당 달로 이동해서 표시"""
+        self.selected_date = date_obj
+        self.current_month_date = date_obj.replace(day=1)
+        self.update_calendar()
+
+
+class YearOverviewWindow(ctk.CTkToplevel):
+    """1년 전체를 tk.Canvas 하나에 사각형으로 (열: 주, 행: 요일, 일요일 시작). 칸은 처음 한 번만 만들고
+    연도를 바꾸면 색/보이기만 itemconfigure. 마우스 위치 -> 날짜는 좌표 계산으로 찾음 (칸마다 이벤트를 걸지 않음)"""
+    CELL, GAP = 14, 3
+    LEFT, TOP = 34, 22   # 요일 라벨 / 월 라벨 자리
+    WEEKS = 54           # 1월 1일이 토요일인 윤년도 들어가는 열 수
+    EMPTY_COLORS = ("#EBEDF0", "#2D333B") # 기록 없는 날 (라이트, 다크)
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Year Overview")
+        self.geometry("1000x290")
+        self.attributes('-topmost', True)
+        self.year = datetime.now().year  # 요청한 해
+        self.shown_year = None           # 지금 칠해져 있는 해 (좌표 -> 날짜 계산 기준)
+        self.metrics = {}                # 날짜 -> 집계 (칠해진 해)
+        self.cell_state = {}             # 칸 번호 -> 마지막으로 설정한 속성 (바뀐 것만 itemconfigure)
+        self.hover = None
+        self.io_key = ("year", str(self))
+        dark = ctk.get_appearance_mode() == "Dark"
+        self.mode = 1 if dark else 0
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", padx=20, pady=(15, 5))
+        ctk.CTkButton(header, text="<", width=30, command=lambda: self.show_year(self.year - 1)).pack(side="left")
+        self.year_lbl = ctk.CTkLabel(header, text="", font=FONT_HEADER, width=100)
+        self.year_lbl.pack(side="left", padx=10)
+        ctk.CTkButton(header, text=">", width=30, command=lambda: self.show_year(self.year + 1)).pack(side="left")
+        self.summary_lbl = ctk.CTkLabel(header, text="", text_color="gray")
+        self.summary_lbl.pack(side="right")
+
+        pitch = self.CELL + self.GAP
+        text_color = "gray70" if dark else "gray30"
+        self.canvas = tk.Canvas(self, width=self.LEFT + self.WEEKS * pitch, height=self.TOP + 7 * pitch, highlightthickness=0,
+                                bg="#242424" if dark else "#EBEBEB")
+        self.canvas.pack(padx=20, pady=5)
+        for row, label in ((1, "Mon"), (3, "Wed"), (5, "Fri")):
+            self.canvas.create_text(self.LEFT - 6, self.TOP + row * pitch + self.CELL / 2, text=label, anchor="e", fill=text_color, font=("Segoe UI", 8))
+        self.cells = [self.canvas.create_rectangle(self.LEFT + col * pitch, self.TOP + row * pitch, self.LEFT + col * pitch + self.CELL,
+                                                   self.TOP + row * pitch + self.CELL, width=2, outline="", fill=self.EMPTY_COLORS[self.mode])
+                      for col in range(self.WEEKS) for row in range(7)] # 칸 번호 = 열 * 7 + 행
+        self.month_labels = [self.canvas.create_text(0, self.TOP / 2, text=f"{m}월", anchor="w", fill=text_color, font=("Segoe UI", 9))
+                             for m in range(1, 13)]
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Leave>", lambda e: self.show_hover(None))
+        self.canvas.bind("<Button-1>", self.on_click)
+
+        self.status_lbl = ctk.CTkLabel(self, text="칸을 누르면 그 날짜를 엽니다", text_color="gray")
+        self.status_lbl.pack(pady=(5, 10))
+        self.show_year(self.year)
+
+    @staticmethod
+    def first_offset(year): return (date(year, 1, 1).weekday() + 1) % 7 # 1월 1일이 놓이는 행 (일요일 = 0)
+
+    def show_year(self, year):
+        self.year = year
+        self.year_lbl.configure(text=str(year))
+        self.master.io.submit(self.master.store.aggregates, f"{year}-01-01", f"{year}-12-31", key=self.io_key,
+                              on_done=lambda rows: self.paint(year, rows))
+
+    def set_cell(self, index, **options):
+        prev = self.cell_state.setdefault(index, {})
+        changed = {k: v for k, v in options.items() if prev.get(k) != v}
+        if changed: self.canvas.itemconfigure(self.cells[index], **changed); prev.update(changed)
+
+    def paint(self, year, rows):
+        if not self.winfo_exists(): return
+        self.shown_year, self.metrics = year, {row[0]: row[1:] for row in rows}
+        start, offset, days = date(year, 1, 1), self.first_offset(year), 366 if calendar.isleap(year) else 365
+        for index in range(len(self.cells)):
+            ordinal = index - offset
+            if not 0 <= ordinal < days: self.set_cell(index, state="hidden"); continue
+            metric = self.metrics.get((start + timedelta(days=ordinal)).strftime("%Y-%m-%d"))
+            fill = HEAT_COLORS[min(3, int(completion_rate(metric) * 4))][self.mode] if metric else self.EMPTY_COLORS[self.mode]
+            self.set_cell(index, state="normal", fill=fill, outline=ENERGY_BORDER_COLORS.get(metric[6], "") if metric else "")
+        pitch = self.CELL + self.GAP
+        for month, label in enumerate(self.month_labels, 1):
+            col = (offset + (date(year, month, 1) - start).days) // 7
+            self.canvas.coords(label, self.LEFT + col * pitch, self.TOP / 2)
+        rates = [completion_rate(metric) for metric in self.metrics.values()]
+        self.summary_lbl.configure(text=f"기록 {len(rates)}일  ·  평균 달성률 {sum(rates) / len(rates) * 100:.0f}%" if rates else "기록 없음")
+        self.hover = None
+
+    def cell_date(self, x, y):
+        """캔버스 좌표 -> 날짜 문자열 (칸 사이 틈이나 그 해가 아닌 칸이면 None)"""
+        if self.shown_year is None: return None
+        pitch = self.CELL + self.GAP
+        col, cx = divmod(x - self.LEFT, pitch)
+        row, cy = divmod(y - self.TOP, pitch)
+        if not (0 <= col < self.WEEKS and 0 <= row < 7) or cx >= self.CELL or cy >= self.CELL: return None
+        ordinal = col * 7 + row - self.first_offset(self.shown_year)
+        if not 0 <= ordinal < (366 if calendar.isleap(self.shown_year) else 365): return None
+        return (date(self.shown_year, 1, 1) + timedelta(days=ordinal)).strftime("%Y-%m-%d")
+
+    def on_motion(self, event): self.show_hover(self.cell_date(event.x, event.y))
+
+    def show_hover(self, date_str):
+        if date_str == self.hover: return
+        self.hover = date_str
+        if date_str is None: text = "칸을 누르면 그 날짜를 엽니다"
+        elif date_str in self.metrics:
+            metric = self.metrics[date_str]
+            text = f"{date_str}  ·  달성률 {completion_rate(metric) * 100:.0f}%  ·  에너지 {energy_label(metric[6] or None)}"
+        else: text = f"{date_str}  ·  기록 없음"
+        self.status_lbl.configure(text=text)
+
+    def on_click(self, event):
+        date_str = self.cell_date(event.x, event.y)
+        if date_str: self.master.open_date(date_str)
 
 class DynamicChecklist(ctk.CTkFrame):
-    def __init__(self, master, title, default_items=[], command=None):
+    """체크리스트. 항목은 고유 id로 관리하고(삭제 O(1)), 지운 행 위젯은 pool에 보관했다가 다시 씀.
+    날짜를 바꿀 때(load_data) 위젯을 새로 만들지 않고 기존 행에 내용만 다시 채움"""
+    def __init__(self, master, title, default_items=[], command=None, on_edit=None):
         super().__init__(master, fg_color="transparent")
-        self.items = [] 
+        self.items = {}       # id -> {"var", "entry", "row"} (화면 순서 = 삽입 순서)
+        self.pool = []        # 숨겨 둔 재사용 행
+        self.next_id = itertools.count()
         self.command = command 
+        self.on_edit = on_edit # 사용자가 직접 바꿨을 때만 호출 (자동 저장용)
+        self.batching = False  # True면 변경 알림(command)을 모았다가 한 번만 보냄
+        self.changed = False   # batching 중에 체크 상태나 항목 수가 바뀌었는지 (안 바뀌었으면 알리지 않음)
         header_frame = ctk.CTkFrame(self, fg_color="transparent")
         header_frame.pack(fill="x", pady=(10, 5))
         ctk.CTkLabel(header_frame, text=f" {title}", font=FONT_HEADER, anchor="w").pack(side="left")
         ctk.CTkButton(header_frame, text="+ Add", width=60, height=24, font=("Segoe UI", 11, "bold"), fg_color="transparent", 
-                      border_width=1, text_color=("gray10", "gray90"), command=self.add_item).pack(side="right")
+                      border_width=1, text_color=("gray10", "gray90"), command=self.add_new_item).pack(side="right")
         self.list_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.list_frame.pack(fill="x", expand=True)
-        for text in default_items: self.add_item(text=text)
+        self.load_data([CheckItem(text) for text in default_items], notify=False)
 
-    def add_item(self, text="", checked=False):
+    def create_row(self):
         row = ctk.CTkFrame(self.list_frame, fg_color=("gray95", "gray20"), corner_radius=6)
-        row.pack(fill="x", pady=3, ipady=2)
-        var = ctk.BooleanVar(value=checked)
-        chk = ctk.CTkCheckBox(row, text="", variable=var, width=24, height=24, corner_radius=12, command=self.on_check)
-        chk.pack(side="left", padx=(10, 5))
+        var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(row, text="", variable=var, width=24, height=24, corner_radius=12, command=self.on_check).pack(side="left", padx=(10, 5))
         entry = ctk.CTkEntry(row, font=FONT_NORMAL, height=30, border_width=0, fg_color="transparent")
-        entry.insert(0, text)
         entry.pack(side="left", fill="x", expand=True, padx=5)
-        ctk.CTkButton(row, text="×", width=25, height=25, fg_color="transparent", hover_color="#FF6B6B",
-                      text_color=("gray50", "gray90"), font=("Arial", 16),
-                      command=lambda: self.delete_item(row)).pack(side="right", padx=5)
-        self.items.append({"var": var, "entry": entry, "row": row})
-        if self.command: self.command()
-
-    def delete_item(self, row_widget):
-        for item in self.items:
-            if item["row"] == row_widget:
-                item["row"].destroy(); self.items.remove(item); break
-        if self.command: self.command()
+        entry.bind("<KeyRelease>", lambda e: self.notify_edit())
+        delete_btn = ctk.CTkButton(row, text="×", width=25, height=25, fg_color="transparent", hover_color="#FF6B6B",
+                                   text_color=("gray50", "gray90"), font=("Arial", 16))
+        delete_btn.pack(side="right", padx=5)
+        return {"var": var, "entry": entry, "row": row, "delete_btn": delete_btn}
+
+    def bind_item(self, item, text, checked):
+        """행 위젯에 내용만 다시 채움 (값이 같으면 건드리지 않음)"""
+        if item["entry"].get() != text:
+            item["entry"].delete(0, "end"); item["entry"].insert(0, text)
+        if item["var"].get() != checked: item["var"].set(checked); self.changed = True
+
+    def add_item(self, text="", checked=False):
+        item = self.pool.pop() if self.pool else self.create_row()
+        item_id = next(self.next_id)
+        item["delete_btn"].configure(command=lambda: self.delete_item(item_id))
+        self.bind_item(item, text, checked)
+        item["row"].pack(fill="x", pady=3, ipady=2)
+        self.items[item_id] = item
+        self.notify_change()
+        return item_id
+
+    def delete_item(self, item_id):
+        item = self.items.pop(item_id, None)
+        if item is None: return
+        item["row"].pack_forget(); self.pool.append(item)
+        self.notify_change()
+        self.notify_edit()
+
+    def add_new_item(self):
+        self.add_item()
+        self.notify_edit()
 
     def on_check(self):
-        if self.command: self.command()
+        self.notify_change()
+        self.notify_edit()
+
+    def notify_change(self):
+        if self.batching: self.changed = True
+        elif self.command: self.command()
+
+    def notify_edit(self):
+        if self.on_edit: self.on_edit()
+
+    def counts(self):
+        """(체크한 항목 수, 전체 항목 수)"""
+        return sum(1 for item in self.items.values() if item["var"].get()), len(self.items)
 
     def get_data(self):
-        return [{"text": item["entry"].get(), "done": item["var"].get()} for item in self.items]
+        return [{"text": item["entry"].get(), "done": item["var"].get()} for item in self.items.values()]
 
-    def load_data(self, data_list):
-        for item in self.items: item["row"].destroy()
-        self.items = []
-        for item in data_list: self.add_item(text=item.get("text", ""), checked=item.get("done", False))
+    def load_data(self, data_list, notify=True):
+        """data_list: CheckItem 목록. 기존 행을 앞에서부터 재사용하고 남는 행은 숨김.
+        변경 알림은 체크 상태나 항목 수가 바뀌었을 때만 끝에 한 번 (notify=False면 호출한 쪽이 직접 갱신)"""
+        self.batching, self.changed = True, False
+        try:
+            ids = list(self.items)
+            for item_id, data in zip(ids, data_list): self.bind_item(self.items[item_id], data.text, data.done)
+            for item_id in ids[len(data_list):]:
+                item = self.items.pop(item_id)
+                item["row"].pack_forget(); self.pool.append(item); self.changed = True
+            for data in data_list[len(ids):]: self.add_item(text=data.text, checked=data.done)
+        finally:
+            self.batching = False
+        if notify and self.changed and self.command: self.command() # 같은 루틴 목록이면 진행률을 다시 계산하지 않음
 
 
 # ======================================================
@@ -507,6 +1102,7 @@ class DynamicChecklist(ctk.CTkFrame):
 # ======================================================
 class ADHDPlannerApp(ctk.CTk):
     def __init__(self):
+        self.startup_timings = {"import_ms": round((time.perf_counter() - STARTUP_T0) * 1000, 1)}
         super().__init__()
 
         self.title("Daily Dashboard")
@@ -517,6 +1113,12 @@ class ADHDPlannerApp(ctk.CTk):
 
         self.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
 
+        # 숨은 단축키 (계측 모드): Ctrl+Alt+P 켜기/끄기, Ctrl+Alt+M 메모리 스냅샷, Ctrl+Alt+D 결과 저장
+        self.bind_all("<Control-Alt-p>", lambda e: self.toggle_profiling())
+        self.bind_all("<Control-Alt-m>", lambda e: profiler.enabled and profiler.snapshot_memory())
+        self.bind_all("<Control-Alt-d>", lambda e: self.dump_profile())
+        if os.environ.get("PLANNER_PROFILE") == "1": self.toggle_profiling()
+
         self.sidebar = ctk.CTkFrame(self, width=320, corner_radius=0)
         self.sidebar.pack(side="left", fill="y")
         self.sidebar.pack_propagate(False)
@@ -524,22 +1126,90 @@ class ADHDPlannerApp(ctk.CTk):
         self.main_area = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
         self.main_area.pack(side="right", fill="both", expand=True)
         
+        self.store = DayStore(DATA_DIR, open_now=False)
+        self.io = TkExecutor(self) # 화면 콜백에서의 파일/DB 읽기는 모두 여기서 (결과는 Tk 스레드로 돌아옴)
+        # 인덱스 열기 + 폴더 동기화도 작업 스레드에서: 끝나기 전에 낸 날짜/달력 읽기는 작업 스레드에서 store.conn을 기다림
+        self.io.submit(self.store.open, on_done=self.on_store_open, on_error=self.on_store_error)
+        self.watcher = DirWatcher(DATA_DIR, DAY_FILE_RE, polling=WATCH_MODE == "poll") # 다른 프로그램이 바꾼 날짜 파일
+        if WATCH_MODE != "off": self.watcher.start()
         self.current_date_str = datetime.now().strftime("%Y-%m-%d")
         self.selected_date_ideas = "" 
         self.previous_progress = 0.0
+        self.ui_ready = False         # 모든 카드 생성 완료 여부
+        self.pending_details = None   # 카드가 생성되기 전에 불러온 날짜 데이터 (생성 후 적용)
+        self.exit_when_ready = False  # --startup-time: 측정 결과를 출력하고 종료
+        self.on_ready = None          # 전체 UI가 준비되면 on_ready(app) 한 번 호출 (planner_diagnostics.py 점검용)
+        self.autosave_writer = AutosaveWriter(self.store)
+        self.prefetcher = Prefetcher(self.store) # 선택한 날짜 주변/같은 달 기록을 미리 캐시에 읽어 둠
+        self.shown_ideas = deque(maxlen=IDEA_EXCLUDE_RECENT) # 최근에 보여준 랜덤 아이디어 날짜
+        self.tray = TrayService(self, {"show": self.show_window_from_tray, "quit": self.quit_app}, self.io, create_tray_icon_image)
+        self.autosave_job = None
+        self.dirty_fields = set()     # 마지막 자동 저장 이후 바뀐 필드
+        self.snapshot = {}            # 현재 날짜의 최신 데이터
+        self.saved_snapshot = None    # 마지막으로 저장(또는 로드)한 데이터
+        self.loading = False
+        self.day_loading = None       # 불러오는 중인 날짜 (도착 전까지 화면은 이전 날짜라 자동 저장을 멈춤)
+        self.read_only = None         # 파일이 잘못돼 읽기 전용으로 연 날짜의 오류 메시지 (그동안 저장하지 않아 원본 파일을 보존)
+        self.save_failing = False     # 자동 저장이 실패한 뒤 아직 성공하지 못함 (오류 창을 한 번만 띄움)
+        self.mini_window = None       # 미니 모드 창 (처음 쓸 때 한 번만 생성)
         
         self.setup_sidebar()
         self.setup_dashboard()
         self.load_date_data(self.current_date_str)
+        self.after_idle(self.on_first_paint)
+        self.after(AUTOSAVE_POLL_MS, self.poll_saved)
+        self.after(1000, lambda: audio.preload("fanfare.mp3")) # 첫 화면이 뜬 뒤 효과음 미리 디코딩
+        if TRAY_AVAILABLE: self.after(1000, self.tray.preload)
+
+    def on_store_open(self, _):
+        self.startup_timings["store_open_ms"] = self.startup_elapsed_ms()
+
+    def on_store_error(self, error):
+        messagebox.showerror("기록 오류", f"기록 인덱스를 열 수 없어 종료합니다.\n\n{type(error).__name__}: {error}")
+        self.quit_app()
+
+    def startup_elapsed_ms(self): return round((time.perf_counter() - STARTUP_T0) * 1000, 1)
+
+    def on_first_paint(self):
+        self.startup_timings["first_paint_ms"] = self.startup_elapsed_ms()
+        if self.build_stages: self.after_idle(self.build_next_stage)
+        else: self.on_ui_ready()
+
+    def build_next_stage(self):
+        self.build_stages.pop(0)()
+        if self.build_stages: self.after_idle(self.build_next_stage); return
+        self.ui_ready = True
+        if self.pending_details is not None:
+            self.apply_details(self.pending_details); self.pending_details = None
+        self.reset_autosave_baseline()
+        self.update_progress()
+        self.on_date_select(datetime.strptime(self.current_date_str, "%Y-%m-%d").date())
+        self.on_ui_ready()
+
+    def on_ui_ready(self):
+        self.startup_timings["ready_ms"] = self.startup_elapsed_ms()
+        if self.exit_when_ready:
+            print(json.dumps(self.startup_timings))
+            self.destroy()
+        elif self.on_ready:
+            self.on_ready(self)
+
+    def toggle_profiling(self):
+        enabled = profiler.toggle(self)
+        self.title("Daily Dashboard [PROFILE]" if enabled else "Daily Dashboard")
+
+    def dump_profile(self):
+        if not profiler.events: messagebox.showinfo("Profile", "기록된 계측 결과가 없습니다. (Ctrl+Alt+P로 켜기)"); return
+        messagebox.showinfo("Profile", f"저장됨: {profiler.dump(PROFILE_DIR)}")
 
     def setup_sidebar(self):
         ctk.CTkLabel(self.sidebar, text="MY DASHBOARD", font=("Segoe UI", 26, "bold")).pack(pady=(30, 10))
         cal_container = ctk.CTkFrame(self.sidebar, fg_color="transparent")
         cal_container.pack(fill="x", padx=15, pady=10)
-        self.cal = CTkCalendar(cal_container, command=self.on_date_select)
+        self.cal = CTkCalendar(cal_container, command=self.on_date_select, metrics_provider=self.store.aggregates, io=self.io)
         self.cal.pack()
 
-        self.timer = PomodoroTimer(self.sidebar)
+        self.timer = PomodoroTimer(self.sidebar, goal_provider=self.top_goal, on_session=lambda session: self.io.submit(self.store.record_session, session))
         self.timer.pack(fill="x", padx=20, pady=10)
 
         self.info_frame = ctk.CTkFrame(self.sidebar, fg_color=("gray90", "gray20"), corner_radius=10)
@@ -549,6 +1219,10 @@ class ADHDPlannerApp(ctk.CTk):
         self.stats_label = ctk.CTkLabel(self.info_frame, text="오늘의 기록을 시작하세요!", font=FONT_SMALL, justify="center")
         self.stats_label.pack(pady=5)
 
+        self.search_entry = ctk.CTkEntry(self.sidebar, placeholder_text="🔍 기록 검색 (아이디어, 메모, 목표...)", height=32)
+        self.search_entry.pack(fill="x", padx=20, pady=(10, 0))
+        self.search_entry.bind("<Return>", lambda e: self.show_search_results())
+
         self.day_idea_btn = ctk.CTkButton(self.sidebar, text="이 날의 아이디어 확인", command=self.show_day_idea, state="disabled", fg_color="transparent", text_color=("gray10", "gray90"))
         self.day_idea_btn.pack(fill="x", padx=20, pady=(10, 5))
         
@@ -557,6 +1231,9 @@ class ADHDPlannerApp(ctk.CTk):
 
         # [수정] 주간 리포트 기능 연결
         ctk.CTkButton(self.sidebar, text="📈 주간 리포트 (통계)", command=self.show_weekly_report, fg_color="#34495E", hover_color="#2C3E50").pack(fill="x", padx=20, pady=5)
+        ctk.CTkButton(self.sidebar, text="🔎 전체 기록 분석", command=self.show_analytics, fg_color="#34495E", hover_color="#2C3E50").pack(fill="x", padx=20, pady=5)
+        ctk.CTkButton(self.sidebar, text="🗓 1년 한눈에 보기", command=lambda: YearOverviewWindow(self), fg_color="#34495E", hover_color="#2C3E50").pack(fill="x", padx=20, pady=5)
+        ctk.CTkButton(self.sidebar, text="📤 내보내기 (CSV / MD / ICS)", command=lambda: ExportWindow(self), fg_color="#34495E", hover_color="#2C3E50").pack(fill="x", padx=20, pady=5)
         
         ctk.CTkButton(self.sidebar, text="📌 Mini Mode (플로팅)", command=self.switch_to_mini_mode, fg_color="#E67E22", hover_color="#D35400").pack(fill="x", padx=20, pady=5)
 
@@ -599,10 +1276,11 @@ class ADHDPlannerApp(ctk.CTk):
             row = ctk.CTkFrame(self.goal_card, fg_color="transparent")
             row.pack(fill="x", padx=20, pady=5)
             var = ctk.BooleanVar()
-            chk = ctk.CTkCheckBox(row, text="", variable=var, width=24, height=24, corner_radius=12, command=self.update_progress)
+            chk = ctk.CTkCheckBox(row, text="", variable=var, width=24, height=24, corner_radius=12, command=self.on_goal_check)
             chk.pack(side="left", padx=(0, 10))
             entry = ctk.CTkEntry(row, placeholder_text=f"오늘의 핵심 목표 {i+1}", font=FONT_NORMAL, height=40, border_width=0, fg_color=("gray95", "gray15"))
             entry.pack(side="left", fill="x", expand=True)
+            entry.bind("<KeyRelease>", lambda e: (self.mark_dirty("goals"), self.refresh_focus_goal()))
             
             btn_up = ctk.CTkButton(row, text="▲", width=25, height=25, fg_color="transparent", text_color=("black", "white"), font=("Arial", 12, "bold"), command=lambda idx=i: self.move_goal(idx, -1))
             btn_up.pack(side="right", padx=(2, 0))
@@ -616,12 +1294,21 @@ class ADHDPlannerApp(ctk.CTk):
         grid_frame.pack(fill="both", expand=True, pady=10)
         grid_frame.grid_columnconfigure(0, weight=1)
         grid_frame.grid_columnconfigure(1, weight=1)
-        left_col = ctk.CTkFrame(grid_frame, fg_color="transparent")
-        left_col.grid(row=0, column=0, sticky="nsew", padx=(0, 15))
-        right_col = ctk.CTkFrame(grid_frame, fg_color="transparent")
-        right_col.grid(row=0, column=1, sticky="nsew", padx=(15, 0))
-
-        time_card = ctk.CTkFrame(left_col, fg_color=("white", "gray20"), corner_radius=15)
+        self.left_col = ctk.CTkFrame(grid_frame, fg_color="transparent")
+        self.left_col.grid(row=0, column=0, sticky="nsew", padx=(0, 15))
+        self.right_col = ctk.CTkFrame(grid_frame, fg_color="transparent")
+        self.right_col.grid(row=0, column=1, sticky="nsew", padx=(15, 0))
+        self.energy_var = ctk.StringVar(value="MEDIUM ⚡")
+        self.energy_var.trace_add("write", lambda *args: self.mark_dirty("energy"))
+
+        # 나머지 카드: 빠른 시작이면 첫 화면 이후 idle 콜백에서 하나씩 생성
+        self.build_stages = [self.setup_time_card, self.setup_misc_card, self.setup_note_card, self.setup_check_card]
+        if not FAST_START:
+            while self.build_stages: self.build_stages.pop(0)()
+            self.ui_ready = True
+
+    def setup_time_card(self):
+        time_card = ctk.CTkFrame(self.left_col, fg_color=("white", "gray20"), corner_radius=15)
         time_card.pack(fill="x", pady=(0, 15))
         ctk.CTkLabel(time_card, text="🕒 Time Blocks", font=FONT_HEADER).pack(anchor="w", padx=20, pady=(15, 10))
         self.time_entries = {}
@@ -633,6 +1320,7 @@ class ADHDPlannerApp(ctk.CTk):
             ctk.CTkLabel(row, text=t, width=80, anchor="w", font=("Segoe UI", 12, "bold"), text_color="gray").pack(side="left")
             entry = ctk.CTkEntry(row, height=32, border_width=0, fg_color=("gray95", "gray15"))
             entry.pack(side="right", fill="x", expand=True)
+            entry.bind("<KeyRelease>", lambda e: self.mark_dirty("time_blocks"))
             self.time_entries[t] = entry
             self.time_entry_widgets.append(entry)
             
@@ -643,30 +1331,37 @@ class ADHDPlannerApp(ctk.CTk):
 
         ctk.CTkFrame(time_card, height=15, fg_color="transparent").pack()
 
-        misc_card = ctk.CTkFrame(left_col, fg_color=("white", "gray20"), corner_radius=15)
+    def setup_misc_card(self):
+        misc_card = ctk.CTkFrame(self.left_col, fg_color=("white", "gray20"), corner_radius=15)
         misc_card.pack(fill="x")
         ctk.CTkLabel(misc_card, text="🔋 Energy Level", font=FONT_HEADER).pack(anchor="w", padx=20, pady=(15, 5))
-        self.energy_var = ctk.StringVar(value="Medium")
         ctk.CTkSegmentedButton(misc_card, values=["HIGH 🔥", "MEDIUM ⚡", "LOW 💤"], variable=self.energy_var, font=("Segoe UI", 12, "bold"), height=35).pack(fill="x", padx=20, pady=10)
         ctk.CTkLabel(misc_card, text="💡 아이디어 (Ideas)", font=FONT_HEADER).pack(anchor="w", padx=20, pady=(15, 5))
         self.idea_box = ctk.CTkTextbox(misc_card, height=120, font=FONT_NORMAL, fg_color=("gray95", "gray15"))
         self.idea_box.pack(fill="x", padx=20, pady=(0, 20))
+        self.idea_box.bind("<KeyRelease>", lambda e: self.mark_dirty("ideas"))
 
-        note_card = ctk.CTkFrame(right_col, fg_color=("white", "gray20"), corner_radius=15)
+    def setup_note_card(self):
+        note_card = ctk.CTkFrame(self.right_col, fg_color=("white", "gray20"), corner_radius=15)
         note_card.pack(fill="x", pady=(0, 15))
         ctk.CTkLabel(note_card, text="🧠 Brain Dump", font=FONT_HEADER).pack(anchor="w", padx=20, pady=(15, 5))
         self.brain_dump = ctk.CTkTextbox(note_card, height=100, font=FONT_NORMAL, fg_color=("gray95", "gray15"))
         self.brain_dump.pack(fill="x", padx=20, pady=(0, 15))
+        self.brain_dump.bind("<KeyRelease>", lambda e: self.mark_dirty("brain_dump"))
         ctk.CTkLabel(note_card, text="🏆 Small Wins", font=FONT_HEADER).pack(anchor="w", padx=20, pady=(5, 5))
         self.small_wins = ctk.CTkTextbox(note_card, height=80, font=FONT_NORMAL, fg_color=("gray95", "gray15"))
         self.small_wins.pack(fill="x", padx=20, pady=(0, 20))
+        self.small_wins.bind("<KeyRelease>", lambda e: self.mark_dirty("small_wins"))
 
-        check_card = ctk.CTkFrame(right_col, fg_color=("white", "gray20"), corner_radius=15)
+    def setup_check_card(self):
+        check_card = ctk.CTkFrame(self.right_col, fg_color=("white", "gray20"), corner_radius=15)
         check_card.pack(fill="x")
-        self.routine_list = DynamicChecklist(check_card, "ROUTINE CHECK", default_items=["물 마시기", "스트레칭"], command=self.update_progress)
+        self.routine_list = DynamicChecklist(check_card, "ROUTINE CHECK", default_items=["물 마시기", "스트레칭"], command=self.update_progress,
+                                             on_edit=lambda: self.mark_dirty("routines"))
         self.routine_list.pack(fill="x", padx=20, pady=(10, 5))
         ctk.CTkFrame(check_card, height=1, fg_color=("gray90", "gray30")).pack(fill="x", padx=20, pady=5)
-        self.evening_list = DynamicChecklist(check_card, "EVENING ROUTINE", default_items=["회고하기", "내일 준비"], command=self.update_progress)
+        self.evening_list = DynamicChecklist(check_card, "EVENING ROUTINE", default_items=["회고하기", "내일 준비"], command=self.update_progress,
+                                             on_edit=lambda: self.mark_dirty("evening"))
         self.evening_list.pack(fill="x", padx=20, pady=(5, 20))
 
     # --- 기능 로직 ---
@@ -689,6 +1384,7 @@ class ADHDPlannerApp(ctk.CTk):
             self.goal_widgets[index]["entry"].delete(0, "end"); self.goal_widgets[index]["entry"].insert(0, target_text); self.goal_widgets[index]["chk"].set(target_check)
             self.goal_widgets[target_index]["entry"].delete(0, "end"); self.goal_widgets[target_index]["entry"].insert(0, current_text); self.goal_widgets[target_index]["chk"].set(current_check)
             self.update_progress()
+            self.mark_dirty("goals")
 
     def move_time_block(self, index, direction):
         target_index = index + direction
@@ -698,6 +1394,7 @@ class ADHDPlannerApp(ctk.CTk):
             curr_text = curr_entry.get(); target_text = target_entry.get()
             curr_entry.delete(0, "end"); curr_entry.insert(0, target_text)
             target_entry.delete(0, "end"); target_entry.insert(0, curr_text)
+            self.mark_dirty("time_blocks")
 
     def move_picked_goal_to_top(self, picked_text):
         for i, w in enumerate(self.goal_widgets):
@@ -708,28 +1405,37 @@ class ADHDPlannerApp(ctk.CTk):
                     w["entry"].delete(0, "end"); w["entry"].insert(0, top_text); w["chk"].set(top_chk)
                 break
         self.update_progress()
+        self.mark_dirty("goals")
 
     def minimize_to_tray(self):
+        self.autosave()
         if not TRAY_AVAILABLE: self.quit(); return
         self.withdraw()
-        image = create_tray_icon_image()
-        menu = (item('Open Dashboard', self.show_window_from_tray), item('Exit App', self.quit_app))
-        self.tray_icon = pystray.Icon("name", image, "ADHD Planner", menu)
-        threading.Thread(target=self.tray_icon.run, daemon=True).start()
+        self.tray.show_icon()
 
-    def show_window_from_tray(self, icon, item):
-        icon.stop()
-        self.after(0, self.deiconify)
+    def show_window_from_tray(self):
+        self.tray.hide_icon()
+        self.deiconify()
 
-    def quit_app(self, icon, item):
-        icon.stop()
+    def quit_app(self):
+        self.tray.stop()
+        self.watcher.stop()
+        self.timer.end_session("abandoned") # 진행 중이던 뽀모도로도 기록
+        self.autosave_writer.close()
         self.quit()
 
+    def on_goal_check(self):
+        self.update_progress()
+        self.mark_dirty("goals")
+
+    @timed("update_progress")
     def update_progress(self):
+        self.refresh_focus_goal()
         if not hasattr(self, 'routine_list') or not hasattr(self, 'evening_list') or not hasattr(self, 'goal_widgets'): return
-        total = 3 + len(self.routine_list.items) + len(self.evening_list.items)
+        (routine_done, routine_total), (evening_done, evening_total) = self.routine_list.counts(), self.evening_list.counts()
+        total = 3 + routine_total + evening_total
         if total == 0: return
-        checked = sum(1 for w in self.goal_widgets if w["chk"].get()) + sum(1 for item in self.routine_list.items if item["var"].get()) + sum(1 for item in self.evening_list.items if item["var"].get())
+        checked = sum(1 for w in self.goal_widgets if w["chk"].get()) + routine_done + evening_done
         ratio = checked / total
         self.progress_bar.set(ratio)
         if ratio == 1.0 and self.previous_progress < 1.0: self.trigger_celebration()
@@ -740,27 +1446,43 @@ class ADHDPlannerApp(ctk.CTk):
 
     def trigger_celebration(self):
         celebration = ConfettiOverlay(self) 
-        celebration.start()
+        celebration.start(CONFETTI_PARTICLES)
 
     def show_real_random_idea(self):
-        all_files = [f for f in os.listdir(DATA_DIR) if f.endswith(".json")]
-        valid_ideas = []
-        for fname in all_files:
-            try:
-                with open(os.path.join(DATA_DIR, fname), "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    idea_text = data.get("ideas", "").strip()
-                    if idea_text:
-                        valid_ideas.append((fname.replace(".json", ""), idea_text))
-            except: continue
-
-        if not valid_ideas:
+        exclude = set(self.shown_ideas)
+        self.io.submit(lambda: self.store.random_idea(half_life_days=IDEA_HALF_LIFE_DAYS, exclude=exclude), key="random_idea", on_done=self.show_picked_idea)
+
+    def show_picked_idea(self, picked):
+        if not picked:
             messagebox.showinfo("알림", "아직 저장된 아이디어가 없습니다. 아이디어를 먼저 기록해보세요!")
             return
 
-        picked_date, picked_text = random.choice(valid_ideas)
+        picked_date, picked_text = picked
+        self.shown_ideas.append(picked_date)
         self.create_idea_popup(f"Random Idea - {picked_date}", f"🎲 Random Pick from {picked_date}", picked_text)
 
+    def show_search_results(self):
+        query = self.search_entry.get().strip()
+        if not query: return
+        self.io.submit(search_days, self.store, query, key="search", on_done=lambda results: self.show_search_window(query, results))
+
+    def show_search_window(self, query, results):
+        top = ctk.CTkToplevel(self); top.title(f"Search - {query}"); top.geometry("520x450")
+        top.lift(); top.attributes('-topmost', True); top.focus_force()
+        ctk.CTkLabel(top, text=f"🔍 '{query}' 검색 결과 {len(results)}건", font=FONT_HEADER).pack(pady=10)
+        frame = ctk.CTkScrollableFrame(top, fg_color="transparent")
+        frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        if not results: ctk.CTkLabel(frame, text="검색 결과가 없습니다.", font=FONT_NORMAL, text_color="gray").pack(pady=20)
+        for date_str, field, text in results:
+            ctk.CTkButton(frame, text=f"{date_str}  ·  {SEARCH_FIELD_LABELS.get(field, field)}\n{text}", anchor="w", font=FONT_SMALL,
+                          fg_color=("gray90", "gray20"), hover_color=("gray80", "gray30"), text_color=("black", "white"),
+                          command=lambda d=date_str: (top.destroy(), self.open_date(d))).pack(fill="x", pady=3)
+
+    def open_date(self, date_str):
+        """달력에서 해당 날짜를 선택하고 대시보드에 불러옴"""
+        self.cal.select_date(datetime.strptime(date_str, "%Y-%m-%d").date())
+        self.load_date_data(date_str)
+
     def pick_random_goal(self):
         goals = [w["entry"].get() for w in self.goal_widgets if w["entry"].get().strip()]
         if not goals: messagebox.showinfo("알림", "먼저 목표를 입력해주세요!"); return
@@ -770,55 +1492,69 @@ class ADHDPlannerApp(ctk.CTk):
         # [NEW] WeeklyReportWindow 호출 (새로운 클래스 사용)
         WeeklyReportWindow(self)
 
-    def switch_to_mini_mode(self):
-        self.withdraw()
-        active_goal = "모든 목표 달성! 🎉"
+    def show_analytics(self):
+        if not NUMPY_AVAILABLE:
+            messagebox.showinfo("알림", "전체 기록 분석을 보려면 numpy를 설치하세요.\n(pip install numpy)"); return
+        self.autosave()
+        def analyze():
+            self.autosave_writer.flush(timeout=2) # 오늘 수정한 내용까지 반영
+            return lazy_import("planner_analytics").analyze(self.store)
+        self.io.submit(analyze, key="analytics", on_done=lambda result: AnalyticsWindow(self, result))
+
+    def top_goal(self):
+        """체크하지 않은 첫 번째 목표 (없으면 빈 문자열)"""
         for w in self.goal_widgets:
-            if not w["chk"].get() and w["entry"].get().strip(): active_goal = w["entry"].get(); break
-        
-        self.mini_window = ctk.CTkToplevel(); self.mini_window.geometry("300x180")
-        self.mini_window.overrideredirect(True); self.mini_window.attributes('-topmost', True)
-        
-        drag_frame = ctk.CTkFrame(self.mini_window, corner_radius=10, fg_color=("gray85", "gray25"))
-        drag_frame.pack(fill="both", expand=True)
-        control_frame = ctk.CTkFrame(self.mini_window, corner_radius=0, fg_color=("gray90", "gray20"), height=60)
-        control_frame.pack(fill="x", side="bottom")
+            if not w["chk"].get() and w["entry"].get().strip(): return w["entry"].get().strip()
+        return ""
 
-        for w in [drag_frame, ctk.CTkLabel(drag_frame, text="🔥 Current Focus", font=("Segoe UI", 12, "bold"), text_color="gray"), ctk.CTkLabel(drag_frame, text=active_goal, font=("Segoe UI", 16, "bold"), wraplength=280)]:
-            w.pack(pady=(10,0)) if isinstance(w, ctk.CTkLabel) else None
-            w.bind("<Button-1>", self.start_move); w.bind("<B1-Motion>", self.do_move)
+    def refresh_focus_goal(self):
+        """미니 창의 목표 표시 갱신 (최상단 미완료 목표가 바뀌었을 때만 다시 그림)"""
+        if self.mini_window is not None: self.mini_window.set_goal(self.top_goal())
 
-        slider = ctk.CTkSlider(control_frame, from_=0.1, to=1.0, number_of_steps=10, width=150, command=lambda v: self.mini_window.attributes('-alpha', v))
-        slider.set(1.0); slider.pack(pady=(10, 5))
-        ctk.CTkButton(control_frame, text="Expand", command=self.restore_main_window, width=80, height=24).pack(pady=(0, 10))
+    def switch_to_mini_mode(self):
+        self.withdraw()
+        if self.mini_window is None:
+            self.mini_window = MiniWindow(self, on_expand=self.restore_main_window)
+            self.timer.add_listener(self.mini_window.set_timer) # 뽀모도로 남은 시간도 같은 타이머로 표시
+        self.refresh_focus_goal()
+        self.mini_window.deiconify()
 
-    def start_move(self, event): self.x, self.y = event.x, event.y
-    def do_move(self, event): self.mini_window.geometry(f"+{self.mini_window.winfo_x() + event.x - self.x}+{self.mini_window.winfo_y() + event.y - self.y}")
-    def restore_main_window(self): self.mini_window.destroy(); self.deiconify()
+    def restore_main_window(self): self.mini_window.withdraw(); self.deiconify()
 
+    @timed("day_preview")
     def on_date_select(self, date_obj):
         selected_date = date_obj.strftime("%Y-%m-%d")
-        file_path = os.path.join(DATA_DIR, f"{selected_date}.json")
         self.preview_date_label.configure(text=f"{selected_date}")
+        self.prefetcher.request(neighbour_dates(date_obj))
         
-        if selected_date == datetime.now().strftime("%Y-%m-%d"):
+        if selected_date == datetime.now().strftime("%Y-%m-%d") and self.ui_ready:
+            self.io.cancel("preview")
             self.stats_label.configure(text=self.calculate_live_stats())
-            has_idea = len(self.idea_box.get("1.0", "end-1c").strip()) > 0
             self.selected_date_ideas = self.idea_box.get("1.0", "end-1c")
+            self.set_idea_button(len(self.selected_date_ideas.strip()) > 0)
         else:
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                goals = data.get("goals", [])
-                done = sum(1 for g in goals if g.get("done", False))
-                self.selected_date_ideas = data.get("ideas", "")
-                self.stats_label.configure(text=f"Goals: {done}/{len(goals)}  |  Energy: {data.get('energy', '-')}")
-                has_idea = len(self.selected_date_ideas) > 0
-            else:
-                self.stats_label.configure(text="기록 없음")
-                has_idea = False
-                self.selected_date_ideas = ""
-        
+            self.io.submit(self.read_record, selected_date, key="preview", on_done=self.show_preview, on_error=self.show_preview_error)
+
+    def read_record(self, date_str):
+        """(작업 스레드) 날짜의 DayRecord, 기록이 없으면 None (파일이 잘못됐으면 RecordError)"""
+        self.store.check(date_str)
+        data = self.store.get(date_str)
+        return None if data is None else DayRecord.from_dict(data)
+
+    def show_preview(self, record):
+        if record is not None:
+            self.selected_date_ideas = record.ideas
+            self.stats_label.configure(text=record.summary())
+        else:
+            self.stats_label.configure(text="기록 없음")
+            self.selected_date_ideas = ""
+        self.set_idea_button(len(self.selected_date_ideas) > 0)
+
+    def show_preview_error(self, error):
+        self.stats_label.configure(text="기록 파일 오류 (읽기 전용)")
+        self.selected_date_ideas = ""; self.set_idea_button(False)
+
+    def set_idea_button(self, has_idea):
         self.day_idea_btn.configure(state="normal" if has_idea else "disabled", fg_color="#008000" if has_idea else "transparent", hover_color="#006400" if has_idea else ("gray70", "gray30"))
 
     def show_day_idea(self): self.create_idea_popup(f"Idea - {self.cal.get_date()}", f"💡 Ideas from {self.cal.get_date()}", self.selected_date_ideas)
@@ -832,81 +1568,175 @@ class ADHDPlannerApp(ctk.CTk):
 
     def load_selected_dashboard(self): self.load_date_data(self.cal.get_date())
 
-    def save_data(self):
-        data = {
-            "goals": [{"text": w["entry"].get(), "done": w["chk"].get()} for w in self.goal_widgets],
-            "time_blocks": {t: entry.get() for t, entry in self.time_entries.items()},
-            "energy": self.energy_var.get(), "ideas": self.idea_box.get("1.0", "end-1c"),
-            "brain_dump": self.brain_dump.get("1.0", "end-1c"), "small_wins": self.small_wins.get("1.0", "end-1c"),
-            "routines": self.routine_list.get_data(), "evening": self.evening_list.get_data()
+    # --- 자동 저장 ---
+
+    def read_fields(self, fields):
+        readers = {
+            "goals": lambda: [{"text": w["entry"].get(), "done": w["chk"].get()} for w in self.goal_widgets],
+            "time_blocks": lambda: {t: entry.get() for t, entry in self.time_entries.items()},
+            "energy": self.energy_var.get, "ideas": lambda: self.idea_box.get("1.0", "end-1c"),
+            "brain_dump": lambda: self.brain_dump.get("1.0", "end-1c"), "small_wins": lambda: self.small_wins.get("1.0", "end-1c"),
+            "routines": self.routine_list.get_data, "evening": self.evening_list.get_data,
         }
-        with open(os.path.join(DATA_DIR, f"{self.current_date_str}.json"), "w", encoding="utf-8") as f: json.dump(data, f, ensure_ascii=False, indent=4)
-        if self.cal.get_date() == self.current_date_str: self.on_date_select(datetime.strptime(self.current_date_str, "%Y-%m-%d").date())
-        messagebox.showinfo("Saved", "대시보드가 저장되었습니다.")
+        return {field: readers[field]() for field in fields}
+
+    def reset_autosave_baseline(self):
+        """날짜를 불러온 직후 상태를 기준으로 삼음 (바뀐 게 없으면 저장하지 않음)"""
+        self.dirty_fields.clear()
+        self.snapshot = self.read_fields(DAY_FIELDS)
+        self.saved_snapshot = dict(self.snapshot)
+
+    def mark_dirty(self, field):
+        if self.loading or not self.ui_ready or self.day_loading or self.read_only: return
+        self.dirty_fields.add(field)
+        if self.autosave_job: self.after_cancel(self.autosave_job)
+        self.autosave_job = self.after(AUTOSAVE_DELAY_MS, self.autosave)
+
+    @timed("autosave_snapshot")
+    def autosave(self):
+        """바뀐 필드만 위젯에서 다시 읽어 스냅샷을 갱신하고, 마지막 저장본과 다를 때만 백그라운드 저장"""
+        if self.autosave_job: self.after_cancel(self.autosave_job); self.autosave_job = None
+        if not self.ui_ready or self.day_loading or self.read_only: return
+        self.snapshot.update(self.read_fields(self.dirty_fields)); self.dirty_fields.clear()
+        if self.snapshot == self.saved_snapshot: return
+        data = dict(self.snapshot)
+        self.autosave_writer.submit(self.current_date_str, data)
+        self.saved_snapshot = data
+
+    def poll_saved(self):
+        """백그라운드 저장이 끝난 날짜를 달력과 미리보기에 반영"""
+        saved = set()
+        while True:
+            try: saved.add(self.autosave_writer.saved.get_nowait())
+            except queue.Empty: break
+        if saved:
+            self.cal.update_calendar(reload=True)
+            if self.cal.get_date() in saved: self.on_date_select(self.cal.selected_date)
+        changed = set()
+        while True:
+            try: changed |= self.watcher.changes.get_nowait()
+            except queue.Empty: break
+        if changed: self.io.submit(self.store.refresh, sorted(name[:-5] for name in changed), on_done=self.on_external_change)
+        while True:
+            try: date_str, data = self.autosave_writer.conflicts.get_nowait()
+            except queue.Empty: break
+            self.resolve_conflict(date_str, data)
+        failed = {}
+        while True:
+            try: date_str, error = self.autosave_writer.errors.get_nowait()
+            except queue.Empty: break
+            failed[date_str] = error
+        if saved - failed.keys(): self.save_failing = False
+        if failed: self.on_save_failed(failed)
+        self.after(AUTOSAVE_POLL_MS, self.poll_saved)
+
+    def on_save_failed(self, failed):
+        """저장하지 못한 날짜: 열려 있는 날짜면 다음 자동 저장에서 다시 시도하게 하고, 연달아 실패하는 동안은 한 번만 알림"""
+        if self.current_date_str in failed: self.saved_snapshot = None
+        if self.save_failing: return
+        self.save_failing = True
+        details = "\n".join(f"{d}: {e}" for d, e in sorted(failed.items()))
+        messagebox.showerror("저장 실패", f"기록을 저장하지 못했습니다. 입력한 내용은 화면에 남아 있으며, 다음 수정이나 Save 때 다시 저장합니다.\n\n{details}")
+
+    def on_external_change(self, changed):
+        """다른 프로그램이 바꾼 날짜: 달력은 해당 칸만 다시 칠하고, 열려 있는 날짜는 수정 중이 아니고 저장 대기 중도 아니면 다시 불러옴
+        (수정 중이거나 저장이 남아 있으면 그 저장이 충돌로 알려 줌)"""
+        if not changed: return
+        self.cal.update_days(changed)
+        current = self.current_date_str
+        if current in changed and not self.dirty_fields and not self.day_loading and not self.autosave_writer.writing(current):
+            self.load_date_data(current)
+        elif self.cal.get_date() in changed: self.on_date_select(self.cal.selected_date)
+
+    def resolve_conflict(self, date_str, data):
+        keep_mine = messagebox.askyesno("기록 충돌", f"{date_str} 기록이 다른 곳(다른 프로그램, 동기화)에서 바뀌어 저장하지 않았습니다.\n\n"
+                                        "예: 지금 내용으로 덮어쓰기\n아니오: 바뀐 내용 불러오기 (이번 수정은 버림)")
+        if keep_mine: self.autosave_writer.submit(date_str, data, force=True); return
+        self.io.submit(self.store.revert, date_str, on_done=lambda changed: self.on_reverted(date_str, changed))
+
+    def on_reverted(self, date_str, changed):
+        self.cal.update_calendar(reload=True)
+        if date_str == self.current_date_str: # 이번 수정은 버리고 (자동 저장이 다시 쓰지 않게) 디스크 내용으로 다시 불러옴
+            self.dirty_fields.clear(); self.saved_snapshot = self.snapshot
+            self.load_date_data(date_str)
+
+    def save_data(self):
+        """수동 저장: 변경 여부와 관계없이 바로 저장 요청"""
+        if not self.ui_ready: return
+        if self.read_only: messagebox.showerror("읽기 전용", f"{self.current_date_str} 기록 파일을 읽을 수 없어 저장하지 않습니다.\n{self.read_only}"); return
+        self.dirty_fields.update(DAY_FIELDS)
+        self.saved_snapshot = None
+        self.autosave()
+        self.save_btn.configure(text="Saved ✓")
+        self.after(1500, lambda: self.save_btn.configure(text="Save Dashboard"))
 
     def load_date_data(self, date_str):
+        self.autosave() # 이전 날짜의 수정 사항 먼저 저장
         self.current_date_str = date_str; self.date_display.configure(text=date_str)
-        path = os.path.join(DATA_DIR, f"{date_str}.json")
+        self.day_loading = date_str
+        self.io.submit(self.checkout_day, date_str, key="day", on_done=self.show_day, on_error=lambda e: self.on_day_error(date_str, e))
+
+    def checkout_day(self, date_str):
+        """(작업 스레드) 편집할 날짜를 불러오고, 지금 파일 내용을 저장 충돌 확인 기준으로 기록"""
+        self.store.checkout(date_str)
+        return load_day(self.store, date_str, carry_goals=CARRY_OVER_GOALS)
+
+    def on_day_error(self, date_str, error):
+        """날짜를 열지 못함 (잘못된 파일, 디스크/인덱스 오류 등 모든 예외): 빈 기록을 읽기 전용으로 보여 주고 저장하지 않음.
+        day_loading을 풀지 않으면 이후 수정이 모두 저장되지 않으므로 화면 전환을 먼저 끝내고 오류를 알림"""
+        if error is self.store.open_error: return # on_store_error에서 알리고 종료
+        message = str(error) if isinstance(error, RecordError) else f"{type(error).__name__}: {error}"
+        self.show_day(DayRecord(), read_only=message) # 원본 파일을 고치면 (폴더 감시로) 다시 열림
+        messagebox.showerror("기록 오류", f"{date_str} 기록을 읽을 수 없어 읽기 전용으로 엽니다.\n문제를 해결하기 전까지 저장하지 않습니다.\n\n{message}")
+
+    @timed("day_load")
+    def show_day(self, record, read_only=None):
+        date_str, self.day_loading = self.day_loading, None
+        self.read_only = read_only
+        self.date_display.configure(text=f"{date_str} 🔒 읽기 전용" if read_only else date_str)
+        self.apply_goals(record)
+        if self.ui_ready: self.apply_details(record)
+        else: self.pending_details = record
+        if self.ui_ready: self.reset_autosave_baseline()
+        self.update_progress()
+        if self.ui_ready: self.on_date_select(datetime.strptime(date_str, "%Y-%m-%d").date())
+
+    def apply_goals(self, record):
         for w in self.goal_widgets: w["entry"].delete(0, "end"); w["chk"].set(False)
+        self.progress_bar.set(0)
+        for w, goal in zip(self.goal_widgets, record.goals): w["entry"].insert(0, goal.text); w["chk"].set(goal.done)
+
+    def apply_details(self, record):
+        self.loading = True
+        try: self.fill_details(record)
+        finally: self.loading = False
+
+    def fill_details(self, record):
         for entry in self.time_entries.values(): entry.delete(0, "end")
         self.idea_box.delete("1.0", "end"); self.brain_dump.delete("1.0", "end"); self.small_wins.delete("1.0", "end")
-        self.energy_var.set("Medium"); self.progress_bar.set(0)
-
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f: data = json.load(f)
-                for w, g_data in zip(self.goal_widgets, data.get("goals", [])): w["entry"].insert(0, g_data.get("text", "")); w["chk"].set(g_data.get("done", False))
-                for t, text in data.get("time_blocks", {}).items(): 
-                    if t in self.time_entries: self.time_entries[t].insert(0, text)
-                self.energy_var.set(data.get("energy", "Medium")); self.idea_box.insert("1.0", data.get("ideas", ""))
-                self.brain_dump.insert("1.0", data.get("brain_dump", "")); self.small_wins.insert("1.0", data.get("small_wins", ""))
-                self.routine_list.load_data(data.get("routines", [])); self.evening_list.load_data(data.get("evening", []))
-                self.update_progress()
-            except: pass
-        else:
-            # [기능 추가] 가장 최근 데이터 불러오기 (루틴 지속성)
-            found_recent = False
-            try:
-                # 날짜 형식(YYYY-MM-DD.json)인 파일만 필터링하여 정렬
-                valid_files = []
-                for f in os.listdir(DATA_DIR):
-                    if f.endswith(".json"):
-                        try:
-                            # 파일명에서 날짜 파싱 시도
-                            datetime.strptime(f[:-5], "%Y-%m-%d")
-                            valid_files.append(f)
-                        except ValueError:
-                            pass
-                
-                valid_files.sort() # 날짜순 정렬
-
-                if valid_files:
-                    last_file = valid_files[-1] # 가장 최근 날짜 파일
-                    with open(os.path.join(DATA_DIR, last_file), "r", encoding="utf-8") as f:
-                        prev_data = json.load(f)
-                    
-                    routines = prev_data.get("routines", [])
-                    evening = prev_data.get("evening", [])
-                    
-                    # 체크 상태 초기화 (내용은 유지하되 체크만 해제)
-                    for item in routines: item["done"] = False
-                    for item in evening: item["done"] = False
-
-                    self.routine_list.load_data(routines)
-                    self.evening_list.load_data(evening)
-                    found_recent = True
-            except Exception as e:
-                print(f"Error loading previous data: {e}")
-
-            if not found_recent:
-                # 이전 데이터가 없으면 기본값 로드
-                self.routine_list.load_data([{"text": "물 마시기"}, {"text": "덤벨 들기"}])
-                self.evening_list.load_data([{"text": "플래너 정리하기"}, {"text": "내일 계획 준비"}])
-            
-            self.update_progress()
-        
-        self.on_date_select(datetime.strptime(date_str, "%Y-%m-%d").date())
+        for t, text in record.time_blocks.items(): 
+            if t in self.time_entries: self.time_entries[t].insert(0, text)
+        self.energy_var.set(record.energy); self.idea_box.insert("1.0", record.ideas)
+        self.brain_dump.insert("1.0", record.brain_dump); self.small_wins.insert("1.0", record.small_wins)
+        self.routine_list.load_data(record.routines, notify=False); self.evening_list.load_data(record.evening, notify=False) # 진행률은 호출한 쪽에서 한 번만 갱신
+
+def run(on_ready=None, exit_when_ready=False):
+    """앱을 실행하고 창이 닫히면 백그라운드 작업을 마무리한 뒤 앱을 반환. 이미 실행 중이면 None"""
+    instance_lock = InstanceLock(INSTANCE_LOCK_PATH)
+    if not instance_lock.acquire():
+        tk.Tk().withdraw()
+        messagebox.showwarning("ADHD Planner", "플래너가 이미 실행 중입니다.\n(트레이 아이콘을 확인해 주세요)"); return None
+    app = ADHDPlannerApp()
+    app.exit_when_ready, app.on_ready = exit_when_ready, on_ready
+    app.mainloop()
+    app.watcher.stop()
+    app.io.shutdown() # 종료 직전에 낸 뽀모도로 기록 등
+    app.autosave_writer.close()
+    if profiler.enabled and profiler.events: print(f"profile: {profiler.dump(PROFILE_DIR)}")
+    instance_lock.release()
+    return app
 
 if __name__ == "__main__":
-    app = ADHDPlannerApp()
-    app.mainloop()
\ No newline at end of file
+    # python main.py --startup-time : import / 첫 화면 / 전체 UI 준비까지 걸린 시간(ms)을 JSON으로 출력하고 종료
+    # (리포트/트레이/느린 디스크 점검은 planner_diagnostics.py)
+    if run(exit_when_ready="--startup-time" in sys.argv) is None: sys.exit(1)
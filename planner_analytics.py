@@ -0,0 +1,82 @@
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+# ======================================================
+#  전체 기록 분석 (NumPy). 날짜별 집계를 열(column) 배열로 펼친 뒤 벡터 연산으로 계산
+#  각 지표는 timeline(load_timeline 결과)을 받는 함수라 GUI 없이 쓸 수 있음
+# ======================================================
+
+EPOCH = date(1970, 1, 1)
+WEEKDAY_LABELS = ["월", "화", "수", "목", "금", "토", "일"]
+
+def load_timeline(store, end=None):
+    """첫 기록일 ~ end(기본: 오늘)를 빈 날 없이 펼친 배열 dict.
+    day: 1970-01-01부터 일수, recorded: 기록 여부, goals_done/goals_total, rate: 목표 달성률(0~1, 기록/목표 없는 날 0), energy: 점수(없으면 nan)"""
+    end_day = ((end or date.today()) - EPOCH).days
+    matrix = np.array(store.aggregate_matrix(), dtype=float).reshape(-1, 8)
+    first = int(matrix[0, 0]) if len(matrix) else end_day
+    days = np.arange(min(first, end_day), end_day + 1)
+    idx = matrix[:, 0].astype(int) - days[0]
+    keep = (idx >= 0) & (idx < len(days))
+    idx, matrix = idx[keep], matrix[keep]
+
+    recorded = np.zeros(len(days), dtype=bool); recorded[idx] = True
+    goals_done = np.zeros(len(days)); goals_done[idx] = matrix[:, 1]
+    goals_total = np.zeros(len(days)); goals_total[idx] = matrix[:, 2]
+    energy = np.full(len(days), np.nan); energy[idx] = np.where(matrix[:, 7] > 0, matrix[:, 7], np.nan)
+    rate = np.divide(goals_done, goals_total, out=np.zeros(len(days)), where=goals_total > 0)
+    return {"day": days, "recorded": recorded, "goals_done": goals_done, "goals_total": goals_total, "rate": rate, "energy": energy}
+
+def day_to_str(day): return (EPOCH + timedelta(days=int(day))).strftime("%Y-%m-%d")
+
+def streaks(timeline, min_rate=1.0):
+    """연속 달성 (목표가 있고 달성률 min_rate 이상인 날이 이어진 일수).
+    current: 오늘까지 (오늘 아직 못 채웠으면 어제까지), longest: 가장 긴 기록과 마지막 날짜"""
+    ok = (timeline["goals_total"] > 0) & (timeline["rate"] >= min_rate)
+    edges = np.diff(np.concatenate(([0], ok.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) # ends: 연속 구간 다음 칸
+    lengths = ends - starts
+    if not len(lengths): return {"current": 0, "longest": 0, "longest_end": None}
+    best = int(np.argmax(lengths))
+    current = int(lengths[-1]) if ends[-1] >= len(ok) - 1 else 0
+    return {"current": current, "longest": int(lengths[best]), "longest_end": day_to_str(timeline["day"][ends[best] - 1])}
+
+def rolling_rates(timeline, window):
+    """날짜별 최근 window일 평균 달성률 (0~1). 처음 window일 미만 구간은 있는 날만 평균"""
+    cumsum = np.concatenate(([0.0], np.cumsum(timeline["rate"])))
+    i = np.arange(1, len(timeline["rate"]) + 1)
+    lo = np.maximum(0, i - window)
+    return (cumsum[i] - cumsum[lo]) / (i - lo)
+
+def weekday_rates(timeline):
+    """요일별(월~일) 평균 달성률 (목표가 있는 날만, 없으면 nan)"""
+    mask = timeline["goals_total"] > 0
+    weekday = (timeline["day"][mask] + EPOCH.weekday()) % 7
+    sums = np.bincount(weekday, weights=timeline["rate"][mask], minlength=7)
+    counts = np.bincount(weekday, minlength=7)
+    return np.divide(sums, counts, out=np.full(7, np.nan), where=counts > 0)
+
+def energy_correlation(timeline):
+    """에너지 점수와 달성률의 상관계수(r, 계산할 수 없으면 None)와 에너지별(1~3) 평균 달성률"""
+    mask = ~np.isnan(timeline["energy"]) & (timeline["goals_total"] > 0)
+    energy, rate = timeline["energy"][mask], timeline["rate"][mask]
+    r = float(np.corrcoef(energy, rate)[0, 1]) if len(energy) >= 3 and energy.std() > 0 and rate.std() > 0 else None
+    levels = energy.astype(int)
+    sums, counts = np.bincount(levels, weights=rate, minlength=4), np.bincount(levels, minlength=4)
+    by_energy = np.divide(sums, counts, out=np.full(4, np.nan), where=counts > 0)[1:]
+    return {"r": r, "days": int(mask.sum()), "by_energy": by_energy}
+
+def analyze(store, end=None):
+    """분석 창/명령줄에서 쓰는 전체 지표 dict (계산 시간 ms 포함)"""
+    t0 = time.perf_counter()
+    timeline = load_timeline(store, end)
+    rolling7, rolling30 = rolling_rates(timeline, 7), rolling_rates(timeline, 30)
+    result = {
+        "start": day_to_str(timeline["day"][0]), "end": day_to_str(timeline["day"][-1]), "recorded_days": int(timeline["recorded"].sum()),
+        "streaks": streaks(timeline), "rolling7": rolling7, "rolling30": rolling30,
+        "weekday": weekday_rates(timeline), "energy": energy_correlation(timeline),
+    }
+    result["elapsed_ms"] = (time.perf_counter() - t0) * 1000
+    return result
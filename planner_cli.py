@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from planner_core import (DATA_DIR, REPORT_SPANS, DayRecord, DayStore, energy_label, import_days, range_stats, search_days,
+                          span_dates)
+from planner_export import FORMATS, export_range
+
+# ======================================================
+#  플래너 명령줄 도구 (GUI 없이 data 폴더를 직접 다룸)
+#    python planner_cli.py stats --range month
+#    python planner_cli.py stats --range 2024-01-01:2024-06-30 --bucket week
+#    python planner_cli.py export --range year -o backup.jsonl
+#    python planner_cli.py export --format md --range 2024-01-01:2024-12-31 -o journal.md
+#    python planner_cli.py import backup.jsonl
+#    python planner_cli.py search 아이디어
+#    python planner_cli.py latest
+#    python planner_cli.py idea --count 3 --half-life 90
+#    python planner_cli.py compact
+#    python planner_cli.py bench-records --range year
+#    python planner_cli.py analytics
+# ======================================================
+
+def parse_range(value):
+    """week/month/quarter/year 또는 YYYY-MM-DD:YYYY-MM-DD -> (시작일, 종료일, 기본 막대 단위)"""
+    if value in REPORT_SPANS: return span_dates(value)
+    try:
+        start, end = (datetime.strptime(part, "%Y-%m-%d").date() for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"기간 형식 오류: {value} ({'/'.join(REPORT_SPANS)} 또는 YYYY-MM-DD:YYYY-MM-DD)")
+    if start > end: raise argparse.ArgumentTypeError(f"시작일이 종료일보다 늦습니다: {value}")
+    bucket = "day" if (end - start).days < 31 else ("week" if (end - start).days < 120 else "month")
+    return start, end, bucket
+
+def cmd_stats(store, args):
+    start, end, bucket = args.range
+    report = range_stats(store, start, end, args.bucket or bucket)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2)); return
+    print(f"{report['start']} ~ {report['end']}  (기록 {report['recorded_days']}일)")
+    print(f"  평균 달성률 {report['avg_rate']:.0f}%  |  완료한 목표 {report['total_done']}/{report['total_goals']}"
+          f"  |  루틴 달성률 {report['routine_rate']:.0f}%  |  평균 에너지 {energy_label(report['avg_energy'])}"
+          f"  |  집중 {report['focus_minutes']:.0f}분")
+    for label, rate, focus in zip(report["labels"], report["rates"], report["focus_by_bucket"]):
+        print(f"  {label:>6} {'█' * int(rate // 5):<20} {rate:.0f}%  🍅 {focus:.0f}분")
+
+def cmd_export(store, args):
+    start, end, _ = args.range if args.range else (None, None, None)
+    bounds = (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")) if start else ()
+    def progress(done, total): # 파일로 쓸 때만 터미널에 진행률 표시
+        if done % 100 == 0 or done == total: print(f"\r{done}/{total}일", end="", file=sys.stderr, flush=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            count = export_range(store, f, args.format, *bounds, progress=progress if sys.stderr.isatty() else None)
+        if sys.stderr.isatty() and count: print(file=sys.stderr)
+    else:
+        count = export_range(store, sys.stdout, args.format, *bounds)
+    print(f"{count}일 내보냄", file=sys.stderr)
+
+def cmd_import(store, args):
+    with open(args.file, "r", encoding="utf-8") as f: count = import_days(store, f)
+    print(f"{count}일 가져옴")
+
+def cmd_search(store, args):
+    results = search_days(store, args.query, limit=args.limit)
+    if not results: print("검색 결과 없음"); return
+    for date_str, field, text in results: print(f"{date_str}  [{field}]  {text}")
+
+def cmd_latest(store, args):
+    date_str, data = store.latest()
+    if date_str is None: print("저장된 기록 없음"); return
+    print(f"{date_str}  {DayRecord.from_index(data).summary()}")
+
+def cmd_idea(store, args):
+    shown = set()
+    for _ in range(args.count):
+        picked = store.random_idea(half_life_days=args.half_life, exclude=shown)
+        if picked is None: print("저장된 아이디어 없음"); return
+        shown.add(picked[0])
+        print(f"{picked[0]}  {picked[1]}")
+
+def cmd_compact(store, args):
+    result = store.compact(args.before)
+    if not result: print("묶을 파일 없음"); return
+    for month, count in result: print(f"{month}  {count}개 파일 -> {store.archive_path(month)}")
+
+def measure(load):
+    """load()가 만든 결과를 들고 있는 동안의 메모리(KB)와 걸린 시간(ms). 시간은 tracemalloc 없이 따로 잼"""
+    t0 = time.perf_counter()
+    count = len(load())
+    elapsed = (time.perf_counter() - t0) * 1000
+    tracemalloc.start()
+    result = load()
+    retained = tracemalloc.get_traced_memory()[0] // 1024
+    tracemalloc.stop()
+    del result
+    return count, retained, elapsed
+
+def cmd_bench_records(store, args):
+    start, end, _ = args.range
+    bounds = (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+    # 세 방식 모두 같은 곳(인덱스, 월별 묶음에 있는 날짜 포함)에서 읽으므로 차이는 보관 형식과 변환 비용만 반영
+    loaders = (("dict", lambda data: data),
+               ("DayRecord.from_index", DayRecord.from_index), # 인덱스 데이터는 이미 검사됨 (앱/내보내기/검색이 쓰는 경로)
+               ("DayRecord.from_dict", DayRecord.from_dict))   # 파일을 처음 읽을 때처럼 버전 변환 + 검사까지
+    results = []
+    for name, convert in loaders:
+        count, kb, ms = measure(lambda: {date_str: convert(data) for date_str, data in store.iter_range(*bounds)})
+        results.append((name, count, kb, ms))
+    _, _, base_kb, base_ms = results[0]
+    for name, count, kb, ms in results:
+        print(f"{name:<22} {count:>5}일  {kb:>7} KB ({kb / max(base_kb, 1):>4.0%})  {ms:>8.1f} ms ({ms / max(base_ms, 1e-9):>4.0%})")
+
+def cmd_analytics(store, args):
+    try: import planner_analytics
+    except ImportError: print("numpy가 필요합니다 (pip install numpy)", file=sys.stderr); sys.exit(1)
+    result = planner_analytics.analyze(store)
+    if args.json:
+        clean = lambda v: None if v != v else v # nan -> null
+        print(json.dumps({**result, "rolling7": result["rolling7"][-1], "rolling30": result["rolling30"][-1],
+                          "weekday": [clean(float(v)) for v in result["weekday"]],
+                          "energy": {**result["energy"], "by_energy": [clean(float(v)) for v in result["energy"]["by_energy"]]}}, ensure_ascii=False, indent=2))
+        return
+    pct = lambda v: "-" if v != v else f"{v * 100:.0f}%"
+    streaks = result["streaks"]
+    print(f"{result['start']} ~ {result['end']}  (기록 {result['recorded_days']}일, 계산 {result['elapsed_ms']:.1f} ms)")
+    print(f"  연속 달성: 현재 {streaks['current']}일 / 최장 {streaks['longest']}일 ({streaks['longest_end'] or '-'})")
+    print(f"  최근 7일 {pct(result['rolling7'][-1])}  |  최근 30일 {pct(result['rolling30'][-1])}")
+    print("  요일별: " + "  ".join(f"{label} {pct(rate)}" for label, rate in zip(planner_analytics.WEEKDAY_LABELS, result["weekday"])))
+    energy = result["energy"]
+    r = "-" if energy["r"] is None else f"{energy['r']:.2f}"
+    print(f"  에너지-달성률 상관계수: {r} ({energy['days']}일)  |  "
+          + "  ".join(f"{label} {pct(rate)}" for label, rate in zip(("LOW", "MEDIUM", "HIGH"), energy["by_energy"])))
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="ADHD Daily Dashboard 데이터 명령줄 도구")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="기록 폴더 (기본: data)")
+    parser.add_argument("--timing", action="store_true", help="걸린 시간(ms)을 stderr로 출력")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("stats", help="기간 통계")
+    p.add_argument("--range", type=parse_range, default="week", help="week/month/quarter/year 또는 YYYY-MM-DD:YYYY-MM-DD")
+    p.add_argument("--bucket", choices=["day", "week", "month"], help="막대 단위 (기본: 기간에 따라 자동)")
+    p.add_argument("--json", action="store_true", help="JSON으로 출력")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("export", help="JSON Lines / CSV / Markdown / iCalendar로 내보내기")
+    p.add_argument("--range", type=parse_range, help="내보낼 기간 (기본: 전체)")
+    p.add_argument("--format", choices=list(FORMATS), default="jsonl",
+                   help="jsonl: import로 되가져오기, csv: 목표/체크리스트 항목별 한 줄, md: 날짜별 일지, ics: Time Blocks 일정")
+    p.add_argument("-o", "--output", help="출력 파일 (기본: 표준 출력)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="export 형식의 JSON Lines 가져오기")
+    p.add_argument("file")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("search", help="아이디어/브레인 덤프/스몰 윈/목표/타임 블록 검색")
+    p.add_argument("query")
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("latest", help="가장 최근에 저장된 날짜")
+    p.set_defaults(func=cmd_latest)
+
+    p = sub.add_parser("idea", help="저장된 아이디어 무작위로 뽑기")
+    p.add_argument("--count", type=int, default=1, help="뽑을 개수 (서로 다른 날짜)")
+    p.add_argument("--half-life", type=float, help="최근 아이디어 우선: 이 일수만큼 지난 아이디어는 절반 확률")
+    p.set_defaults(func=cmd_idea)
+
+    p = sub.add_parser("compact", help="지난 달 기록 파일을 월별 압축 묶음으로 합치기")
+    p.add_argument("--before", help="이 달(YYYY-MM) 이전만 묶음 (기본: 이번 달)")
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser("bench-records", help="기록을 메모리에 올릴 때 dict와 DayRecord의 메모리/시간 비교")
+    p.add_argument("--range", type=parse_range, default="year", help="week/month/quarter/year 또는 YYYY-MM-DD:YYYY-MM-DD")
+    p.set_defaults(func=cmd_bench_records)
+
+    p = sub.add_parser("analytics", help="전체 기록 분석 (연속 달성, 이동 평균, 요일별, 에너지 상관관계) - numpy 필요")
+    p.add_argument("--json", action="store_true", help="JSON으로 출력")
+    p.set_defaults(func=cmd_analytics)
+    return parser
+
+def main(argv=None):
+    if hasattr(sys.stdout, "reconfigure"): sys.stdout.reconfigure(encoding="utf-8")
+    args = build_parser().parse_args(argv)
+    t0 = time.perf_counter()
+    args.func(DayStore(args.data_dir), args)
+    if args.timing: print(f"{(time.perf_counter() - t0) * 1000:.1f} ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
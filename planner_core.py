@@ -0,0 +1,995 @@
+import calendar
+import hashlib
+import json
+import math
+import mmap
+import os
+import queue
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+import zlib
+from datetime import datetime, timedelta
+
+from planner_profiler import timed
+
+DATA_DIR = "data"
+# PLANNER_IO_DELAY_MS=200 처럼 실행하면 파일/인덱스를 읽고 쓸 때마다 (잠금을 잡은 채로) 인공 지연을 넣음 (느린 디스크 흉내)
+IO_DELAY_MS = float(os.environ.get("PLANNER_IO_DELAY_MS", "0"))
+
+# ======================================================
+#  0. 하루 기록 모델
+# ======================================================
+
+DAY_FILE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}\.json$")
+
+# 하루 기록 필드 (자동 저장 시 바뀐 필드만 다시 읽음)
+DAY_FIELDS = ("goals", "time_blocks", "energy", "ideas", "brain_dump", "small_wins", "routines", "evening")
+
+# 새 날짜에 이어받는 체크리스트 (가장 최근 날짜 기준으로 버전 관리)
+TEMPLATE_FIELDS = ("routines", "evening")
+
+# 에너지 문자열 → 점수 (High=3, Medium=2, Low=1)
+ENERGY_SCORES = {"HIGH 🔥": 3, "MEDIUM ⚡": 2, "LOW 💤": 1}
+
+# 하루 기록 형식 버전 (파일에 "version"이 없으면 1)
+RECORD_VERSION = 2
+
+class RecordError(ValueError):
+    """기록 형식 오류. 메시지에 문제가 된 필드 경로를 담음 (예: goals[1].text)"""
+
+class ConflictError(Exception):
+    """저장하려는 날짜 파일이 마지막으로 읽은 뒤 다른 곳(다른 창, 동기화 프로그램)에서 바뀌었음. 파일은 건드리지 않음"""
+    def __init__(self, date_str):
+        super().__init__(f"{date_str}: 다른 곳에서 바뀐 기록")
+        self.date_str = date_str
+
+def _migrate_v1(data):
+    """v1 -> v2: 예전 기본 에너지 값 "Medium"을 "MEDIUM ⚡"로"""
+    return dict(data, energy="MEDIUM ⚡", version=2) if data.get("energy") == "Medium" else dict(data, version=2)
+
+# 버전 -> 다음 버전으로 올리는 함수
+RECORD_MIGRATIONS = {1: _migrate_v1}
+
+def migrate_record(data):
+    version = data.get("version", 1)
+    if not isinstance(version, int) or version > RECORD_VERSION: raise RecordError(f"version: 지원하지 않는 기록 버전 {version!r}")
+    while version < RECORD_VERSION:
+        data = RECORD_MIGRATIONS[version](data); version += 1
+    return data
+
+class CheckItem:
+    """목표/루틴/이브닝 체크리스트 항목"""
+    __slots__ = ("text", "done")
+
+    def __init__(self, text="", done=False): self.text, self.done = text, done
+
+    def to_dict(self): return {"text": self.text, "done": self.done}
+
+def _text(value, path):
+    if not isinstance(value, str): raise RecordError(f"{path}: 문자열이어야 합니다 ({type(value).__name__})")
+    return value
+
+def _items(value, path):
+    if not isinstance(value, list): raise RecordError(f"{path}: 목록이어야 합니다 ({type(value).__name__})")
+    items = []
+    for i, item in enumerate(value):
+        if not isinstance(item, dict): raise RecordError(f"{path}[{i}]: 객체여야 합니다 ({type(item).__name__})")
+        done = item.get("done", False)
+        if done not in (True, False): raise RecordError(f"{path}[{i}].done: true/false 여야 합니다 ({done!r})") # 체크박스 값 0/1도 허용
+        items.append(CheckItem(_text(item.get("text", ""), f"{path}[{i}].text"), bool(done)))
+    return items
+
+def _time_blocks(value, path):
+    if not isinstance(value, dict): raise RecordError(f"{path}: 객체여야 합니다 ({type(value).__name__})")
+    for slot, text in value.items(): _text(text, f"{path}.{slot}")
+    return value
+
+def _energy(value, path):
+    if value != "" and value not in ENERGY_SCORES: raise RecordError(f"{path}: 알 수 없는 값 {value!r} ({'/'.join(ENERGY_SCORES)})")
+    return value
+
+# 필드 -> 검사/변환 함수
+FIELD_PARSERS = {"goals": _items, "time_blocks": _time_blocks, "energy": _energy, "ideas": _text, "brain_dump": _text,
+                 "small_wins": _text, "routines": _items, "evening": _items}
+
+class DayRecord:
+    """하루 기록. dict(JSON)와 서로 변환하고, 빠진 필드는 기본값으로 채움.
+    from_dict는 예전 버전 기록을 올린 뒤 필드를 한 번씩만 훑으며 검사하고, 잘못된 값이 나오면 바로 RecordError"""
+    __slots__ = DAY_FIELDS
+
+    def __init__(self, goals=None, time_blocks=None, energy="MEDIUM ⚡", ideas="", brain_dump="", small_wins="", routines=None, evening=None):
+        self.goals = goals if goals is not None else []
+        self.time_blocks = time_blocks if time_blocks is not None else {}
+        self.energy = energy
+        self.ideas = ideas
+        self.brain_dump = brain_dump
+        self.small_wins = small_wins
+        self.routines = routines if routines is not None else []
+        self.evening = evening if evening is not None else []
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict): raise RecordError(f"기록은 객체여야 합니다 ({type(data).__name__})")
+        data = migrate_record(data)
+        return cls(**{field: FIELD_PARSERS[field](data[field], field) for field in DAY_FIELDS if field in data})
+
+    @classmethod
+    def from_index(cls, data):
+        """인덱스(days.data)에서 읽은 데이터용: 인덱스에는 검사를 통과해 최신 버전으로 저장한 기록만 있으므로 검사/변환 없이 만듦"""
+        record = cls.__new__(cls)
+        record.goals = [CheckItem(i["text"], i["done"]) for i in data["goals"]]
+        record.time_blocks, record.energy, record.ideas = data["time_blocks"], data["energy"], data["ideas"]
+        record.brain_dump, record.small_wins = data["brain_dump"], data["small_wins"]
+        record.routines = [CheckItem(i["text"], i["done"]) for i in data["routines"]]
+        record.evening = [CheckItem(i["text"], i["done"]) for i in data["evening"]]
+        return record
+
+    def to_dict(self):
+        data = {"version": RECORD_VERSION}
+        for field in DAY_FIELDS:
+            value = getattr(self, field)
+            data[field] = [item.to_dict() for item in value] if isinstance(value, list) else value
+        return data
+
+    def goal_counts(self): return sum(1 for g in self.goals if g.done), len(self.goals)
+
+    def metrics(self):
+        """집계 지표: (목표 완료, 목표 수, 루틴 완료, 루틴 수, 이브닝 완료, 이브닝 수, 에너지 점수)"""
+        def count(items): return sum(1 for i in items if i.done), len(items)
+        return (*count(self.goals), *count(self.routines), *count(self.evening), ENERGY_SCORES.get(self.energy))
+
+    def summary(self):
+        done, total = self.goal_counts()
+        return f"Goals: {done}/{total}  |  Energy: {self.energy}"
+
+    def texts(self):
+        """검색 대상 텍스트: (필드, 텍스트)"""
+        for field in ("ideas", "brain_dump", "small_wins"): yield field, getattr(self, field)
+        for g in self.goals: yield "goals", g.text
+        for text in self.time_blocks.values(): yield "time_blocks", text
+
+# ======================================================
+#  0-1. 검색용 토큰화
+# ======================================================
+
+TOKEN_RE = re.compile(r"[0-9a-z]+|[가-힣]+")
+# 필드별 검색 가중치 (아이디어/목표에서 찾은 결과를 위로)
+FIELD_WEIGHTS = {"ideas": 2.0, "goals": 1.5, "small_wins": 1.2, "brain_dump": 1.0, "time_blocks": 1.0}
+
+def is_hangul(token): return "가" <= token[0] <= "힣"
+
+def tokenize(text):
+    """영문/숫자는 단어 단위, 한글은 2글자씩(bigram) 쪼갬 - 조사가 붙은 어절("아이디어를")에서도 "아이디어"를 찾을 수 있게"""
+    for token in TOKEN_RE.findall(text.lower()):
+        if is_hangul(token) and len(token) > 2:
+            for i in range(len(token) - 1): yield token[i:i + 2]
+        else:
+            yield token
+
+# ======================================================
+#  1. 저장소 (월별 묶음 + SQLite 인덱스)
+# ======================================================
+
+class MonthArchive:
+    """지난 달 기록을 하나로 묶은 파일 (data/archive/YYYY-MM.pack).
+    구조: [날짜별 zlib 압축 JSON 레코드...][색인 JSON {날짜: [오프셋, 길이]}][색인 위치 8바이트]
+    하루를 읽을 때는 mmap으로 해당 구간만 잘라 압축 해제"""
+    FOOTER = struct.Struct("<Q")
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm) - self.FOOTER.size
+            (index_at,) = self.FOOTER.unpack_from(mm, end)
+            self.index = json.loads(mm[index_at:end])
+
+    def dates(self): return list(self.index)
+
+    def read_many(self, dates):
+        """{날짜: 데이터} (파일은 한 번만 매핑)"""
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {d: json.loads(zlib.decompress(mm[offset:offset + length])) for d in dates for offset, length in (self.index[d],)}
+
+    def read(self, date_str): return self.read_many([date_str])[date_str]
+
+    @classmethod
+    def write(cls, path, items):
+        """(날짜, 데이터) 목록으로 묶음 파일을 새로 씀 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path, index = path + ".tmp", {}
+        with open(tmp_path, "wb") as f:
+            for date_str, data in items:
+                blob = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+                index[date_str] = [f.tell(), len(blob)]
+                f.write(blob)
+            index_at = f.tell()
+            f.write(json.dumps(index).encode("utf-8") + cls.FOOTER.pack(index_at))
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+class DayStore:
+    """data/YYYY-MM-DD.json 기록의 SQLite 인덱스. 조회는 인덱스에서, 저장은 JSON 파일과 인덱스를 함께 갱신"""
+    INDEX_NAME = "index.sqlite3"
+    ARCHIVE_DIR = "archive"
+    FOCUS_LOG_NAME = "pomodoro_log.jsonl"
+    SCHEMA_VERSION = 8
+    CACHE_SIZE = 128 # 파싱해 둔 날짜 수 (달력 몇 달치)
+    MISSING = object() # 캐시에 "기록 없음"을 표시하는 값
+    NO_FILE = "no-file" # bases: 편집을 시작할 때 파일이 없었음 (저장 전에 다른 곳에서 생기면 충돌)
+
+    def __init__(self, data_dir=DATA_DIR, open_now=True):
+        """open_now=False: 인덱스 열기/동기화는 나중에 open()으로 (앱은 작업 스레드에서 불러 Tk 스레드가 기다리지 않게)"""
+        self.data_dir = data_dir
+        os.makedirs(data_dir, exist_ok=True)
+        self._lock = threading.RLock()    # 인덱스/파일 작업용 (작업 스레드끼리만 다툼)
+        self.cache_lock = threading.Lock() # 캐시 전용: Tk 스레드의 stage()가 저장(fsync)이나 sync를 기다리지 않게
+        self.cache = OrderedDict() # 날짜 -> 파싱한 데이터 (LRU, 저장/삭제 시 무효화)
+        self.bases = {}            # 날짜 -> 이 프로세스가 편집하려고 읽었거나 마지막으로 쓴 파일 내용 해시 (충돌 확인 기준, 파일이 없었으면 NO_FILE)
+        self.invalid = {}          # 날짜 -> 검사를 통과하지 못한 파일의 오류 메시지 (인덱스에 넣지 않고, 새 날짜로 취급하지 않음)
+        # 날짜 -> 이 프로세스가 마지막으로 읽거나 쓴 (mtime, 내용 해시). 인덱스는 CLI 등 다른 프로세스와 같이 쓰므로
+        # 인덱스의 mtime만 보면 다른 프로세스가 바꾼 날짜를 놓침 (캐시/달력/열린 화면이 옛 내용으로 남음)
+        self.known = {}
+        self.io_delay = IO_DELAY_MS / 1000
+        self.latest_date = None # 가장 최근에 저장된 날짜 (meta 테이블과 함께 갱신)
+        self._conn = None
+        self.opened = threading.Event() # open()이 끝남 (실패해도). 그 전에 인덱스를 쓰려는 다른 스레드는 여기서 기다림
+        self.opener = None              # open()을 돌리는 스레드 (이 스레드는 기다리지 않음)
+        self.open_error = None
+        if open_now: self.open()
+
+    def open(self):
+        """인덱스를 열고 스키마 변환 후 폴더와 동기화 (기록이 많으면 오래 걸림)"""
+        self.opener = threading.get_ident()
+        try:
+            self._conn = sqlite3.connect(os.path.join(self.data_dir, self.INDEX_NAME), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self.migrate_schema()
+            self.sync()
+        except Exception as e: self.open_error = e; raise
+        finally: self.opened.set()
+
+    def wait_open(self):
+        """open()이 끝나기 전이면 끝날 때까지 기다리고, 열지 못했으면 그 오류를 다시 냄"""
+        if not self.opened.is_set() and self.opener != threading.get_ident(): self.opened.wait()
+        if self.open_error is not None: raise self.open_error
+
+    # 잠금을 잡기 전에 기다려야 함 (잠금을 쥔 채 기다리면 open()의 sync가 잠금을 못 얻음)
+    @property
+    def lock(self): self.wait_open(); return self._lock
+
+    @property
+    def conn(self): self.wait_open(); return self._conn
+
+    def load_latest(self):
+        """최근 날짜 포인터를 meta에서 다시 읽음 (다른 프로세스가 옮겼을 수 있음)"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'latest_date'").fetchone()
+        self.latest_date = row[0] if row else None
+
+    def migrate_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION: return
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS days (date TEXT PRIMARY KEY, mtime REAL NOT NULL, ideas TEXT NOT NULL DEFAULT '', data TEXT NOT NULL)")
+            # v2: 날짜별 집계 캐시 (리포트는 이 테이블만 읽음)
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS aggregates (date TEXT PRIMARY KEY,
+                goals_done INTEGER, goals_total INTEGER, routine_done INTEGER, routine_total INTEGER,
+                evening_done INTEGER, evening_total INTEGER, energy REAL)""")
+            # v3: 검색용 역색인 (토큰 -> 날짜/필드/등장 횟수)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS postings (term TEXT, date TEXT, field TEXT, tf INTEGER, PRIMARY KEY (term, date, field)) WITHOUT ROWID")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS postings_date ON postings (date)")
+            for date_str, raw in self.conn.execute("SELECT date, data FROM days").fetchall():
+                record = DayRecord.from_dict(json.loads(raw))
+                if version < 2: self._upsert_aggregate(date_str, record)
+                if version < 3: self._upsert_postings(date_str, record)
+            # v4: 날짜별 집중 시간 합계 (뽀모도로 기록 파일에서 한 번만 다시 계산)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS focus (date TEXT PRIMARY KEY, minutes REAL NOT NULL, sessions INTEGER NOT NULL)")
+            if version < 4:
+                for session in self.focus_log(): self._add_focus(session)
+            # v5: 아이디어가 있는 날짜 목록 (slot은 1..N으로 빈틈없이 유지 -> 번호 하나를 뽑아 바로 조회)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS idea_pool (slot INTEGER PRIMARY KEY, date TEXT NOT NULL UNIQUE)")
+            if version < 5:
+                self.conn.execute("INSERT OR IGNORE INTO idea_pool (date) SELECT date FROM days WHERE ideas != '' ORDER BY date")
+            # v6: 최근 저장 날짜 포인터, 루틴/이브닝 템플릿 (바뀔 때마다 새 버전)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS templates (name TEXT, version INTEGER, items TEXT NOT NULL, since TEXT, PRIMARY KEY (name, version))")
+            if version < 6:
+                row = self.conn.execute("SELECT date, data FROM days ORDER BY date DESC LIMIT 1").fetchone()
+                if row: self._set_latest(row[0], DayRecord.from_dict(json.loads(row[1])))
+            # v7: JSON 파일 내용 해시 (밖에서 바뀐 파일 감지, 저장 충돌 확인). 기존 행은 다음 sync/저장 때 채워짐
+            if version < 7: self.conn.execute("ALTER TABLE days ADD COLUMN hash TEXT")
+            # v8: days.data를 모두 최신 버전 형식(to_dict)으로 맞춤 -> DayRecord.from_index가 검사 없이 읽을 수 있게
+            if version < 8:
+                self.conn.executemany("UPDATE days SET data = ? WHERE date = ?",
+                                      [(json.dumps(DayRecord.from_dict(json.loads(raw)).to_dict(), ensure_ascii=False), date_str)
+                                       for date_str, raw in self.conn.execute("SELECT date, data FROM days").fetchall()])
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def path_for(self, date_str): return os.path.join(self.data_dir, f"{date_str}.json")
+
+    def archive_path(self, month): return os.path.join(self.data_dir, self.ARCHIVE_DIR, f"{month}.pack")
+
+    def archives(self):
+        archive_dir = os.path.join(self.data_dir, self.ARCHIVE_DIR)
+        if not os.path.isdir(archive_dir): return []
+        return [MonthArchive(entry.path) for entry in os.scandir(archive_dir) if entry.name.endswith(".pack")]
+
+    def sync(self):
+        """새로 생기거나 바뀐 JSON 파일/월별 묶음만 다시 읽어 인덱스에 반영 (첫 실행 시 기존 파일 전체 마이그레이션).
+        같은 날짜가 양쪽에 있으면 JSON 파일(묶은 뒤에 수정한 것)이 우선.
+        이 프로세스가 알던 내용과 달라진 날짜(다른 프로세스가 인덱스까지 바꾼 것 포함)의 집합 반환"""
+        with self.lock:
+            self.load_latest() # 템플릿/최근 날짜 갱신이 다른 프로세스가 옮긴 포인터를 기준으로 하게
+            indexed = dict(self.conn.execute("SELECT date, mtime FROM days"))
+            seen, rows, invalid = set(), [], {} # 잘못된 파일은 인덱스에 없으므로 sync마다 다시 읽혀 목록이 새로 만들어짐
+            entries = [entry for entry in os.scandir(self.data_dir) if DAY_FILE_RE.match(entry.name)]
+            live = {entry.name[:-5] for entry in entries}
+            for archive in self.archives():
+                stale = [d for d in archive.dates() if d not in live and indexed.get(d) != archive.mtime]
+                seen.update(d for d in archive.dates() if d not in live)
+                for d, data in archive.read_many(stale).items():
+                    try: rows.append((d, archive.mtime, DayRecord.from_dict(data), None))
+                    except RecordError as e: print(f"Index Error ({archive.path} {d}): {e}"); invalid[d] = f"{archive.path} ({d}): {e}"
+            for entry in entries:
+                date_str = entry.name[:-5]
+                seen.add(date_str)
+                mtime = entry.stat().st_mtime
+                if indexed.get(date_str) == mtime: continue
+                try: record, digest = self._read_file(entry.path)
+                except ValueError as e: # RecordError, JSON 오류: 인덱스에 넣지 않고 잘못된 날짜로 기록 (파일은 그대로 둠)
+                    print(f"Index Error ({entry.name}): {e}"); invalid[date_str] = f"{entry.name}: {e}"; continue
+                except OSError as e:
+                    print(f"Index Error ({entry.name}): {e}"); continue
+                rows.append((date_str, mtime, record, digest))
+            self.invalid = invalid
+            for date_str in invalid: self.invalidate(date_str)
+            rows.sort(key=lambda r: r[0]) # 날짜순으로 반영해야 템플릿 버전이 시간 순서대로 쌓임
+            with self.conn:
+                for row in rows: self._upsert(*row)
+                for date_str in indexed:
+                    if date_str not in seen: self._delete(date_str)
+            changed = {row[0] for row in rows} | (indexed.keys() - seen)
+            for date_str, mtime, digest in self.conn.execute("SELECT date, mtime, hash FROM days"):
+                if self.known.get(date_str) != (mtime, digest):
+                    self.known[date_str] = (mtime, digest); self.invalidate(date_str); changed.add(date_str)
+            return changed
+
+    def day_metrics(self, date_str):
+        """인덱스에 있는 날짜의 집계, 없으면 None"""
+        row = self.conn.execute("SELECT * FROM aggregates WHERE date = ?", (date_str,)).fetchone()
+        return row[1:] if row else None
+
+    def refresh(self, dates):
+        """밖에서 바뀐 날짜 파일만 다시 읽어 인덱스와 캐시에 반영 (폴더 감시용). 이 프로세스가 쓴 파일은 mtime이 같아 건너뛰고,
+        다른 프로세스(CLI 등)가 인덱스까지 고친 파일도 이 프로세스가 알던 것과 비교하므로 바뀐 것으로 잡힘.
+        {실제로 바뀐 날짜: 집계(metrics) 또는 기록이 없어졌으면 None} 반환"""
+        changed = {}
+        with self.lock:
+            self.load_latest()
+            for date_str in dates:
+                path = self.path_for(date_str)
+                known = self.known.get(date_str)
+                try:
+                    mtime = os.path.getmtime(path)
+                    if known and known[0] == mtime: continue
+                    record, digest = self._read_file(path)
+                except FileNotFoundError: # 지워짐: 월별 묶음에 남아 있을 수 있으므로 전체를 다시 맞춤 (드묾)
+                    if known is None and self.invalid.pop(date_str, None) is None: continue
+                    for d in self.sync() | {date_str}: changed[d] = self.day_metrics(d)
+                    continue
+                except ValueError as e: # 잘못된 내용 (동기화 프로그램이 쓰는 도중이면 다음 이벤트에서 다시 읽혀 풀림)
+                    print(f"Index Error ({date_str}): {e}")
+                    self.invalid[date_str] = f"{date_str}.json: {e}"; self.invalidate(date_str)
+                    changed[date_str] = self.day_metrics(date_str) # 열려 있는 날짜면 다시 열어 읽기 전용으로 바뀌게
+                    continue
+                except OSError as e:
+                    print(f"Index Error ({date_str}): {e}"); continue
+                row = self.conn.execute("SELECT hash FROM days WHERE date = ?", (date_str,)).fetchone()
+                with self.conn:
+                    if known and known[1] == digest and row and row[0] == digest: # 내용은 그대로 (touch 등)
+                        self.conn.execute("UPDATE days SET mtime = ? WHERE date = ?", (mtime, date_str))
+                        self.known[date_str] = (mtime, digest); continue
+                    self._upsert(date_str, mtime, record, digest)
+                changed[date_str] = record.metrics()
+        return changed
+
+    def revert(self, date_str):
+        """저장하지 못한(충돌) 내용을 캐시에서 버리고 디스크의 파일 기준으로 다시 맞춤"""
+        with self.lock:
+            self.invalidate(date_str)
+            return self.refresh([date_str])
+
+    def invalidate(self, date_str):
+        with self.cache_lock: self.cache.pop(date_str, None)
+
+    def remember(self, date_str, data, replace=True):
+        """캐시에 넣고 캐시에 남은 값을 반환. replace=False면 이미 있는 값(읽는 사이에 stage된 더 새 데이터)을 유지"""
+        with self.cache_lock:
+            if replace or date_str not in self.cache: self.cache[date_str] = data
+            self.cache.move_to_end(date_str)
+            if len(self.cache) > self.CACHE_SIZE: self.cache.popitem(last=False)
+            return self.cache[date_str]
+
+    def disk_wait(self):
+        if self.io_delay: time.sleep(self.io_delay)
+
+    def _upsert(self, date_str, mtime, record, digest=None):
+        self.invalidate(date_str)
+        self.invalid.pop(date_str, None)
+        self.known[date_str] = (mtime, digest)
+        self.conn.execute("INSERT OR REPLACE INTO days (date, mtime, ideas, data, hash) VALUES (?, ?, ?, ?, ?)",
+                          (date_str, mtime, record.ideas.strip(), json.dumps(record.to_dict(), ensure_ascii=False), digest))
+        self._upsert_aggregate(date_str, record)
+        self._upsert_postings(date_str, record)
+        self._update_idea_pool(date_str, bool(record.ideas.strip()))
+        if self.latest_date is None or date_str >= self.latest_date: self._set_latest(date_str, record)
+
+    def _set_latest(self, date_str, record):
+        """최근 날짜 포인터를 옮기고, 그 날의 루틴/이브닝 목록이 현재 템플릿과 다르면 새 버전으로 저장.
+        같은 날 안에서 바뀐 것(자동 저장되는 입력 중간 상태)은 새 버전을 만들지 않고 그 날의 버전을 고침"""
+        self.latest_date = date_str
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('latest_date', ?)", (date_str,))
+        for name in TEMPLATE_FIELDS:
+            items = [item.text for item in getattr(record, name)]
+            rows = self.conn.execute("SELECT version, since, items FROM templates WHERE name = ? ORDER BY version DESC LIMIT 2", (name,)).fetchall()
+            if rows and json.loads(rows[0][2]) == items: continue
+            if rows and rows[0][1] == date_str:
+                if len(rows) > 1 and json.loads(rows[1][2]) == items: # 이전 버전으로 되돌림: 그 날 만든 버전은 필요 없음
+                    self.conn.execute("DELETE FROM templates WHERE name = ? AND version = ?", (name, rows[0][0]))
+                else: self.conn.execute("UPDATE templates SET items = ? WHERE name = ? AND version = ?",
+                                        (json.dumps(items, ensure_ascii=False), name, rows[0][0]))
+                continue
+            self.conn.execute("INSERT INTO templates VALUES (?, (SELECT COALESCE(MAX(version), 0) + 1 FROM templates WHERE name = ?), ?, ?)",
+                              (name, name, json.dumps(items, ensure_ascii=False), date_str))
+
+    def template(self, name, version=None):
+        """템플릿 항목(텍스트 목록). version을 생략하면 최신 버전, 템플릿이 없으면 None"""
+        with self.lock:
+            if version is None: row = self.conn.execute("SELECT items FROM templates WHERE name = ? ORDER BY version DESC LIMIT 1", (name,)).fetchone()
+            else: row = self.conn.execute("SELECT items FROM templates WHERE name = ? AND version = ?", (name, version)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def template_versions(self, name):
+        """[(버전, 시작 날짜, 항목)] (오래된 것부터)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT version, since, items FROM templates WHERE name = ? ORDER BY version", (name,)).fetchall()
+        return [(version, since, json.loads(items)) for version, since, items in rows]
+
+    def _update_idea_pool(self, date_str, has_idea):
+        row = self.conn.execute("SELECT slot FROM idea_pool WHERE date = ?", (date_str,)).fetchone()
+        if has_idea and row is None:
+            self.conn.execute("INSERT INTO idea_pool (slot, date) VALUES ((SELECT COALESCE(MAX(slot), 0) + 1 FROM idea_pool), ?)", (date_str,))
+        elif not has_idea and row is not None:
+            # 마지막 slot을 빈 자리로 옮겨 번호를 빈틈없이 유지
+            last_slot = self.conn.execute("SELECT MAX(slot) FROM idea_pool").fetchone()[0]
+            self.conn.execute("DELETE FROM idea_pool WHERE slot = ?", (row[0],))
+            if last_slot != row[0]: self.conn.execute("UPDATE idea_pool SET slot = ? WHERE slot = ?", (row[0], last_slot))
+
+    def _upsert_aggregate(self, date_str, record):
+        self.conn.execute("INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (date_str, *record.metrics()))
+
+    def _upsert_postings(self, date_str, record):
+        """해당 날짜의 색인만 다시 만듦 (증분 갱신)"""
+        counts = {}
+        for field, text in record.texts():
+            for term in tokenize(text): counts[(term, field)] = counts.get((term, field), 0) + 1
+        self.conn.execute("DELETE FROM postings WHERE date = ?", (date_str,))
+        self.conn.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", [(term, date_str, field, tf) for (term, field), tf in counts.items()])
+
+    def _delete(self, date_str):
+        self.invalidate(date_str)
+        self.known.pop(date_str, None)
+        self._update_idea_pool(date_str, False)
+        if date_str == self.latest_date: # 최근 날짜가 지워졌을 때만 다시 찾음 (템플릿은 유지)
+            row = self.conn.execute("SELECT date FROM days WHERE date != ? ORDER BY date DESC LIMIT 1", (date_str,)).fetchone()
+            self.latest_date = row[0] if row else None
+            if row: self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('latest_date', ?)", (row[0],))
+            else: self.conn.execute("DELETE FROM meta WHERE key = 'latest_date'")
+        for table in ("days", "aggregates", "postings"): self.conn.execute(f"DELETE FROM {table} WHERE date = ?", (date_str,))
+
+    def _read_file(self, path):
+        """날짜 JSON 파일 -> (DayRecord, 내용 해시)"""
+        self.disk_wait()
+        with open(path, "rb") as f: raw = f.read()
+        return DayRecord.from_dict(json.loads(raw)), hashlib.sha1(raw).hexdigest()
+
+    def _write_file(self, date_str, data, durable=True):
+        """임시 파일에 쓴 뒤 rename (쓰는 도중 종료돼도 기존 파일이 깨지지 않음). (새 파일의 mtime, 내용 해시) 반환"""
+        path = self.path_for(date_str)
+        tmp_path = path + ".tmp"
+        raw = json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+        self.disk_wait()
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+            if durable: f.flush(); os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return os.path.getmtime(path), hashlib.sha1(raw).hexdigest()
+
+    def file_digest(self, date_str):
+        """지금 디스크에 있는 날짜 파일의 내용 해시 (파일이 없으면 None). mtime이 인덱스와 같으면 파일을 읽지 않음"""
+        path = self.path_for(date_str)
+        with self.lock:
+            try: mtime = os.path.getmtime(path)
+            except FileNotFoundError: return None
+            row = self.conn.execute("SELECT mtime, hash FROM days WHERE date = ?", (date_str,)).fetchone()
+            if row and row[0] == mtime and row[1] is not None: return row[1]
+            self.disk_wait()
+            with open(path, "rb") as f: return hashlib.sha1(f.read()).hexdigest()
+
+    def check(self, date_str):
+        """파일은 있지만 검사를 통과하지 못한 날짜면 RecordError (새 날짜로 열어 덮어쓰지 않게)"""
+        error = self.invalid.get(date_str)
+        if error is not None: raise RecordError(f"저장된 파일을 읽을 수 없음 - {error}")
+
+    def checkout(self, date_str):
+        """편집하려고 여는 날짜: 지금 파일 내용을 충돌 확인 기준으로 기록 (잘못된 파일이면 RecordError)"""
+        with self.lock: # 해시를 읽고 기록하는 사이에 저장 스레드가 끼어들지 않게
+            self.check(date_str)
+            self.bases[date_str] = self.file_digest(date_str) or self.NO_FILE
+
+    @timed("save")
+    def save(self, date_str, data, base=None):
+        """검사를 통과한 기록만 최신 버전 형식으로 저장 (잘못된 값이면 파일을 건드리기 전에 RecordError).
+        base(편집을 시작한 파일의 내용 해시)를 주면 그 뒤 다른 곳에서 파일이 바뀌었을 때 덮어쓰지 않고 ConflictError"""
+        record = DayRecord.from_dict(data)
+        with self.lock:
+            if base is not None: # 그사이 파일이 지워졌으면 충돌이 아님 (다시 만듦), 없던 파일이 생겼으면 충돌
+                current = self.file_digest(date_str)
+                if current is not None and current != base: raise ConflictError(date_str)
+            mtime, digest = self._write_file(date_str, record.to_dict())
+            self.load_latest()
+            with self.conn: self._upsert(date_str, mtime, record, digest)
+            self.bases[date_str] = digest
+
+    def save_many(self, items):
+        """(날짜, 데이터 또는 DayRecord) 여러 개를 한 트랜잭션으로 저장 (가져오기 등 대량 작업용). 저장한 개수 반환"""
+        count = 0
+        with self.lock, self.conn:
+            self.load_latest()
+            for date_str, data in items:
+                record = data if isinstance(data, DayRecord) else DayRecord.from_dict(data)
+                mtime, digest = self._write_file(date_str, record.to_dict(), durable=False)
+                self._upsert(date_str, mtime, record, digest)
+                count += 1
+        return count
+
+    def compact(self, before=None):
+        """before(YYYY-MM, 기본: 이번 달) 이전 달의 JSON 파일을 월별 묶음으로 합치고 원본 파일 삭제.
+        이미 묶음이 있으면 합쳐서 다시 씀. [(달, 묶은 파일 수)] 반환"""
+        before = before or datetime.now().strftime("%Y-%m")
+        with self.lock:
+            self.sync()
+            months = {}
+            for entry in os.scandir(self.data_dir):
+                if DAY_FILE_RE.match(entry.name) and entry.name[:7] < before: months.setdefault(entry.name[:7], []).append(entry.name[:-5])
+            if months: os.makedirs(os.path.join(self.data_dir, self.ARCHIVE_DIR), exist_ok=True)
+            result = []
+            for month, dates in sorted(months.items()):
+                path = self.archive_path(month)
+                merged = {}
+                if os.path.exists(path):
+                    archive = MonthArchive(path)
+                    merged.update(archive.read_many(archive.dates()))
+                for date_str in dates:
+                    with open(self.path_for(date_str), "r", encoding="utf-8") as f: merged[date_str] = json.load(f)
+                MonthArchive.write(path, sorted(merged.items()))
+                # 내용은 그대로이므로 인덱스는 mtime만 묶음 파일 기준으로 바꿈 (다음 sync에서 다시 읽지 않게)
+                mtime = os.path.getmtime(path)
+                with self.conn: self.conn.executemany("UPDATE days SET mtime = ? WHERE date = ?", [(mtime, d) for d in merged])
+                for d in merged:
+                    if d in self.known: self.known[d] = (mtime, self.known[d][1])
+                for date_str in dates: os.remove(self.path_for(date_str))
+                result.append((month, len(dates)))
+            return result
+
+    def get(self, date_str):
+        """날짜의 데이터 (없으면 None). 캐시에 있으면 DB를 읽지 않음 - 돌려받은 dict는 수정하지 말 것"""
+        with self.cache_lock: data = self.cache.get(date_str)
+        if data is None:
+            with self.lock: # 읽은 값을 캐시에 넣을 때까지 잡아 둬야 그사이 저장(_upsert)된 내용을 옛 값으로 덮지 않음
+                self.disk_wait()
+                row = self.conn.execute("SELECT data FROM days WHERE date = ?", (date_str,)).fetchone()
+                data = self.remember(date_str, json.loads(row[0]) if row else self.MISSING, replace=False)
+        else: self.remember(date_str, data)
+        return None if data is self.MISSING else data
+
+    def stage(self, date_str, data):
+        """아직 저장 중인 데이터를 캐시에 먼저 넣어 둠 (백그라운드 저장이 끝나기 전에 다시 열어도 최신 내용)"""
+        self.remember(date_str, data)
+
+    def prefetch(self, dates):
+        """캐시에 없는 날짜들을 한 번에 읽어 캐시에 채움 (백그라운드 스레드용)"""
+        with self.cache_lock: missing = [d for d in dates if d not in self.cache]
+        with self.lock:
+            found = self.get_many(missing)
+            for d in missing: self.remember(d, found.get(d, self.MISSING), replace=False)
+
+    def latest(self):
+        """가장 최근에 저장된 날짜의 (날짜, 데이터). 없으면 (None, None)"""
+        date_str = self.latest_date
+        return (date_str, self.get(date_str)) if date_str else (None, None)
+
+    def iter_range(self, start_str, end_str, page=200):
+        """[start, end] 구간에 저장된 날짜들의 (날짜, 데이터)를 날짜순으로 page개씩 나눠 읽으며 하나씩 내보냄 (기간이 길어도 메모리 사용 일정)"""
+        last = ""
+        while True:
+            with self.lock:
+                rows = self.conn.execute("SELECT date, data FROM days WHERE date BETWEEN ? AND ? AND date > ? ORDER BY date LIMIT ?",
+                                         (start_str, end_str, last, page)).fetchall()
+            if not rows: return
+            for d, raw in rows: yield d, json.loads(raw)
+            last = rows[-1][0]
+
+    def expand_prefix(self, prefix, limit=50):
+        """prefix로 시작하는 색인 토큰 목록 (인덱스 탐색만 사용)"""
+        terms = []
+        with self.lock:
+            while len(terms) < limit:
+                op, start = (">", terms[-1]) if terms else (">=", prefix)
+                term = self.conn.execute(f"SELECT MIN(term) FROM postings WHERE term {op} ? AND term < ?", (start, prefix + "\uffff")).fetchone()[0]
+                if term is None: break
+                terms.append(term)
+        return terms
+
+    def document_frequency(self, term):
+        with self.lock: return self.conn.execute("SELECT COUNT(DISTINCT date) FROM postings WHERE term = ?", (term,)).fetchone()[0]
+
+    def rank(self, weighted_terms, limit):
+        """weighted_terms: [(토큰, idf, 검색어 번호)] -> [(날짜, 점수, 일치한 검색어 수)]. 점수 = tf x idf x 필드 가중치 합"""
+        if not weighted_terms: return []
+        field_case = " ".join(f"WHEN '{field}' THEN {weight}" for field, weight in FIELD_WEIGHTS.items())
+        values = ", ".join("(?, ?, ?)" for _ in weighted_terms)
+        with self.lock:
+            return self.conn.execute(f"""WITH q(term, idf, qid) AS (VALUES {values})
+                SELECT p.date, SUM(p.tf * q.idf * CASE p.field {field_case} ELSE 1.0 END) AS score, COUNT(DISTINCT q.qid) AS matched
+                FROM q JOIN postings p ON p.term = q.term
+                GROUP BY p.date ORDER BY score * matched DESC, p.date DESC LIMIT ?""",
+                [v for t in weighted_terms for v in t] + [limit]).fetchall()
+
+    def best_fields(self, dates, terms):
+        """날짜별로 검색어가 가장 많이 나온 필드: {날짜: 필드}"""
+        if not dates or not terms: return {}
+        with self.lock:
+            rows = self.conn.execute(f"""SELECT date, field, SUM(tf) AS n FROM postings
+                WHERE date IN ({','.join('?' * len(dates))}) AND term IN ({','.join('?' * len(terms))})
+                GROUP BY date, field ORDER BY n""", list(dates) + list(terms)).fetchall()
+        return {d: field for d, field, _ in rows} # n 오름차순이므로 마지막(가장 많은 필드)이 남음
+
+    def count(self):
+        with self.lock: return self.conn.execute("SELECT COUNT(*) FROM days").fetchone()[0]
+
+    def count_range(self, start_str, end_str):
+        with self.lock: return self.conn.execute("SELECT COUNT(*) FROM days WHERE date BETWEEN ? AND ?", (start_str, end_str)).fetchone()[0]
+
+    def get_many(self, dates):
+        """여러 날짜를 한 번에 조회: {날짜: 데이터}"""
+        dates = list(dates)
+        if not dates: return {}
+        with self.lock:
+            self.disk_wait()
+            rows = self.conn.execute(f"SELECT date, data FROM days WHERE date IN ({','.join('?' * len(dates))})", dates).fetchall()
+        return {d: json.loads(raw) for d, raw in rows}
+
+    def aggregates(self, start_str, end_str):
+        """[start, end] 구간의 집계 행 목록: (날짜, 목표 완료, 목표 수, 루틴 완료, 루틴 수, 이브닝 완료, 이브닝 수, 에너지 점수)"""
+        with self.lock:
+            self.disk_wait()
+            return self.conn.execute("SELECT * FROM aggregates WHERE date BETWEEN ? AND ? ORDER BY date", (start_str, end_str)).fetchall()
+
+    def focus_log(self):
+        """뽀모도로 세션 기록 (data/pomodoro_log.jsonl, 한 줄에 세션 하나)"""
+        try:
+            with open(os.path.join(self.data_dir, self.FOCUS_LOG_NAME), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip(): yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def _add_focus(self, session):
+        self.conn.execute("""INSERT INTO focus VALUES (?, ?, 1) ON CONFLICT(date) DO UPDATE
+            SET minutes = minutes + excluded.minutes, sessions = sessions + 1""", (session["start"][:10], session["actual_min"]))
+
+    def record_session(self, session):
+        """세션 한 줄을 기록 파일 끝에 덧붙이고 그 날짜의 집중 시간 합계에 더함"""
+        with self.lock:
+            with open(os.path.join(self.data_dir, self.FOCUS_LOG_NAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps(session, ensure_ascii=False, separators=(",", ":")) + "\n")
+            with self.conn: self._add_focus(session)
+
+    def focus_minutes(self, start_str, end_str):
+        """[start, end] 구간의 날짜별 집중 시간(분): {날짜: 분}"""
+        with self.lock:
+            return dict(self.conn.execute("SELECT date, minutes FROM focus WHERE date BETWEEN ? AND ?", (start_str, end_str)))
+
+    def aggregate_matrix(self, start_str="0000-00-00", end_str="9999-99-99"):
+        """aggregates()를 숫자만으로 (배열 변환용): (1970-01-01부터 일수, 목표 완료, 목표 수, 루틴 완료, 루틴 수, 이브닝 완료, 이브닝 수, 에너지 점수, 없으면 0)"""
+        with self.lock:
+            return self.conn.execute("""SELECT CAST(julianday(date) - 2440587.5 AS INTEGER), goals_done, goals_total, routine_done, routine_total,
+                evening_done, evening_total, IFNULL(energy, 0) FROM aggregates WHERE date BETWEEN ? AND ? ORDER BY date""", (start_str, end_str)).fetchall()
+
+    def random_idea(self, half_life_days=None, exclude=(), rng=random, max_tries=32):
+        """무작위 (날짜, 아이디어), 없으면 None. slot 번호를 뽑아 조회하므로 기록이 많아도 일정한 시간.
+        half_life_days: 최근 아이디어일수록 자주 (그만큼 지난 날짜는 절반 확률, 최소 1/10 - 거절 샘플링)
+        exclude: 뽑지 않을 날짜 (최근에 보여준 것). 풀이 작아 모두 제외되면 무시"""
+        with self.lock:
+            size = self.conn.execute("SELECT MAX(slot) FROM idea_pool").fetchone()[0]
+            if not size: return None
+            if len(exclude) >= size: exclude = ()
+            today = datetime.now().date()
+            date_str = None # 제외 조건을 통과한 마지막 후보 (가중치 때문에 모두 거절돼도 이것을 씀)
+            for _ in range(max_tries):
+                candidate = self.conn.execute("SELECT date FROM idea_pool WHERE slot = ?", (rng.randint(1, size),)).fetchone()[0]
+                if candidate in exclude: continue
+                date_str = candidate
+                if half_life_days:
+                    age = max(0, (today - datetime.strptime(date_str, "%Y-%m-%d").date()).days)
+                    if rng.random() > max(0.1, 0.5 ** (age / half_life_days)): continue
+                break
+            if date_str is None: # 뽑은 것이 모두 제외 대상: 제외되지 않은 것 중에서 고르게 하나 (드묾)
+                exclude = list(exclude)
+                where = f"WHERE date NOT IN ({','.join('?' * len(exclude))})" if exclude else ""
+                count = self.conn.execute(f"SELECT COUNT(*) FROM idea_pool {where}", exclude).fetchone()[0]
+                if not count: where, exclude, count = "", [], size
+                date_str = self.conn.execute(f"SELECT date FROM idea_pool {where} ORDER BY slot LIMIT 1 OFFSET ?",
+                                             (*exclude, rng.randrange(count))).fetchone()[0]
+            return date_str, self.conn.execute("SELECT ideas FROM days WHERE date = ?", (date_str,)).fetchone()[0]
+
+class AutosaveWriter:
+    """백그라운드 저장 스레드. 같은 날짜의 대기 중인 스냅샷은 최신 것 하나로 합쳐서 저장"""
+    def __init__(self, store):
+        self.store = store
+        self.cond = threading.Condition()
+        self.pending = {}               # 날짜 -> (저장할 데이터, 덮어쓰기 여부). 충돌 확인 기준은 저장하는 순간에 읽음
+        self.saved = queue.Queue()      # 저장이 끝난 날짜 (Tk 스레드에서 꺼내 감)
+        self.conflicts = queue.Queue()  # 다른 곳에서 바뀌어 저장하지 못한 (날짜, 데이터)
+        self.errors = queue.Queue()     # 그 밖의 이유(디스크 가득 참, 인덱스 잠김 등)로 저장하지 못한 (날짜, 예외)
+        self.busy = False
+        self.current = None             # 지금 쓰고 있는 날짜
+        self.closed = False
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def submit(self, date_str, data, force=False):
+        """force=True: 다른 곳에서 바뀌었어도 덮어씀 (충돌 후 사용자가 내 내용을 고른 경우)"""
+        self.store.stage(date_str, data)
+        with self.cond:
+            force = force or self.pending.get(date_str, (None, False))[1] # 합쳐지는 이전 요청의 덮어쓰기 선택은 유지
+            self.pending[date_str] = (data, force)
+            self.cond.notify_all()
+
+    def run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending or self.closed)
+                if not self.pending: return
+                date_str, (data, force) = self.pending.popitem()
+                self.busy, self.current = True, date_str
+            try:
+                # 기준 해시는 지금 읽음: 큐에 넣을 때 읽으면 그사이 끝난 우리 저장을 다른 곳의 수정으로 오인함
+                self.store.save(date_str, data, None if force else self.store.bases.get(date_str))
+                self.saved.put(date_str)
+            except ConflictError:
+                self.conflicts.put((date_str, data))
+            except Exception as e: # OSError, RecordError, sqlite3.Error 등: 스레드가 죽으면 이후 저장이 모두 멈추므로 알리고 계속
+                print(f"Autosave Error ({date_str}): {e!r}")
+                self.errors.put((date_str, e))
+            finally:
+                with self.cond:
+                    self.busy, self.current = False, None
+                    self.cond.notify_all()
+
+    def writing(self, date_str):
+        """date_str의 저장이 대기 중이거나 진행 중인지 (그동안 다시 불러오면 충돌 확인 기준이 밖의 내용으로 옮겨져 덮어씀)"""
+        with self.cond: return date_str in self.pending or self.current == date_str
+
+    def flush(self, timeout=None):
+        """대기 중인 저장이 모두 끝날 때까지 기다림"""
+        with self.cond: return self.cond.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def close(self):
+        self.flush(timeout=10)
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+class PomodoroEngine:
+    """뽀모도로 타이머 계산부. 남은 시간을 매번 마감 시각과 단조 시계(monotonic)의 차이로 구하므로
+    콜백이 늦게 불려도(창 숨김, 무거운 작업 중) 시간이 밀리지 않음"""
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.session = None   # 진행 중인 세션: {"start", "planned_min", "goal"}
+        self.deadline = None  # 실행 중일 때 마감 시각 (clock 기준)
+        self.paused_left = 0.0
+
+    @property
+    def running(self): return self.deadline is not None
+
+    def start(self, minutes, goal=""):
+        self.session = {"start": datetime.now().isoformat(timespec="seconds"), "planned_min": minutes, "goal": goal}
+        self.deadline = self.clock() + minutes * 60
+
+    def pause(self):
+        self.paused_left = self.time_left()
+        self.deadline = None
+
+    def resume(self): self.deadline = self.clock() + self.paused_left
+
+    def time_left(self):
+        """남은 시간(초)"""
+        if self.deadline is None: return self.paused_left
+        return max(0.0, self.deadline - self.clock())
+
+    def end(self, status):
+        """세션 종료 (status: completed/abandoned). 기록할 세션 dict 반환, 진행 중인 세션이 없으면 None"""
+        if self.session is None: return None
+        session = dict(self.session, actual_min=round(self.session["planned_min"] - self.time_left() / 60, 2), status=status)
+        self.session, self.deadline, self.paused_left = None, None, 0.0
+        return session
+
+class Prefetcher:
+    """백그라운드에서 store.prefetch 실행. 대기 중인 요청은 가장 최근 것 하나만 남김"""
+    def __init__(self, store):
+        self.store = store
+        self.cond = threading.Condition()
+        self.pending = None
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def request(self, dates):
+        with self.cond:
+            self.pending = list(dates)
+            self.cond.notify()
+
+    def run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending is not None)
+                dates, self.pending = self.pending, None
+            try: self.store.prefetch(dates)
+            except sqlite3.Error as e: print(f"Prefetch Error: {e}")
+
+def neighbour_dates(date_obj, radius=3):
+    """date_obj 앞뒤 radius일과 그 달 전체 날짜 (가까운 날짜부터)"""
+    near = [date_obj + timedelta(days=d) for k in range(radius + 1) for d in ((k, -k) if k else (0,))]
+    month = [date_obj.replace(day=day) for day in range(1, calendar.monthrange(date_obj.year, date_obj.month)[1] + 1)]
+    return [d.strftime("%Y-%m-%d") for d in dict.fromkeys(near + month)]
+
+# ======================================================
+#  2. 날짜 / 통계 / 검색 / 가져오기·내보내기
+# ======================================================
+
+DEFAULT_ROUTINES = ["물 마시기", "덤벨 들기"]
+DEFAULT_EVENING = ["플래너 정리하기", "내일 계획 준비"]
+
+DEFAULT_TEMPLATES = {"routines": DEFAULT_ROUTINES, "evening": DEFAULT_EVENING}
+MAX_GOALS = 3 # 화면의 목표 칸 수
+
+def previous_day(store, date_str):
+    """date_str 바로 전날 기록, 없으면 date_str 이전의 가장 최근 기록 (없으면 None)"""
+    data = store.get((datetime.strptime(date_str, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d"))
+    if data is None and store.latest_date and store.latest_date < date_str: data = store.get(store.latest_date)
+    return data
+
+def new_day_record(store, date_str=None, carry_goals=False):
+    """저장되지 않은 날짜의 새 기록: 루틴/이브닝은 최신 템플릿을 체크 해제한 상태로,
+    carry_goals면 이전 기록에서 끝내지 못한 목표도 이어받음 (모두 인덱스 조회 몇 번으로 끝남)"""
+    lists = {}
+    for name in TEMPLATE_FIELDS:
+        items = store.template(name)
+        lists[name] = [CheckItem(text) for text in (items if items is not None else DEFAULT_TEMPLATES[name])]
+    goals = []
+    if carry_goals and date_str:
+        prev_data = previous_day(store, date_str)
+        prev_goals = DayRecord.from_dict(prev_data).goals if prev_data else []
+        goals = [CheckItem(g.text) for g in prev_goals if not g.done and g.text.strip()][:MAX_GOALS]
+    return DayRecord(goals=goals, **lists)
+
+def load_day(store, date_str, carry_goals=False):
+    """저장된 기록이 있으면 그 기록, 없으면 루틴을 이어받은 새 기록. 파일이 있지만 잘못됐으면 RecordError"""
+    store.check(date_str)
+    data = store.get(date_str)
+    return DayRecord.from_dict(data) if data is not None else new_day_record(store, date_str, carry_goals)
+
+# 기간 이름 -> (일수, 막대 단위)
+REPORT_SPANS = {"week": (7, "day"), "month": (30, "day"), "quarter": (91, "week"), "year": (365, "month")}
+
+def span_dates(span_name, end=None):
+    """기간 이름(week/month/quarter/year)을 end(기본: 오늘)까지의 (시작일, 종료일, 막대 단위)로 변환"""
+    days, bucket = REPORT_SPANS[span_name]
+    end = end or datetime.now().date()
+    return end - timedelta(days=days - 1), end, bucket
+
+def energy_label(score):
+    if score is None: return "-"
+    if score > 2.3: return "HIGH 🔥"
+    if score > 1.6: return "MEDIUM ⚡"
+    return "LOW 💤"
+
+def range_stats(store, start, end, bucket="day"):
+    """[start, end] 기간 통계 (집계 캐시 한 번 조회). 막대는 bucket(day/week/month) 단위 평균 달성률(0~100)"""
+    start_str, end_str = start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+    rows = {row[0]: row[1:] for row in store.aggregates(start_str, end_str)}
+    focus = store.focus_minutes(start_str, end_str)
+    labels, buckets, focus_buckets = [], [], [] # 그래프 X축 라벨, 구간별 일일 달성률, 구간별 집중 시간(분)
+    energies = []
+    total_done = total_goals = routine_done = routine_total = 0
+    span = (end - start).days + 1
+
+    for i in range(span):
+        day = start + timedelta(days=i)
+        if bucket == "day": key = day.strftime("%m/%d")
+        elif bucket == "week": key = (day - timedelta(days=day.weekday())).strftime("%m/%d")
+        else: key = day.strftime("%y.%m")
+        if not labels or labels[-1] != key: labels.append(key); buckets.append([]); focus_buckets.append(0)
+
+        rate = 0
+        day_str = day.strftime("%Y-%m-%d")
+        focus_buckets[-1] += focus.get(day_str, 0)
+        row = rows.get(day_str)
+        if row:
+            goals_done, goals_total, r_done, r_total, e_done, e_total, energy = row
+            if goals_total > 0: rate = (goals_done / goals_total) * 100
+            total_done += goals_done; total_goals += goals_total
+            routine_done += r_done + e_done; routine_total += r_total + e_total
+            if energy is not None: energies.append(energy)
+        buckets[-1].append(rate)
+
+    return {
+        "start": start_str, "end": end_str, "recorded_days": len(rows),
+        "labels": labels, "rates": [sum(b) / len(b) for b in buckets],
+        "avg_rate": sum(sum(b) for b in buckets) / span if span > 0 else 0,
+        "total_done": total_done, "total_goals": total_goals,
+        "routine_rate": (routine_done / routine_total) * 100 if routine_total else 0,
+        "avg_energy": sum(energies) / len(energies) if energies else None,
+        "focus_minutes": sum(focus_buckets), "focus_by_bucket": focus_buckets,
+    }
+
+def snippet(text, pos, length, width=30):
+    start = max(0, pos - width)
+    return ("…" if start > 0 else "") + text[start:pos + length + width].replace("\n", " ") + ("…" if pos + length + width < len(text) else "")
+
+def find_snippet(record, field, query_terms):
+    """field 텍스트 중 검색어가 처음 나오는 부분 발췌"""
+    texts = [text for f, text in record.texts() if f == field and text]
+    for text in texts:
+        lowered = text.lower()
+        for term in query_terms:
+            pos = lowered.find(term)
+            if pos >= 0: return snippet(text, pos, len(term))
+    return snippet(texts[0], 0, 0) if texts else ""
+
+@timed("search")
+def search_days(store, query, limit=20):
+    """역색인으로 검색 (JSON 파일을 다시 읽지 않음). 결과: [(날짜, 필드, 발췌)]
+    점수 = TF-IDF x 필드 가중치, 검색어 중 일부만 일치하면 일치한 비율만큼 낮춤.
+    영문/숫자 3글자 이상과 한글 한 글자는 앞부분 일치도 허용 ("gard" -> garden, "책" -> 책을)"""
+    query_terms = list(dict.fromkeys(tokenize(query)))
+    if not query_terms: return []
+    total_days = max(1, store.count())
+    weighted = []
+    for qid, term in enumerate(query_terms):
+        prefix = len(term) == 1 if is_hangul(term) else len(term) >= 3
+        for token in (store.expand_prefix(term) if prefix else [term]):
+            df = store.document_frequency(token)
+            if df: weighted.append((token, math.log(1 + total_days / df), qid))
+    ranked = store.rank(weighted, limit)
+    dates = [d for d, _, _ in ranked]
+    fields = store.best_fields(dates, [t for t, _, _ in weighted])
+    records = store.get_many(dates)
+    words = TOKEN_RE.findall(query.lower()) + query_terms
+    return [(d, fields.get(d, "ideas"), find_snippet(DayRecord.from_index(records[d]), fields.get(d, "ideas"), words)) for d in dates if d in records]
+
+def import_days(store, fp):
+    """planner_export의 jsonl 형식(한 줄에 {"date": ..., "data": {...}}) 가져오기. 같은 날짜는 덮어씀. 가져온 날짜 수 반환"""
+    def records():
+        for line_no, line in enumerate(fp, 1):
+            if not line.strip(): continue
+            entry = json.loads(line)
+            date_str = entry.get("date", "")
+            if not DAY_FILE_RE.match(f"{date_str}.json") or not isinstance(entry.get("data"), dict):
+                raise ValueError(f"line {line_no}: 올바른 기록이 아닙니다 (date/data 확인)")
+            try: yield date_str, DayRecord.from_dict(entry["data"])
+            except RecordError as e: raise RecordError(f"line {line_no} ({date_str}): {e}") from None
+    return store.save_many(records())
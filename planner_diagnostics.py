@@ -0,0 +1,126 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import main as planner
+from main import TRAY_AVAILABLE, WeeklyReportWindow, lazy_import, report_charts
+
+# ======================================================
+#  앱 점검 도구: 실제 창을 띄워 반복 동작을 돌린 뒤 결과를 JSON으로 출력하고, 기준을 넘으면 종료 코드 1
+#    python planner_diagnostics.py --bench-report 100   리포트 창을 100번 열고 닫은 뒤 메모리 증가량(KB)
+#    python planner_diagnostics.py --check-tray 50      트레이로 숨기기/열기 50번 뒤 스레드/열린 파일/아이콘 수
+#    python planner_diagnostics.py --check-io 30        디스크 작업마다 200ms 지연을 넣고 날짜 30개를 연 뒤 Tk 스레드가 가장 오래 멈춘 시간(ms)
+# ======================================================
+
+REPORT_BENCH_MAX_GROWTH_KB = 8 * 1024 # --bench-report 허용 메모리 증가량
+IO_CHECK_DELAY_MS = 200   # --check-io: 저장소의 파일/인덱스 읽기·쓰기마다 넣는 인공 지연
+IO_CHECK_BEAT_MS = 5      # --check-io: 이벤트 루프 지연 측정 주기
+IO_CHECK_MAX_LAG_MS = 20  # --check-io: Tk 스레드가 이보다 오래 멈추면 실패 (60Hz 한 프레임 16.7ms + 측정 주기 오차)
+
+def current_rss_kb():
+    """현재 프로세스의 메모리 사용량(RSS, KB). psutil이 있으면 사용, 없으면 /proc (리눅스), 둘 다 안 되면 0"""
+    psutil = lazy_import("psutil")
+    if psutil: return psutil.Process().memory_info().rss // 1024
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError): return 0
+
+def open_handle_count():
+    """열려 있는 파일 핸들 수. psutil이 있으면 사용, 없으면 /proc (리눅스), 둘 다 안 되면 0"""
+    psutil = lazy_import("psutil")
+    if psutil: return psutil.Process().num_handles() if os.name == "nt" else psutil.Process().num_fds()
+    try: return len(os.listdir("/proc/self/fd"))
+    except OSError: return 0
+
+def report_bench(app, count, outcome, warmup=10):
+    """리포트 창을 N번 열고 닫으며 RSS 변화를 측정. 매번 그래프 캐시를 비워 실제로 다시 그림.
+    워밍업 이후 REPORT_BENCH_MAX_GROWTH_KB 이상 늘면 실패"""
+    baseline = []
+    def open_next(i):
+        if i == warmup: gc.collect(); baseline.append(current_rss_kb())
+        if i == warmup + count: finish(); return
+        report_charts.clear()
+        wait(i, WeeklyReportWindow(app))
+    def wait(i, win):
+        if win.loading(): app.after(10, wait, i, win); return
+        win.destroy()
+        app.after(1, open_next, i + 1)
+    def finish():
+        gc.collect()
+        growth = current_rss_kb() - baseline[0]
+        print(json.dumps({"opens": count, "renders": report_charts.renders, "rss_start_kb": baseline[0], "rss_growth_kb": growth}))
+        outcome["failed"] = growth > REPORT_BENCH_MAX_GROWTH_KB
+        app.destroy()
+    open_next(0)
+
+def tray_check(app, count, outcome):
+    """트레이로 숨기기 -> 메뉴로 다시 열기를 N번 반복한 뒤 스레드/아이콘/열린 파일 수가 늘지 않았는지 확인"""
+    if not TRAY_AVAILABLE:
+        print(json.dumps({"error": "pystray/PIL not installed"})); app.destroy(); return
+    icons, before = set(), []
+    def cycle(i):
+        if i == 1: before.extend((threading.active_count(), open_handle_count())) # 첫 회는 트레이 생성 (워밍업)
+        if i == count + 1: finish(); return
+        app.minimize_to_tray()
+        if app.tray.icon is not None: icons.add(id(app.tray.icon)) # 아이콘 이미지를 아직 읽는 중이면 다음 회에 생성
+        threading.Thread(target=app.tray.post("show"), args=(None, None)).start() # 메뉴 클릭과 같은 경로
+        wait(i)
+    def wait(i):
+        if app.state() == "withdrawn": app.after(20, wait, i); return
+        cycle(i + 1)
+    def finish():
+        after = (threading.active_count(), open_handle_count())
+        print(json.dumps({"cycles": count, "threads": [before[0], after[0]], "open_handles": [before[1], after[1]], "icons": len(icons)}))
+        outcome["failed"] = after[0] > before[0] or after[1] > before[1] or len(icons) > 1
+        app.quit_app()
+    cycle(0)
+
+def io_check(app, count, outcome):
+    """저장소의 모든 디스크 작업에 IO_CHECK_DELAY_MS 지연을 넣고 날짜 N개를 차례로 열며 (매번 바로 앞 날짜를 먼저 열어
+    취소되는 요청도 만듦) Tk 이벤트 루프가 멈춘 최대 시간을 잼. IO_CHECK_MAX_LAG_MS보다 길거나 마지막에 연 날짜가 아니면 실패"""
+    app.store.io_delay = max(app.store.io_delay, IO_CHECK_DELAY_MS / 1000)
+    today = datetime.now().date()
+    dates = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(count + 1)]
+    lags, last, wrong, beat_job = [], [time.perf_counter()], [], [None]
+    def beat():
+        now = time.perf_counter(); lags.append((now - last[0]) * 1000 - IO_CHECK_BEAT_MS); last[0] = now
+        beat_job[0] = app.after(IO_CHECK_BEAT_MS, beat)
+    def step(i):
+        if i == count: finish(); return
+        app.open_date(dates[i + 1]); app.open_date(dates[i]) # 앞의 요청은 지연 중에 취소됨
+        wait(i)
+    def wait(i):
+        if app.io.busy(): app.after(10, wait, i); return
+        if app.current_date_str != dates[i] or not app.date_display.cget("text").startswith(dates[i]): wrong.append(dates[i])
+        step(i + 1)
+    def finish():
+        app.after_cancel(beat_job[0])
+        lags.sort()
+        result = {"dates": count, "delay_ms": round(app.store.io_delay * 1000), "dropped": app.io.dropped, "wrong_dates": wrong,
+                  "max_lag_ms": round(lags[-1], 1), "p95_lag_ms": round(lags[int(len(lags) * 0.95)], 1)}
+        print(json.dumps(result))
+        outcome["failed"] = result["max_lag_ms"] > IO_CHECK_MAX_LAG_MS or bool(wrong)
+        app.destroy()
+    beat(); step(0)
+
+CHECKS = {"bench_report": report_bench, "check_tray": tray_check, "check_io": io_check}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="플래너 앱 점검 (창을 띄워 반복 동작 후 결과 출력)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--bench-report", type=int, metavar="N", help="리포트 창을 N번 열고 닫은 뒤 메모리 증가량")
+    group.add_argument("--check-tray", type=int, metavar="N", help="트레이로 숨기기/열기를 N번 반복한 뒤 자원 누수 확인")
+    group.add_argument("--check-io", type=int, metavar="N", help="디스크 지연을 넣고 날짜 N개를 열며 Tk 스레드 멈춤 측정")
+    args = parser.parse_args(argv)
+    name, count = next((name, value) for name, value in vars(args).items() if value is not None)
+    outcome = {"failed": True} # 점검이 끝까지 돌지 못하고 창이 닫히면 실패
+    app = planner.run(on_ready=lambda app: CHECKS[name](app, count, outcome))
+    return 1 if app is None or outcome["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
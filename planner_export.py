@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from planner_core import DayRecord
+
+# ======================================================
+#  기간 내보내기: JSON Lines / CSV / Markdown / iCalendar(.ics)
+#  하루씩 읽어 바로 문자열 조각으로 바꿔 쓰는 제너레이터라 기간이 길어도 메모리 사용이 일정하고 곧바로 쓰기 시작함
+# ======================================================
+
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+# Time Blocks 칸 -> (시작 시, 끝 시) (.ics 일정 시간)
+TIME_BLOCK_HOURS = {"07-09 AM": (7, 9), "09-11 AM": (9, 11), "11-01 PM": (11, 13), "01-03 PM": (13, 15),
+                    "03-05 PM": (15, 17), "05-07 PM": (17, 19), "07-09 PM": (19, 21), "09 PM +": (21, 23)}
+CHECK_SECTIONS = (("goal", "goals"), ("routine", "routines"), ("evening", "evening"))
+
+def jsonl_chunks(days):
+    """planner_cli import로 다시 가져올 수 있는 형식"""
+    for date_str, record in days: yield json.dumps({"date": date_str, "data": record.to_dict()}, ensure_ascii=False) + "\n"
+
+def csv_chunks(days):
+    """목표/체크리스트 항목 하나당 한 줄: date, section, position, text, done, energy"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["date", "section", "position", "text", "done", "energy"])
+    for date_str, record in days:
+        for section, field in CHECK_SECTIONS:
+            for i, item in enumerate(getattr(record, field), 1):
+                if item.text.strip(): writer.writerow([date_str, section, i, item.text, int(item.done), record.energy])
+        yield buf.getvalue()
+        buf.seek(0); buf.truncate()
+    yield buf.getvalue()
+
+def markdown_chunks(days):
+    """날짜마다 한 페이지 (빈 항목은 생략)"""
+    for date_str, record in days:
+        weekday = WEEKDAYS[datetime.strptime(date_str, "%Y-%m-%d").weekday()]
+        lines = [f"## {date_str} ({weekday})", "", f"에너지: {record.energy}", ""]
+        for title, field in (("🎯 목표", "goals"), ("✅ 루틴", "routines"), ("🌙 이브닝 루틴", "evening")):
+            items = [item for item in getattr(record, field) if item.text.strip()]
+            if items: lines += [f"### {title}", *(f"- [{'x' if item.done else ' '}] {item.text}" for item in items), ""]
+        blocks = [(slot, text) for slot, text in record.time_blocks.items() if text.strip()]
+        if blocks: lines += ["### 🕒 Time Blocks", *(f"- **{slot}** {text}" for slot, text in blocks), ""]
+        for title, field in (("💡 아이디어", "ideas"), ("🧠 Brain Dump", "brain_dump"), ("🏆 Small Wins", "small_wins")):
+            text = getattr(record, field).strip()
+            if text: lines += [f"### {title}", text, ""]
+        yield "\n".join(lines) + "\n---\n\n"
+
+def ics_escape(text): return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def ics_fold(line):
+    """RFC 5545: 한 줄은 75바이트까지, 넘으면 CRLF + 공백으로 이어 씀 (UTF-8 문자 중간에서 자르지 않음)"""
+    out, current = [], ""
+    for ch in line:
+        if len((current + ch).encode("utf-8")) > 75: out.append(current); current = " "
+        current += ch
+    out.append(current)
+    return "\r\n".join(out) + "\r\n"
+
+def ics_chunks(days):
+    """Time Blocks의 채운 칸 하나당 일정 하나 (시간대 없는 현지 시각)"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//ADHD Daily Dashboard//Planner Export//KO\r\nCALSCALE:GREGORIAN\r\n"
+    for date_str, record in days:
+        day = date_str.replace("-", "")
+        events = []
+        for slot, text in record.time_blocks.items():
+            if not text.strip() or slot not in TIME_BLOCK_HOURS: continue
+            start, end = TIME_BLOCK_HOURS[slot]
+            events += ["BEGIN:VEVENT", f"UID:{day}-{start:02d}@adhd-planner", f"DTSTAMP:{stamp}",
+                       f"DTSTART:{day}T{start:02d}0000", f"DTEND:{day}T{end:02d}0000", f"SUMMARY:{ics_escape(text.strip())}", "END:VEVENT"]
+        yield "".join(ics_fold(line) for line in events)
+    yield "END:VCALENDAR\r\n"
+
+# 형식 -> (조각 제너레이터, 기본 확장자)
+FORMATS = {"jsonl": (jsonl_chunks, ".jsonl"), "csv": (csv_chunks, ".csv"), "md": (markdown_chunks, ".md"), "ics": (ics_chunks, ".ics")}
+
+def export_range(store, fp, fmt, start_str="0000-00-00", end_str="9999-99-99", progress=None):
+    """[start, end] 기록을 fmt 형식으로 fp에 씀. progress(끝낸 날 수, 전체 날 수)를 하루마다 호출. 내보낸 날짜 수 반환.
+    fp는 newline=""로 열어야 CSV/ICS 줄바꿈(CRLF)이 그대로 기록됨"""
+    chunks, _ = FORMATS[fmt]
+    total, done = store.count_range(start_str, end_str), 0
+    def days():
+        nonlocal done
+        for date_str, data in store.iter_range(start_str, end_str):
+            yield date_str, DayRecord.from_index(data)
+            done += 1
+            if progress: progress(done, total)
+    for chunk in chunks(days()):
+        if chunk: fp.write(chunk)
+    return done
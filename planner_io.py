@@ -0,0 +1,77 @@
+import queue
+import sys
+import threading
+from concurrent.futures import Future
+
+# ======================================================
+#  디스크 작업 실행기: Tk 스레드에서는 파일/DB를 직접 읽지 않고 여기에 맡김
+#    - 작업은 고정된 수의 백그라운드 스레드에서 실행하고 Future를 돌려줌
+#    - 결과 콜백은 after로 큐를 비우며 Tk 스레드에서 호출
+#    - 같은 key로 새 작업을 내면 이전 작업은 취소 (이미 실행 중이면 결과를 버림)
+#  느린 디스크 흉내(PLANNER_IO_DELAY_MS)는 DayStore 안에서 넣음 (잠금 경합까지 드러나게)
+# ======================================================
+
+class TkExecutor:
+    POLL_MS = 15 # 결과 확인 주기 (대기 중인 작업이 있을 때만 돎)
+
+    def __init__(self, root, workers=2):
+        self.root = root
+        self.jobs = queue.Queue()      # Tk 스레드 -> 작업 스레드 (future, 함수, 인자)
+        self.results = queue.Queue()   # 작업 스레드 -> Tk 스레드 (key, future, 성공 콜백, 실패 콜백)
+        self.latest = {}               # key -> 가장 최근에 낸 future (이것의 결과만 전달)
+        self.pending = 0               # 결과를 아직 꺼내지 않은 작업 수
+        self.dropped = 0               # 취소되거나 더 새 작업에 밀려 버린 결과 수
+        self.polling = False
+        self.threads = [threading.Thread(target=self.work, name=f"planner-io-{i}", daemon=True) for i in range(workers)]
+        for thread in self.threads: thread.start()
+
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None):
+        """fn(*args)를 백그라운드에서 실행. 끝나면 Tk 스레드에서 on_done(결과) 또는 on_error(예외)"""
+        if key is not None: self.cancel(key)
+        future = Future()
+        if key is not None: self.latest[key] = future
+        self.pending += 1
+        future.add_done_callback(lambda f: self.results.put((key, f, on_done, on_error)))
+        self.jobs.put((future, fn, args))
+        if not self.polling: self.polling = True; self.root.after(self.POLL_MS, self.poll)
+        return future
+
+    def cancel(self, key):
+        """key로 낸 작업을 취소. 이미 실행 중이면 끝까지 돌지만 결과는 전달하지 않음"""
+        future = self.latest.pop(key, None)
+        if future is not None: future.cancel()
+
+    def busy(self, key=None):
+        return self.pending > 0 if key is None else key in self.latest
+
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None: return
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel(): continue
+            try: result = fn(*args)
+            except Exception as e: future.set_exception(e)
+            else: future.set_result(result)
+
+    def poll(self):
+        while True:
+            try: key, future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty: break
+            self.pending -= 1
+            if future.cancelled() or (key is not None and self.latest.get(key) is not future): self.dropped += 1; continue
+            if key is not None: del self.latest[key]
+            try:
+                error = future.exception()
+                if error is None:
+                    if on_done: on_done(future.result())
+                elif on_error: on_error(error)
+                else: print(f"I/O Error ({key}): {error!r}")
+            except Exception: self.root.report_callback_exception(*sys.exc_info()) # 콜백 오류로 확인 루프가 멈추지 않게
+        if self.pending: self.root.after(self.POLL_MS, self.poll)
+        else: self.polling = False
+
+    def shutdown(self, timeout=10):
+        """대기 중인 작업을 마저 실행하고 작업 스레드를 끝냄 (종료 시 뽀모도로 기록 등이 유실되지 않게)"""
+        for _ in self.threads: self.jobs.put(None)
+        for thread in self.threads: thread.join(timeout)
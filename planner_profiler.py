@@ -0,0 +1,107 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+# ======================================================
+#  계측 모드 (기본 꺼짐). PLANNER_PROFILE=1 로 실행하거나 앱에서 Ctrl+Alt+P 로 켜고 끔
+#    - @timed("이름") 을 붙인 함수의 실행 시간
+#    - Tk 이벤트 루프 지연 (after 심장박동이 예정보다 늦게 도착한 시간)
+#    - tracemalloc 스냅샷 (요청할 때만)
+#  결과는 최근 N개만 메모리에 보관하고 dump()로 JSON 파일에 씀
+# ======================================================
+
+class Profiler:
+    HEARTBEAT_MS = 100   # 이벤트 루프 지연 측정 주기
+    LAG_RECORD_MS = 20   # 이보다 늦으면 지연 이벤트로 기록
+    CAPACITY = 5000      # 보관할 최근 이벤트 수
+
+    def __init__(self):
+        self.enabled = False
+        self.events = deque(maxlen=self.CAPACITY) # {"t", "kind", "name", "ms", ...} (여러 스레드에서 append)
+        self.root = None
+        self.heartbeat_job = None
+        self.last_beat = None
+        self.memory_snapshot = None # 직전 tracemalloc 스냅샷 (다음 스냅샷과 비교)
+        self.lock = threading.Lock()
+
+    def record(self, kind, name, ms, **extra):
+        self.events.append({"t": round(time.time(), 3), "kind": kind, "name": name, "ms": round(ms, 3),
+                            "thread": threading.current_thread().name, **extra})
+
+    def timed(self, name):
+        """실행 시간을 name으로 기록하는 데코레이터. 꺼져 있을 때는 플래그 확인만 함"""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled: return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try: return fn(*args, **kwargs)
+                finally: self.record("timer", name, (time.perf_counter() - t0) * 1000)
+            return wrapper
+        return decorate
+
+    def enable(self, root=None):
+        self.enabled = True
+        if root is not None:
+            self.root = root
+            if self.heartbeat_job is None: self.last_beat = time.perf_counter(); self.heartbeat_job = root.after(self.HEARTBEAT_MS, self.heartbeat)
+
+    def disable(self):
+        self.enabled = False
+        if self.heartbeat_job is not None: self.root.after_cancel(self.heartbeat_job); self.heartbeat_job = None
+
+    def toggle(self, root=None):
+        self.disable() if self.enabled else self.enable(root)
+        return self.enabled
+
+    def heartbeat(self):
+        """예정 시각보다 늦게 불린 만큼이 이벤트 루프 지연 (그동안 다른 콜백이 루프를 잡고 있었음)"""
+        now = time.perf_counter()
+        lag = (now - self.last_beat) * 1000 - self.HEARTBEAT_MS
+        if lag > self.LAG_RECORD_MS: self.record("lag", "event_loop", lag)
+        self.last_beat = now
+        self.heartbeat_job = self.root.after(self.HEARTBEAT_MS, self.heartbeat)
+
+    def snapshot_memory(self, top=15):
+        """tracemalloc 스냅샷: 할당이 많은 코드 줄 top개 (직전 스냅샷이 있으면 증가량 기준)"""
+        with self.lock:
+            if not tracemalloc.is_tracing(): tracemalloc.start()
+            snapshot = tracemalloc.take_snapshot()
+            if self.memory_snapshot is None:
+                stats = [{"where": str(s.traceback), "kb": round(s.size / 1024, 1), "count": s.count} for s in snapshot.statistics("lineno")[:top]]
+            else:
+                stats = [{"where": str(s.traceback), "kb": round(s.size / 1024, 1), "diff_kb": round(s.size_diff / 1024, 1), "count": s.count}
+                         for s in snapshot.compare_to(self.memory_snapshot, "lineno")[:top]]
+            self.memory_snapshot = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        self.record("memory", "tracemalloc", 0, current_kb=current // 1024, peak_kb=peak // 1024, top=stats)
+        return stats
+
+    def summary(self):
+        """이름별 횟수/평균/p95/최대(ms)"""
+        groups = {}
+        for event in list(self.events):
+            if event["kind"] != "memory": groups.setdefault(f"{event['kind']}:{event['name']}", []).append(event["ms"])
+        result = {}
+        for key, values in groups.items():
+            values.sort()
+            result[key] = {"count": len(values), "mean_ms": round(sum(values) / len(values), 3),
+                           "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))], "max_ms": values[-1]}
+        return result
+
+    def dump(self, directory):
+        """요약과 보관 중인 이벤트를 directory/profile-날짜시각.json 으로 저장하고 경로 반환"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"created": datetime.now().isoformat(timespec="seconds"), "summary": self.summary(), "events": list(self.events)},
+                      f, ensure_ascii=False, indent=1)
+        return path
+
+profiler = Profiler()
+timed = profiler.timed
@@ -0,0 +1,62 @@
+import importlib
+import queue
+import threading
+
+# ======================================================
+#  시스템 트레이 아이콘 (pystray). 앱 전체에서 하나만 만들어 계속 씀
+# ======================================================
+
+class TrayService:
+    """트레이 아이콘. 아이콘과 pystray 스레드는 처음 숨길 때 한 번만 만들고, 이후에는 보이기/숨기기만 전환.
+    메뉴 클릭은 pystray 스레드에서 Tk를 직접 건드리지 않고 큐에 넣어 두면 Tk 스레드가 after로 꺼내 실행"""
+    POLL_MS = 100
+
+    def __init__(self, root, actions, io, load_image):
+        self.root = root
+        self.actions = actions          # 명령 이름 -> Tk 스레드에서 실행할 함수
+        self.io = io                    # 아이콘 파일은 TkExecutor로 읽음
+        self.load_image = load_image    # 아이콘 이미지를 만드는 함수 (작업 스레드에서 실행)
+        self.commands = queue.Queue()   # pystray 스레드 -> Tk 스레드
+        self.image = None               # 아이콘 이미지 (한 번만 읽음)
+        self.icon = None
+        self.thread = None
+        self.polling = False
+        self.visible = False            # 아이콘을 보여야 하는 상태 (이미지를 읽는 중일 수 있음)
+
+    def post(self, command): return lambda icon, item: self.commands.put(command)
+
+    def preload(self):
+        if self.image is None and not self.io.busy("tray_icon"): self.io.submit(self.load_image, key="tray_icon", on_done=self.on_image)
+
+    def on_image(self, image):
+        self.image = image
+        if self.visible and self.icon is None: self.start()
+
+    def start(self):
+        pystray = importlib.import_module("pystray") # 트레이를 처음 쓸 때 불러옴
+        menu = pystray.Menu(pystray.MenuItem("Open Dashboard", self.post("show"), default=True), pystray.MenuItem("Exit App", self.post("quit")))
+        self.icon = pystray.Icon("ADHD Planner", self.image, "ADHD Planner", menu)
+        self.thread = threading.Thread(target=self.icon.run, kwargs={"setup": lambda icon: setattr(icon, "visible", True)}, daemon=True)
+        self.thread.start()
+
+    def show_icon(self):
+        self.visible = True
+        if self.icon is not None: self.icon.visible = True
+        elif self.image is not None: self.start()
+        else: self.preload()
+        if not self.polling: self.polling = True; self.root.after(self.POLL_MS, self.poll)
+
+    def hide_icon(self):
+        self.visible = False
+        if self.icon is not None: self.icon.visible = False
+
+    def poll(self):
+        while True:
+            try: command = self.commands.get_nowait()
+            except queue.Empty: break
+            self.actions[command]()
+        if self.visible: self.root.after(self.POLL_MS, self.poll)
+        else: self.polling = False
+
+    def stop(self):
+        if self.icon is not None: self.icon.stop(); self.icon = None
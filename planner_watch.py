@@ -0,0 +1,115 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+
+try: import fcntl   # 유닉스 계열
+except ImportError: fcntl = None
+try: import msvcrt  # 윈도우
+except ImportError: msvcrt = None
+
+# ======================================================
+#  여러 프로그램이 같은 data 폴더를 쓸 때
+#    - InstanceLock: 폴더당 앱 하나만 실행 (권고 잠금, 프로세스가 죽으면 OS가 풀어줌)
+#    - DirWatcher: 다른 프로그램(동기화 등)이 바꾼 파일 감지. 리눅스는 inotify, 그 밖에는 mtime 폴링
+# ======================================================
+
+class InstanceLock:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def acquire(self):
+        """잠금을 얻으면 True, 다른 프로세스가 이미 잡고 있으면 False (잠금 기능이 없는 환경이면 항상 True)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        f = open(self.path, "a+")
+        try:
+            if fcntl: fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt: f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close(); return False
+        f.seek(0); f.truncate(); f.write(str(os.getpid())); f.flush() # 누가 잡고 있는지 확인용
+        self.file = f
+        return True
+
+    def release(self):
+        if self.file is not None: self.file.close(); self.file = None
+
+class DirWatcher:
+    """폴더 감시 스레드. pattern에 맞는 이름의 파일이 생기거나 바뀌거나 지워지면 changes 큐에 이름 묶음(set)을 넣음"""
+    POLL_S = 2.0     # 폴링 방식 확인 주기
+    SETTLE_S = 0.2   # 첫 이벤트 후 이만큼 더 모아서 한 번에 전달 (임시 파일 쓰기 + rename 등 연달아 오는 이벤트)
+    # inotify 이벤트: 쓰기 끝남, 이름 바꿔 들어옴/나감, 지워짐
+    IN_MASK = 0x00000008 | 0x00000040 | 0x00000080 | 0x00000200
+    EVENT = struct.Struct("iIII") # wd, mask, cookie, 이름 길이
+
+    def __init__(self, directory, pattern, polling=False):
+        self.directory = directory
+        self.pattern = pattern
+        self.changes = queue.Queue()
+        self.stopped = threading.Event()
+        self.mode = "polling" if polling else None # 실제로 쓰는 방식 (시작 후 "inotify" 또는 "polling")
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self): self.stopped.set()
+
+    def run(self):
+        fd = None if self.mode == "polling" else self.open_inotify()
+        if fd is None: self.mode = "polling"; self.poll_loop(); return
+        self.mode = "inotify"
+        try: self.inotify_loop(fd)
+        finally: os.close(fd)
+
+    def open_inotify(self):
+        if not sys.platform.startswith("linux"): return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0: return None
+            if libc.inotify_add_watch(fd, os.fsencode(self.directory), self.IN_MASK) < 0: os.close(fd); return None
+            return fd
+        except (OSError, AttributeError): return None
+
+    def read_events(self, fd):
+        buf, offset, names = os.read(fd, 64 * 1024), 0, set()
+        while offset < len(buf):
+            _, _, _, length = self.EVENT.unpack_from(buf, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(buf[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if self.pattern.match(name): names.add(name)
+        return names
+
+    def inotify_loop(self, fd):
+        batch, deadline = set(), None
+        while not self.stopped.is_set():
+            timeout = 1.0 if deadline is None else max(0.0, deadline - time.monotonic())
+            if select.select([fd], [], [], timeout)[0]: batch |= self.read_events(fd)
+            if batch and deadline is None: deadline = time.monotonic() + self.SETTLE_S
+            if deadline is not None and time.monotonic() >= deadline:
+                self.changes.put(batch); batch, deadline = set(), None
+
+    def scan(self):
+        mtimes = {}
+        for entry in os.scandir(self.directory):
+            if not self.pattern.match(entry.name): continue
+            try: mtimes[entry.name] = entry.stat().st_mtime
+            except FileNotFoundError: pass # 목록을 읽는 사이에 지워짐
+        return mtimes
+
+    def poll_loop(self):
+        known = self.scan()
+        while not self.stopped.wait(self.POLL_S):
+            current = self.scan()
+            changed = {name for name in known.keys() | current.keys() if known.get(name) != current.get(name)}
+            if changed: self.changes.put(changed)
+            known = current
@@ -0,0 +1,32 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # 저장소 루트의 planner_* 모듈
+
+from planner_core import CheckItem, DayRecord, DayStore
+
+def make_record(goals=(), energy="MEDIUM ⚡", ideas="", routines=(), time_blocks=None):
+    """goals/routines: (텍스트, 완료) 목록"""
+    return DayRecord(goals=[CheckItem(t, d) for t, d in goals], energy=energy, ideas=ideas,
+                     routines=[CheckItem(t, d) for t, d in routines], time_blocks=time_blocks or {})
+
+class FakeRoot:
+    """after 콜백을 모아 두었다가 pump()로 실행하는 Tk 대역"""
+    def __init__(self): self.callbacks = []
+    def after(self, ms, fn, *args): self.callbacks.append((fn, args))
+    def report_callback_exception(self, *exc_info): raise exc_info[1]
+    def pump(self, timeout=2.0, until=None):
+        """예약된 콜백을 차례로 실행. until()이 참이 되거나 콜백이 없거나 timeout이 지나면 멈춤"""
+        deadline = time.monotonic() + timeout
+        while self.callbacks and time.monotonic() < deadline and not (until and until()):
+            fn, args = self.callbacks.pop(0); fn(*args)
+            time.sleep(0.005)
+
+@pytest.fixture
+def store(tmp_path):
+    store = DayStore(str(tmp_path / "data"))
+    yield store
+    store.conn.close()
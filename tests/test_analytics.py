@@ -0,0 +1,24 @@
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import make_record
+from planner_analytics import load_timeline, rolling_rates, streaks
+
+def test_streaks_and_rolling_rates(store):
+    done, half = [("a", True)], [("a", True), ("b", False)]
+    days = {1: done, 2: done, 3: done, 4: half, 6: done, 7: done}
+    store.save_many([(f"2024-05-{d:02d}", make_record(goals=goals)) for d, goals in days.items()])
+    timeline = load_timeline(store, end=date(2024, 5, 7))
+    assert list(timeline["rate"]) == [1, 1, 1, 0.5, 0, 1, 1]
+    assert streaks(timeline) == {"current": 2, "longest": 3, "longest_end": "2024-05-03"}
+    assert streaks(timeline, min_rate=0.5)["longest"] == 4
+    rolling = rolling_rates(timeline, 3)
+    assert rolling[0] == 1 and rolling[4] == pytest.approx(0.5) and rolling[6] == pytest.approx(2 / 3)
+
+def test_current_streak_ends_yesterday_when_today_is_open(store):
+    store.save_many([("2024-05-01", make_record(goals=[("a", True)])), ("2024-05-02", make_record(goals=[("a", True)]))])
+    assert streaks(load_timeline(store, end=date(2024, 5, 3)))["current"] == 2
+    assert streaks(load_timeline(store, end=date(2024, 5, 4)))["current"] == 0
@@ -0,0 +1,20 @@
+import os
+
+from conftest import make_record
+from planner_core import DayStore
+
+def test_compact_moves_old_months_to_archive(store):
+    store.save_many([(f"2024-01-{d:02d}", make_record(ideas=f"idea {d}")) for d in range(1, 11)])
+    store.save("2024-02-01", make_record(ideas="current").to_dict())
+    assert store.compact(before="2024-02") == [("2024-01", 10)]
+    assert not os.path.exists(store.path_for("2024-01-03")) and os.path.exists(store.path_for("2024-02-01"))
+    reopened = DayStore(store.data_dir) # 묶음 파일에서 다시 인덱스를 맞춰도 같은 내용
+    assert reopened.get("2024-01-03")["ideas"] == "idea 3" and reopened.count() == 11
+    reopened.conn.close()
+
+def test_file_edited_after_compact_wins_over_the_archive(store):
+    store.save("2024-01-05", make_record(ideas="packed").to_dict())
+    store.compact(before="2024-02")
+    store.save("2024-01-05", make_record(ideas="edited").to_dict())
+    store.sync()
+    assert store.get("2024-01-05")["ideas"] == "edited"
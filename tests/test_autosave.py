@@ -0,0 +1,31 @@
+import sqlite3
+
+from conftest import make_record
+from planner_core import AutosaveWriter
+
+def test_writer_survives_index_errors_and_keeps_saving(store, monkeypatch):
+    save = store.save
+    calls = []
+    def flaky(date_str, data, base=None):
+        calls.append(date_str)
+        if len(calls) == 1: raise sqlite3.OperationalError("database is locked")
+        return save(date_str, data, base)
+    monkeypatch.setattr(store, "save", flaky)
+    writer = AutosaveWriter(store)
+    writer.submit("2024-03-20", make_record(ideas="lost").to_dict())
+    assert writer.flush(timeout=1) and not writer.busy
+    date_str, error = writer.errors.get_nowait()
+    assert date_str == "2024-03-20" and isinstance(error, sqlite3.OperationalError)
+    writer.submit("2024-03-21", make_record(ideas="next").to_dict())
+    assert writer.flush(timeout=1)
+    assert writer.saved.get_nowait() == "2024-03-21"
+    writer.close()
+
+def test_pending_snapshots_of_one_day_are_merged(store):
+    store.io_delay = 0.05
+    writer = AutosaveWriter(store)
+    for text in ("a", "ab", "abc", "abcd"): writer.submit("2024-03-22", make_record(ideas=text).to_dict())
+    writer.close()
+    saves = []
+    while not writer.saved.empty(): saves.append(writer.saved.get_nowait())
+    assert 1 <= len(saves) < 4 and store.get("2024-03-22")["ideas"] == "abcd"
@@ -0,0 +1,58 @@
+import json
+import time
+
+import pytest
+
+from conftest import make_record
+from planner_core import AutosaveWriter, ConflictError, DayStore
+
+def write_json(store, date_str, data):
+    with open(store.path_for(date_str), "w", encoding="utf-8") as f: json.dump(data, f)
+
+def test_save_rejects_changes_made_elsewhere(store):
+    store.save("2024-03-07", make_record(ideas="mine").to_dict())
+    store.checkout("2024-03-07")
+    base = store.bases["2024-03-07"]
+    write_json(store, "2024-03-07", make_record(ideas="theirs").to_dict())
+    with pytest.raises(ConflictError): store.save("2024-03-07", make_record(ideas="mine 2").to_dict(), base)
+
+def test_autosave_does_not_conflict_with_its_own_write(store):
+    store.checkout("2024-03-08")
+    store.io_delay = 0.1 # 첫 저장이 끝나기 전에 두 번째 수정이 들어오게
+    writer = AutosaveWriter(store)
+    writer.submit("2024-03-08", make_record(ideas="a").to_dict())
+    time.sleep(0.05)
+    writer.submit("2024-03-08", make_record(ideas="ab").to_dict())
+    writer.close()
+    assert writer.conflicts.empty()
+    assert store.get("2024-03-08")["ideas"] == "ab"
+
+def test_refresh_sees_changes_another_process_already_indexed(store):
+    store.save("2024-03-12", make_record(ideas="old").to_dict())
+    assert store.get("2024-03-12")["ideas"] == "old" # 캐시에 올려 둠
+    other = DayStore(store.data_dir) # CLI 등: 같은 index.sqlite3를 쓰고 파일과 인덱스를 함께 고침
+    other.save("2024-03-12", make_record(ideas="new").to_dict())
+    other.save("2024-03-13", make_record(ideas="later").to_dict())
+    other.conn.close()
+    changed = store.refresh(["2024-03-12", "2024-03-13"])
+    assert set(changed) == {"2024-03-12", "2024-03-13"}
+    assert store.get("2024-03-12")["ideas"] == "new" and store.latest_date == "2024-03-13"
+    assert store.refresh(["2024-03-12"]) == {} # 이미 반영한 것은 다시 알리지 않음
+
+def test_day_created_elsewhere_after_opening_is_a_conflict(store):
+    store.checkout("2024-01-05") # 열 때는 파일이 없었음
+    write_json(store, "2024-01-05", make_record(ideas="from sync").to_dict())
+    writer = AutosaveWriter(store)
+    writer.submit("2024-01-05", make_record(ideas="mine").to_dict())
+    writer.close()
+    assert writer.conflicts.get_nowait()[0] == "2024-01-05"
+    with open(store.path_for("2024-01-05"), encoding="utf-8") as f: assert json.load(f)["ideas"] == "from sync"
+
+def test_writer_reports_days_still_being_written(store):
+    store.io_delay = 0.1
+    writer = AutosaveWriter(store)
+    writer.submit("2024-03-14", make_record(ideas="a").to_dict())
+    assert writer.writing("2024-03-14") and not writer.writing("2024-03-15")
+    writer.flush()
+    assert not writer.writing("2024-03-14")
+    writer.close()
@@ -0,0 +1,48 @@
+import csv
+import io
+
+from conftest import make_record
+from planner_core import DayStore, import_days
+from planner_export import export_range, ics_fold
+
+def fill(store):
+    store.save("2024-04-01", make_record(goals=[("write, report", True)], ideas="garden", time_blocks={"09-11 AM": "deep work"}).to_dict())
+    store.save("2024-04-02", make_record(goals=[("rest", False)]).to_dict())
+    store.save("2024-05-01", make_record(ideas="outside range").to_dict())
+
+def export(store, fmt, progress=None):
+    buf = io.StringIO(newline="")
+    count = export_range(store, buf, fmt, "2024-04-01", "2024-04-30", progress)
+    return count, buf.getvalue()
+
+def test_jsonl_round_trip(store, tmp_path):
+    fill(store)
+    count, text = export(store, "jsonl")
+    assert count == 2 and len(text.splitlines()) == 2
+    other = DayStore(str(tmp_path / "other"))
+    assert import_days(other, io.StringIO(text)) == 2
+    assert other.get("2024-04-01") == store.get("2024-04-01")
+    other.conn.close()
+
+def test_csv_rows_and_progress(store):
+    fill(store)
+    calls = []
+    _, text = export(store, "csv", progress=lambda done, total: calls.append((done, total)))
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0] == ["date", "section", "position", "text", "done", "energy"]
+    assert rows[1][:5] == ["2024-04-01", "goal", "1", "write, report", "1"]
+    assert calls == [(1, 2), (2, 2)]
+
+def test_markdown_and_ics(store):
+    fill(store)
+    _, md = export(store, "md")
+    assert "## 2024-04-01 (월)" in md and "- [x] write, report" in md and "outside range" not in md
+    _, ics = export(store, "ics")
+    assert ics.startswith("BEGIN:VCALENDAR\r\n") and ics.endswith("END:VCALENDAR\r\n")
+    assert "DTSTART:20240401T090000\r\n" in ics and ics.count("BEGIN:VEVENT") == 1
+
+def test_ics_fold_keeps_lines_within_75_bytes():
+    folded = ics_fold("SUMMARY:" + "한글" * 40)
+    lines = folded.split("\r\n")[:-1]
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert "".join(line[1:] if i else line for i, line in enumerate(lines)) == "SUMMARY:" + "한글" * 40
@@ -0,0 +1,24 @@
+import random
+
+from conftest import make_record
+
+def fill(store, count):
+    store.save_many([(f"2024-01-{d:02d}", make_record(ideas=f"idea {d}")) for d in range(1, count + 1)])
+
+def test_excluded_ideas_are_never_returned(store):
+    fill(store, 20)
+    exclude = {f"2024-01-{d:02d}" for d in range(1, 20)}
+    for seed in range(30):
+        assert store.random_idea(exclude=exclude, rng=random.Random(seed), max_tries=2) == ("2024-01-20", "idea 20")
+
+def test_rejected_samples_fall_back_to_an_allowed_candidate(store):
+    fill(store, 10)
+    exclude = {"2024-01-01", "2024-01-02"}
+    for seed in range(30): # 반감기가 아주 짧아 가중치 단계에서 거의 다 거절됨
+        picked = store.random_idea(half_life_days=0.001, exclude=exclude, rng=random.Random(seed), max_tries=3)
+        assert picked[0] not in exclude
+
+def test_empty_pool_and_exclude_everything(store):
+    assert store.random_idea() is None
+    fill(store, 3)
+    assert store.random_idea(exclude={"2024-01-01", "2024-01-02", "2024-01-03"}) is not None # 모두 제외되면 무시
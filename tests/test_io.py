@@ -0,0 +1,65 @@
+import threading
+
+from conftest import FakeRoot, make_record
+from planner_core import DayStore
+from planner_io import TkExecutor
+
+def test_newer_job_with_same_key_drops_the_older_result():
+    root = FakeRoot()
+    executor = TkExecutor(root)
+    started, release = threading.Event(), threading.Event()
+    def slow(value): started.set(); release.wait(2); return value
+    results = []
+    executor.submit(slow, "old", key="day", on_done=results.append)
+    started.wait(2)
+    executor.submit(lambda: "new", key="day", on_done=results.append)
+    release.set()
+    root.pump()
+    assert results == ["new"] and executor.dropped == 1 and not executor.busy()
+    executor.shutdown()
+
+def test_queued_job_is_cancelled_before_it_runs():
+    root = FakeRoot()
+    executor = TkExecutor(root, workers=1)
+    release, ran = threading.Event(), []
+    executor.submit(release.wait, 2)
+    future = executor.submit(ran.append, "stale", key="preview")
+    executor.cancel("preview")
+    release.set()
+    root.pump()
+    assert future.cancelled() and ran == []
+    executor.shutdown()
+
+def test_errors_go_to_on_error():
+    root = FakeRoot()
+    executor = TkExecutor(root)
+    errors = []
+    executor.submit(lambda: 1 / 0, on_error=errors.append)
+    root.pump()
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
+    executor.shutdown()
+
+def test_store_jobs_wait_until_the_store_is_opened_on_a_worker(tmp_path):
+    DayStore(str(tmp_path)).save("2024-03-01", make_record(goals=[("a", True)]).to_dict())
+    root = FakeRoot()
+    executor = TkExecutor(root)
+    store = DayStore(str(tmp_path), open_now=False) # Tk 스레드에서는 인덱스를 열지 않음
+    assert store._conn is None
+    opened, rows = [], []
+    executor.submit(store.aggregates, "2024-03-01", "2024-03-31", on_done=rows.append)
+    executor.submit(store.open, on_done=opened.append)
+    root.pump(until=lambda: opened and rows)
+    assert opened == [None] and [r[0] for r in rows[0]] == ["2024-03-01"]
+    executor.shutdown()
+
+def test_store_open_error_reaches_every_waiting_job(tmp_path):
+    (tmp_path / DayStore.INDEX_NAME).write_bytes(b"not a database" * 100)
+    root = FakeRoot()
+    executor = TkExecutor(root)
+    store = DayStore(str(tmp_path), open_now=False)
+    errors = []
+    executor.submit(store.open, on_error=errors.append)
+    executor.submit(store.aggregates, "2024-03-01", "2024-03-31", on_error=errors.append)
+    root.pump(until=lambda: len(errors) == 2)
+    assert len(errors) == 2 and all(e is store.open_error for e in errors)
+    executor.shutdown()
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from conftest import make_record
+from planner_core import RECORD_VERSION, DayRecord, RecordError, load_day
+
+def test_old_records_are_migrated_and_missing_fields_filled():
+    record = DayRecord.from_dict({"energy": "Medium", "goals": [{"text": "a", "done": 1}]})
+    assert record.energy == "MEDIUM ⚡" and record.goals[0].done is True and record.routines == []
+    assert record.to_dict()["version"] == RECORD_VERSION
+
+@pytest.mark.parametrize("data", [{"energy": "High"}, {"time_blocks": {"07-09 AM": None}}, {"goals": [{"done": "yes"}]},
+                                  {"version": RECORD_VERSION + 1}, []])
+def test_invalid_values_raise_record_error(data):
+    with pytest.raises(RecordError): DayRecord.from_dict(data)
+
+def test_invalid_file_is_never_loaded_as_a_new_day(store):
+    data = make_record().to_dict(); data["energy"] = "High"
+    with open(store.path_for("2024-03-06"), "w", encoding="utf-8") as f: json.dump(data, f)
+    store.sync()
+    assert "2024-03-06" in store.invalid
+    with pytest.raises(RecordError): load_day(store, "2024-03-06")
+    with pytest.raises(RecordError): store.checkout("2024-03-06")
+    data["energy"] = "LOW 💤"
+    with open(store.path_for("2024-03-06"), "w", encoding="utf-8") as f: json.dump(data, f)
+    assert "2024-03-06" in store.refresh(["2024-03-06"])
+    assert "2024-03-06" not in store.invalid and load_day(store, "2024-03-06").energy == "LOW 💤"
+
+def test_index_records_match_checked_records(store):
+    record = make_record()
+    store.save("2024-03-07", record.to_dict())
+    _, data = next(store.iter_range("2024-03-07", "2024-03-07"))
+    assert DayRecord.from_index(data).to_dict() == DayRecord.from_dict(data).to_dict() == record.to_dict()
+
+def test_old_index_rows_are_rewritten_in_the_current_format(store):
+    store.save("2024-03-08", make_record().to_dict())
+    with store.lock:
+        store.conn.execute("UPDATE days SET data = ? WHERE date = ?", (json.dumps({"energy": "Medium"}), "2024-03-08"))
+        store.conn.execute("PRAGMA user_version = 7"); store.conn.commit()
+        store.migrate_schema()
+    _, data = next(store.iter_range("2024-03-08", "2024-03-08"))
+    assert data["version"] == RECORD_VERSION and DayRecord.from_index(data).energy == "MEDIUM ⚡"
@@ -0,0 +1,19 @@
+from conftest import make_record
+from planner_core import search_days
+
+def test_ideas_outrank_brain_dump_and_partial_matches(store):
+    store.save("2024-02-01", make_record(ideas="garden plan for spring").to_dict())
+    brain = make_record(); brain.brain_dump = "garden plan somewhere"
+    store.save("2024-02-02", brain.to_dict())
+    store.save("2024-02-03", make_record(ideas="spring cleaning").to_dict())
+    store.save("2024-02-04", make_record(ideas="nothing related").to_dict())
+    results = search_days(store, "garden plan")
+    assert [d for d, _, _ in results] == ["2024-02-01", "2024-02-02"]
+    assert results[0][1] == "ideas" and "garden" in results[0][2]
+
+def test_prefix_match(store):
+    store.save("2024-02-05", make_record(ideas="gardening tools").to_dict())
+    store.save("2024-02-06", make_record(ideas="책을 읽기").to_dict())
+    assert [d for d, _, _ in search_days(store, "gard")] == ["2024-02-05"]
+    assert [d for d, _, _ in search_days(store, "책")] == ["2024-02-06"]
+    assert search_days(store, "") == []
@@ -0,0 +1,21 @@
+import json
+import os
+
+from conftest import make_record
+
+def write_json(store, date_str, data):
+    with open(store.path_for(date_str), "w", encoding="utf-8") as f: json.dump(data, f)
+
+def test_save_and_get_round_trip(store):
+    store.save("2024-03-01", make_record(goals=[("run", True)], ideas="garden").to_dict())
+    assert store.get("2024-03-01")["goals"] == [{"text": "run", "done": True}]
+    assert store.get("2024-03-02") is None
+    assert store.latest()[0] == "2024-03-01"
+
+def test_sync_indexes_files_written_outside(store):
+    write_json(store, "2024-03-05", make_record(ideas="outside").to_dict())
+    store.sync()
+    assert store.get("2024-03-05")["ideas"] == "outside"
+    os.remove(store.path_for("2024-03-05"))
+    store.sync()
+    assert store.get("2024-03-05") is None
@@ -0,0 +1,15 @@
+from conftest import make_record
+from planner_core import load_day
+
+def test_template_version_is_updated_within_the_same_day(store):
+    for items in (["a"], ["a", "b"], ["a", "bc"]):
+        store.save("2024-03-09", make_record(routines=[(t, False) for t in items]).to_dict())
+    assert [(v, since) for v, since, _ in store.template_versions("routines")] == [(1, "2024-03-09")]
+    store.save("2024-03-10", make_record(routines=[("z", False)]).to_dict())
+    assert store.template("routines") == ["z"] and len(store.template_versions("routines")) == 2
+
+def test_new_day_carries_routines_over_unchecked(store):
+    store.save("2024-03-09", make_record(goals=[("open", False), ("done", True)], routines=[("stretch", True)]).to_dict())
+    record = load_day(store, "2024-03-11", carry_goals=True)
+    assert [(i.text, i.done) for i in record.routines] == [("stretch", False)]
+    assert [g.text for g in record.goals] == ["open"]
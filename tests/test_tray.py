@@ -0,0 +1,59 @@
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+from conftest import FakeRoot
+from planner_tray import TrayService
+
+class FakeIcon:
+    """pystray.Icon 대역: run()은 stop()까지 막혀 있는 스레드 (실제 pystray와 같음)"""
+    created = []
+    def __init__(self, name, image, title, menu):
+        self.menu, self.visible, self.stopped = menu, False, threading.Event()
+        FakeIcon.created.append(self)
+    def run(self, setup=None):
+        if setup: setup(self)
+        self.stopped.wait()
+    def stop(self): self.stopped.set()
+
+class FakeIO:
+    """TkExecutor 대역: 바로 실행하고 결과를 넘김"""
+    def __init__(self): self.calls = 0
+    def busy(self, key=None): return False
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None):
+        self.calls += 1; on_done(fn(*args))
+
+def handle_count():
+    try: return len(os.listdir("/proc/self/fd"))
+    except OSError: return 0
+
+@pytest.fixture
+def fake_pystray(monkeypatch):
+    FakeIcon.created = []
+    module = types.SimpleNamespace(Icon=FakeIcon, Menu=lambda *items: items,
+                                   MenuItem=lambda text, action, default=False: (text, action))
+    monkeypatch.setitem(sys.modules, "pystray", module)
+    return module
+
+def test_hide_and_show_many_times_keeps_one_icon_and_thread(fake_pystray):
+    root, io, shown = FakeRoot(), FakeIO(), []
+    tray = TrayService(root, {"show": lambda: (shown.append(1), tray.hide_icon()), "quit": lambda: None}, io, lambda: "image")
+    tray.show_icon(); root.pump(until=lambda: True) # 첫 회는 아이콘/스레드 생성 (워밍업)
+    tray.hide_icon(); root.pump()
+    before = (threading.active_count(), handle_count())
+    for i in range(50):
+        tray.show_icon()
+        open_item = tray.icon.menu[0][1]
+        threading.Thread(target=open_item, args=(tray.icon, None)).start() # 메뉴 클릭은 pystray 스레드에서 옴
+        root.pump(until=lambda: len(shown) == i + 1)
+        assert not tray.visible and tray.icon.visible is False
+    root.pump()
+    assert len(shown) == 50 and len(FakeIcon.created) == 1 and io.calls == 1
+    assert threading.active_count() <= before[0] and handle_count() <= before[1]
+    assert not root.callbacks # 숨기면 명령 확인 루프도 멈춤
+    thread = tray.thread
+    tray.stop(); thread.join(2)
+    assert not thread.is_alive() and tray.icon is None